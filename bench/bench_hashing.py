@@ -0,0 +1,122 @@
+'''
+Local integrity hashing benchmarks
+
+Hash synthetic multi-MB DLLs and a large headless addon tree (many small files
+plus its Merkle root) with every available algorithm, SHA256 being the baseline,
+and report the speedup of each one against it.
+
+usage: python bench/bench_hashing.py [--dll-sizes 8 32] [--dlls 4] [--tree-files 2000]
+                                     [--tree-file-size 64] [--repeat 5] [--output bench_output.json]
+'''
+
+import argparse
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import List
+
+from common import PhaseResult, print_results, write_results
+from bench_settings import run_phase
+
+from yaam.utils.hashing import Hasher
+
+ALGORITHMS = [_ for _ in [Hasher.SHA256, Hasher.BLAKE2B, Hasher.BLAKE3, Hasher.XXH3] if _.is_available]
+
+
+def write_files(root: Path, count: int, size: int, nesting: int = 1) -> List[Path]:
+    '''
+    Write the given number of random files of the given size (in bytes), spread among subfolders
+    '''
+    paths = []
+
+    for i in range(count):
+        path = root.joinpath(*[f"dir_{i % (7 + _)}" for _ in range(nesting - 1)], f"file_{i}.bin")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(os.urandom(size))
+        paths.append(path)
+
+    return paths
+
+
+def hash_tree(hasher: Hasher, root: Path, paths: List[Path]) -> str:
+    '''
+    Hash every file of a headless addon tree and return its Merkle root
+    '''
+    return hasher.make_hash_from_tree((os.path.relpath(_, root), hasher.make_hash_from_file(_)) for _ in paths)
+
+
+def run_hashing(args: argparse.Namespace) -> List[PhaseResult]:
+    '''
+    Run the hashing benchmarks with every available algorithm
+    '''
+    results = []
+
+    with tempfile.TemporaryDirectory(prefix="yaam-bench-") as tmp_dir:
+        root = Path(tmp_dir)
+
+        for dll_size in args.dll_sizes:
+            dlls = write_files(root / f"dlls_{dll_size}", args.dlls, dll_size * 1024 ** 2)
+
+            for hasher in ALGORITHMS:
+                results.append(run_phase(
+                    f"hash.dll.{dll_size}MiB.{hasher.signature}", args.dlls,
+                    lambda h=hasher: [h.make_hash_from_file(_) for _ in dlls], args.repeat, 0
+                ))
+
+        tree_root = root / "headless"
+        tree = write_files(tree_root, args.tree_files, args.tree_file_size * 1024, nesting=3)
+
+        for hasher in ALGORITHMS:
+            results.append(run_phase(
+                f"hash.tree.{hasher.signature}", args.tree_files,
+                lambda h=hasher: hash_tree(h, tree_root, tree), args.repeat, 0
+            ))
+
+    return results
+
+
+def print_speedups(results: List[PhaseResult]):
+    '''
+    Print the speedup of each algorithm against the SHA256 baseline of the same phase
+    '''
+    baselines = dict(
+        (_.name.rsplit(".", 1)[0], _.wall) for _ in results if _.name.endswith(f".{Hasher.SHA256.signature}")
+    )
+
+    for _ in results:
+        baseline = baselines.get(_.name.rsplit(".", 1)[0], None)
+        if baseline is not None and _.wall > 0:
+            print(f"{_.name}: {baseline / _.wall:.2f}x")
+
+
+def main() -> int:
+    '''
+    Benchmark entrypoint
+    '''
+    parser = argparse.ArgumentParser(description="YAAM local integrity hashing benchmarks")
+    parser.add_argument("--dll-sizes", type=int, nargs="+", default=[8, 32], help="Synthetic DLL sizes in MiB")
+    parser.add_argument("--dlls", type=int, default=4, help="Synthetic DLLs per size")
+    parser.add_argument("--tree-files", type=int, default=2000, help="Files of the synthetic headless addon tree")
+    parser.add_argument("--tree-file-size", type=int, default=64, help="Size of each headless addon file in KiB")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per phase (best is reported)")
+    parser.add_argument("--output", type=Path, default=None, help="Write the results as json to the given path")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    results = run_hashing(args)
+
+    print_results(results)
+    print_speedups(results)
+
+    if args.output is not None:
+        write_results(results, args.output, benchmark="hashing", arguments={
+            k: str(v) for (k, v) in vars(args).items()
+        })
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,131 @@
+'''
+Addon model micro-benchmarks
+
+Build thousands of synthetic Addon (AddonBase + Binding) and AddonMetadata
+objects and time their construction, deep copy, json round trip and the
+binding derived paths (is_headless, workspace, ...) as read in the update loops,
+with tracemalloc memory snapshots.
+
+usage: python bench/bench_model.py [--sizes 1000 5000 10000] [--reads 10] [--repeat 5]
+                                   [--top-allocations 0] [--output bench_output.json]
+'''
+
+import argparse
+import copy
+import logging
+from pathlib import Path
+from typing import List, Tuple
+
+from common import PhaseResult, print_results, write_results
+from bench_settings import run_phase
+
+from yaam.model.mutable.addon import Addon
+from yaam.model.mutable.addon_base import AddonBase
+from yaam.model.mutable.binding import Binding
+from yaam.model.mutable.metadata import AddonMetadata
+from yaam.model.type.binding import BindingType
+
+BINDING_TYPES = [_ for _ in BindingType if _ is not BindingType.NONE]
+
+
+def build_models(size: int) -> Tuple[List[Addon], List[AddonMetadata]]:
+    '''
+    Return the given number of synthetic addons and their metadata
+    '''
+    addons = []
+    metadata = []
+
+    for i in range(size):
+        name = f"Addon {i}"
+        binding_type = BINDING_TYPES[i % len(BINDING_TYPES)]
+        suffix = binding_type.suffix if len(binding_type.suffix) > 0 else ".txt"
+        path = Path("addons", f"addon_{i}", f"addon_{i}{suffix}") if i % 10 != 0 else Path("addons", f"addon_{i}")
+        uri = f"https://api.github.com/repos/bench/addon_{i}/releases/latest"
+
+        base = AddonBase(
+            name=name,
+            uri=uri,
+            description=f"Synthetic addon {i}",
+            contribs=[f"contributor_{i % 17}"],
+            dependencies=[f"Addon {i - 1}"] if i % 5 == 0 and i > 0 else []
+        )
+        binding = Binding(name, path, [], i % 4 != 0, i % 3 != 0, binding_type)
+
+        addons.append(Addon(base, binding, dict()))
+        metadata.append(AddonMetadata(
+            addon=name, uri=uri, etag=f"W/\"{i:08x}\"",
+            last_modified="Wed, 21 Oct 2015 07:28:00 GMT", hash_signature=f"{i:064x}"
+        ))
+
+    return (addons, metadata)
+
+
+def read_paths(addons: List[Addon], reads: int):
+    '''
+    Read the binding derived paths as many times as the update loops do
+    '''
+    for _ in range(reads):
+        for addon in addons:
+            binding = addon.binding
+            if not binding.is_headless:
+                binding.default_naming
+            binding.workspace
+
+
+def run_models(size: int, args: argparse.Namespace) -> List[PhaseResult]:
+    '''
+    Run the model micro-benchmarks over a synthetic addon set of the given size
+    '''
+    (addons, metadata) = build_models(size)
+
+    bases = [_.base.to_json() for _ in addons]
+    bindings = [_.binding.to_json() for _ in addons]
+    records = [_.to_json() for _ in metadata]
+
+    def from_json():
+        for (base, binding, record) in zip(bases, bindings, records):
+            Addon(AddonBase.from_json(base), Binding.from_json(binding), dict())
+            AddonMetadata.from_json(record)
+
+    phases = [
+        ("model.build", lambda: build_models(size)),
+        ("model.deepcopy", lambda: copy.deepcopy(addons)),
+        ("metadata.deepcopy", lambda: copy.deepcopy(metadata)),
+        ("model.to_json", lambda: [(_.base.to_json(), _.binding.to_json()) for _ in addons]),
+        ("model.from_json", from_json),
+        ("binding.paths", lambda: read_paths(addons, args.reads)),
+    ]
+
+    return [run_phase(name, size, func, args.repeat, args.top_allocations) for (name, func) in phases]
+
+
+def main() -> int:
+    '''
+    Benchmark entrypoint
+    '''
+    parser = argparse.ArgumentParser(description="YAAM addon model micro-benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 10000], help="Synthetic addon set sizes")
+    parser.add_argument("--reads", type=int, default=10, help="Reads of the binding paths per addon")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per phase (best is reported)")
+    parser.add_argument("--top-allocations", type=int, default=0, help="Report the top allocation sites per phase")
+    parser.add_argument("--output", type=Path, default=None, help="Write the results as json to the given path")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    results: List[PhaseResult] = []
+    for size in args.sizes:
+        results.extend(run_models(size, args))
+
+    print_results(results)
+
+    if args.output is not None:
+        write_results(results, args.output, benchmark="model", arguments={
+            k: str(v) for (k, v) in vars(args).items()
+        })
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,180 @@
+'''
+Settings model micro-benchmarks
+
+Generate synthetic addons.json, settings.json, arguments.json and namings.json
+with thousands of addons across all the binding types and time
+YaamGameSettings load, synthetize, digest and save, AbstractGame.synthetize
+and print_addon_tableau separately, with tracemalloc memory snapshots.
+
+usage: python bench/bench_settings.py [--sizes 1000 5000] [--arguments 200] [--repeat 5]
+                                      [--top-allocations 0] [--output bench_output.json]
+'''
+
+import argparse
+import json
+import logging
+import tempfile
+from pathlib import Path
+from typing import Callable, List
+
+from common import PhaseResult, make_context, measure, print_results, write_results
+
+from yaam.model.appcontext import GameContext
+from yaam.model.game.generic.base import GenericGame
+from yaam.model.game.generic.config import GenericGameConfig
+from yaam.model.game.generic.settings import GenericYaamGameSettings
+from yaam.model.type.binding import BindingType
+from yaam.utils.print import print_addon_tableau
+
+BINDING_TYPES = [_ for _ in BindingType if _ is not BindingType.NONE]
+GRAPHIC_ARGUMENTS = ["dx9", "dx10", "dx11", "dx12", "vulkan"]
+
+
+def generate_settings(context: GameContext, n_addons: int, n_arguments: int):
+    '''
+    Write synthetic yaam settings for the given number of addons and arguments
+    '''
+    arguments = [{'name': _, 'values': [], 'description': f"Use {_}", 'deprecated': False} for _ in GRAPHIC_ARGUMENTS]
+    for i in range(n_arguments):
+        if i % 4 == 0:
+            arguments.append({'name': f"arg{i}", 'values': [], 'value_type': "numeric", 'description': f"Argument {i}"})
+        else:
+            arguments.append({'name': f"arg{i}", 'values': [], 'description': f"Argument {i}", 'deprecated': i % 7 == 0})
+
+    addons = []
+    bindings = dict((_.signature, list()) for _ in BINDING_TYPES)
+    namings = dict((_.signature, list()) for _ in BINDING_TYPES)
+
+    for i in range(n_addons):
+        name = f"Addon {i}"
+        is_shader = i % 50 == 0
+
+        addons.append({
+            'name': name,
+            'uri': f"https://api.github.com/repos/bench/addon_{i}/releases/latest",
+            'description': f"Synthetic addon {i}",
+            'contribs': [f"contributor_{i % 17}"],
+            'dependencies': [f"Addon {i - 1}"] if i % 5 == 0 and i > 0 else [],
+            'is_shader': is_shader
+        })
+
+        # each addon is bound to one to three binding types
+        for j in range(1 + i % 3):
+            binding_type = BINDING_TYPES[(i + j) % len(BINDING_TYPES)]
+            suffix = binding_type.suffix if len(binding_type.suffix) > 0 else ".txt"
+
+            binding = {'name': name, 'enabled': i % 4 != 0, 'update': i % 3 != 0}
+            if not (is_shader and binding_type.can_shader()):
+                binding['path'] = f"addons\\addon_{i}\\addon_{i}{suffix}" if i % 10 != 0 else f"addons\\addon_{i}"
+
+            bindings[binding_type.signature].append(binding)
+
+            if i % 8 == 0:
+                namings[binding_type.signature].append({
+                    'addon': name,
+                    'naming': {f"addon_{i}\\addon_{i}{suffix}": f"addon_{i}{suffix}"}
+                })
+
+    enabled_arguments = [{'name': "dx11"}] + [
+        {'name': f"arg{i}", 'value': i} if i % 4 == 0 else {'name': f"arg{i}"}
+        for i in range(0, n_arguments, 3)
+    ]
+
+    for (path, obj) in [
+        (context.args_path, {'arguments': arguments}),
+        (context.addons_path, {'addons': addons}),
+        (context.settings_path, {'arguments': enabled_arguments, 'bindings': bindings}),
+        (context.naming_map_path, {'namings': namings}),
+    ]:
+        with open(path, "w", encoding="utf-8") as _:
+            json.dump(obj, _, indent=4)
+
+
+def run_phase(name: str, size: int, func: Callable[[], None], repeat: int, top_allocations: int) -> PhaseResult:
+    '''
+    Time the given function (best of the given repetitions)
+    then run it once more under tracemalloc
+    '''
+    best: PhaseResult = None
+    for _ in range(repeat):
+        with measure(name, size) as result:
+            func()
+        if best is None or result.wall < best.wall:
+            best = result
+
+    with measure(name, size, trace_allocations=True, top_allocations=top_allocations) as traced:
+        func()
+
+    best.alloc_peak = traced.alloc_peak
+    best.alloc_current = traced.alloc_current
+    best.top_allocations = traced.top_allocations
+
+    return best
+
+
+def run_settings(size: int, args: argparse.Namespace) -> List[PhaseResult]:
+    '''
+    Run the settings micro-benchmarks over a synthetic addon set of the given size
+    '''
+    results = []
+
+    with tempfile.TemporaryDirectory(prefix="yaam-bench-") as tmp_dir:
+
+        root = Path(tmp_dir)
+        context = make_context(root)
+        generate_settings(context, size, args.arguments)
+
+        def load() -> GenericYaamGameSettings:
+            settings = GenericYaamGameSettings(context, BindingType.D3D11)
+            settings.load()
+            return settings
+
+        settings = load()
+        game = GenericGame(GenericGameConfig(root), settings, context)
+        addons = game.synthetize()
+
+        phases = [
+            ("settings.load", load),
+            ("settings.synthetize", settings.synthetize),
+            ("settings.digest", settings.digest),
+            ("settings.save", settings.save),
+            ("game.synthetize", game.synthetize),
+            ("print_addon_tableau", lambda: print_addon_tableau(addons, printer=lambda _: None)),
+        ]
+
+        for (name, func) in phases:
+            results.append(run_phase(name, size, func, args.repeat, args.top_allocations))
+
+    return results
+
+
+def main() -> int:
+    '''
+    Benchmark entrypoint
+    '''
+    parser = argparse.ArgumentParser(description="YAAM settings micro-benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000], help="Synthetic addon set sizes")
+    parser.add_argument("--arguments", type=int, default=200, help="Number of synthetic arguments")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per phase (best is reported)")
+    parser.add_argument("--top-allocations", type=int, default=0, help="Report the top allocation sites per phase")
+    parser.add_argument("--output", type=Path, default=None, help="Write the results as json to the given path")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    results: List[PhaseResult] = []
+    for size in args.sizes:
+        results.extend(run_settings(size, args))
+
+    print_results(results)
+
+    if args.output is not None:
+        write_results(results, args.output, benchmark="settings", arguments={
+            k: str(v) for (k, v) in vars(args).items()
+        })
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,183 @@
+'''
+Update pipeline benchmark
+
+Drive AddonManager.initialize_metadata -> AddonManager.update_addons
+over synthetic addon sets served by a local GitHub-like stand-in
+and report wall time, request count, bytes and peak RSS per phase.
+
+usage: python bench/bench_update_pipeline.py [--sizes 10 100 1000] [--latency 0] [--bandwidth 0]
+                                             [--asset-size 64] [--repeat 1] [--trace-allocations]
+                                             [--output bench_output.json]
+'''
+
+import argparse
+import io
+import logging
+import tempfile
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List
+
+from common import PhaseResult, make_context, measure, print_results, write_results
+from stub_server import GITHUB_API_ROOT, StubObject, StubServer
+
+from yaam.controller.http import HttpRequestManager
+from yaam.controller.manage import AddonManager
+from yaam.controller.metadata import MetadataCollector
+from yaam.controller.update.updater import AddonUpdater
+from yaam.model.appconfig import AppConfig
+from yaam.model.mutable.addon import Addon
+from yaam.model.mutable.addon_base import AddonBase
+from yaam.model.mutable.binding import Binding
+from yaam.model.type.binding import BindingType
+
+OUTDATED_TIMESTAMP = "Mon, 01 Jan 2024 00:00:00 GMT"
+
+
+def make_payload(index: int, size: int) -> bytes:
+    '''
+    Return a deterministic payload of the given size
+    '''
+    seed = f"yaam-addon-{index}-".encode("ascii")
+    return (seed * (size // len(seed) + 1))[:size]
+
+
+def make_zip(name: str, payload: bytes) -> bytes:
+    '''
+    Return a zip archive containing the given payload
+    '''
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as _:
+        _.writestr(name, payload)
+        _.writestr("README.txt", b"synthetic addon")
+    return buffer.getvalue()
+
+
+def make_addons(server: StubServer, root: Path, size: int, asset_size: int) -> List[Addon]:
+    '''
+    Publish and return a synthetic addon set evenly split in
+    zipped github releases, plain github releases and raw datastreams
+    '''
+    addons = []
+    published = datetime.now(timezone.utc).replace(microsecond=0)
+
+    for i in range(size):
+        name = f"addon_{i}"
+        payload = make_payload(i, asset_size)
+
+        if i % 3 == 0:
+            asset = StubObject(f"{name}.zip", make_zip(f"{name}.dll", payload), published, "application/zip")
+            uri = server.add_release("bench", name, "v1.0.0", [asset])
+        elif i % 3 == 1:
+            asset = StubObject(f"{name}.dll", payload, published)
+            uri = server.add_release("bench", name, "v1.0.0", [asset])
+        else:
+            uri = server.add_object(StubObject(f"{name}.dll", payload, published))
+
+        base = AddonBase(name=f"Addon {i}", uri=uri, description="synthetic addon")
+        binding = Binding(
+            name=base.name,
+            path=root / "game" / name / f"{name}.dll",
+            enabled=True,
+            updateable=True,
+            binding_type=BindingType.AGNOSTIC
+        )
+
+        addons.append(Addon(base, binding, dict()))
+
+    return addons
+
+
+def seed_installed_addons(addons: List[Addon], metadata: MetadataCollector):
+    '''
+    Install an outdated copy of every other addon along with its local metadata
+    '''
+    metadata.load_local_metadata(addons)
+
+    for (i, addon) in enumerate(addons):
+        if i % 2 == 0:
+            addon.binding.path.parent.mkdir(parents=True, exist_ok=True)
+            addon.binding.path.write_bytes(b"outdated")
+
+            local = metadata.get_local_metadata(addon)
+            local.last_modified = OUTDATED_TIMESTAMP
+            metadata.save_metadata(local, local.uri)
+
+
+def run_pipeline(size: int, args: argparse.Namespace) -> List[PhaseResult]:
+    '''
+    Run the update pipeline over a synthetic addon set of the given size
+    '''
+    results = []
+
+    bandwidth = args.bandwidth * 1024 if args.bandwidth > 0 else None
+
+    with tempfile.TemporaryDirectory(prefix="yaam-bench-") as tmp_dir, \
+            StubServer(latency=args.latency / 1000, bandwidth=bandwidth, rate_limit=10 * size + 100) as server:
+
+        root = Path(tmp_dir)
+        context = make_context(root)
+        addons = make_addons(server, root, size, args.asset_size * 1024)
+
+        with HttpRequestManager(AppConfig()) as http:
+            http.mount(GITHUB_API_ROOT, server.adapter())
+
+            metadata = MetadataCollector(http, context)
+            seed_installed_addons(addons, metadata)
+
+            manager = AddonManager(metadata, AddonUpdater(http), BindingType.AGNOSTIC)
+
+            server.stats.reset()
+
+            with measure("initialize_metadata", size, args.trace_allocations) as result:
+                manager.initialize_metadata(addons, prefetch_updates=True, force_updates=False)
+            results.append(result)
+
+            with measure("update_addons", size, args.trace_allocations) as result:
+                manager.update_addons(addons, force_updates=False)
+            results.append(result)
+
+        installed = sum(1 for _ in addons if _.binding.path.exists() and _.binding.path.read_bytes() != b"outdated")
+        if installed != size:
+            logging.getLogger().warning(msg=f"Only {installed} of {size} addons have been installed or updated")
+
+        logging.getLogger().info(msg=f"Server stats for {size} addons: {server.stats}")
+
+    return results
+
+
+def main() -> int:
+    '''
+    Benchmark entrypoint
+    '''
+    parser = argparse.ArgumentParser(description="YAAM update pipeline benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="Synthetic addon set sizes")
+    parser.add_argument("--latency", type=float, default=0.0, help="Server latency per request [ms]")
+    parser.add_argument("--bandwidth", type=int, default=0, help="Server bandwidth per response [KiB/s] (0 = unlimited)")
+    parser.add_argument("--asset-size", type=int, default=64, help="Uncompressed asset size [KiB]")
+    parser.add_argument("--repeat", type=int, default=1, help="Number of runs per size")
+    parser.add_argument("--trace-allocations", action="store_true", help="Trace python allocations (slower)")
+    parser.add_argument("--output", type=Path, default=None, help="Write the results as json to the given path")
+    parser.add_argument("--verbose", action="store_true", help="Log benchmark progress")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+
+    results: List[PhaseResult] = []
+    for size in args.sizes:
+        for _ in range(args.repeat):
+            results.extend(run_pipeline(size, args))
+
+    print_results(results)
+
+    if args.output is not None:
+        write_results(results, args.output, benchmark="update_pipeline", arguments={
+            k: str(v) for (k, v) in vars(args).items()
+        })
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,240 @@
+'''
+Shared benchmark measurement helpers
+'''
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+if str(ROOT_DIR / "src") not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from yaam.model.appcontext import GameContext  # noqa: E402 pylint: disable=C0413
+from yaam.utils.profiler import static_profiler as profiler  # noqa: E402 pylint: disable=C0413
+
+
+def make_context(root: Path) -> GameContext:
+    '''
+    Return a game context rooted in the given directory
+    '''
+    yaam_game_dir = root / "yaam"
+    metadata_dir = root / "metadata"
+    cache_dir = root / "cache"
+
+    for _ in [yaam_game_dir, metadata_dir, cache_dir]:
+        _.mkdir(parents=True, exist_ok=True)
+
+    return GameContext(
+        game_root=root / "game",
+        yaam_game_dir=yaam_game_dir,
+        args_path=yaam_game_dir / "arguments.json",
+        addons_path=yaam_game_dir / "addons.json",
+        settings_path=yaam_game_dir / "settings.json",
+        naming_map_path=yaam_game_dir / "namings.json",
+        cache_dir=cache_dir,
+        metadata_dir=metadata_dir
+    )
+
+
+def rss_bytes() -> int:
+    '''
+    Return the current resident set size of the process, if available
+    '''
+    try:
+        import psutil  # pylint: disable=C0415
+
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as _:
+            return int(_.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class RSSSampler(object):
+    '''
+    Background sampler tracking the peak resident set size within a time window
+    '''
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.__interval = interval
+        self.__stop = threading.Event()
+        self.__thread: threading.Thread = None
+        self.start_rss: int = None
+        self.peak_rss: int = None
+
+    def __sample(self):
+        while not self.__stop.wait(self.__interval):
+            self.__update(rss_bytes())
+
+    def __update(self, rss: int):
+        if rss is not None and (self.peak_rss is None or rss > self.peak_rss):
+            self.peak_rss = rss
+
+    def start(self):
+        '''
+        Start sampling
+        '''
+        self.start_rss = rss_bytes()
+        self.__update(self.start_rss)
+        if self.start_rss is not None:
+            self.__thread = threading.Thread(target=self.__sample, daemon=True)
+            self.__thread.start()
+
+    def stop(self):
+        '''
+        Stop sampling
+        '''
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join()
+        self.__update(rss_bytes())
+
+
+@dataclass
+class PhaseResult(object):
+    '''
+    Measurements of a single benchmark phase
+    '''
+    name: str = field(default_factory=str)
+    size: int = field(default=0)
+    wall: float = field(default=0.0)
+    requests: int = field(default=0)
+    http_bytes: int = field(default=0)
+    disk_bytes: int = field(default=0)
+    peak_rss: int = field(default=None)
+    rss_delta: int = field(default=None)
+    alloc_peak: int = field(default=None)
+    alloc_current: int = field(default=None)
+    spans: Dict[str, float] = field(default_factory=dict)
+    top_allocations: List[str] = field(default_factory=list)
+
+    def to_table(self) -> dict:
+        '''
+        Return a printable dict repr of the phase measurements
+        '''
+        return {
+            'phase': self.name,
+            'size': self.size,
+            'wall [s]': round(self.wall, 4),
+            'requests': self.requests,
+            'http [KiB]': round(self.http_bytes / 1024, 1),
+            'disk [KiB]': round(self.disk_bytes / 1024, 1),
+            'peak rss [MiB]': _mib(self.peak_rss),
+            'rss delta [MiB]': _mib(self.rss_delta),
+            'alloc peak [MiB]': _mib(self.alloc_peak),
+        }
+
+
+def _mib(value: int):
+    return round(value / 1024 ** 2, 2) if value is not None else "N/A"
+
+
+@contextmanager
+def measure(name: str, size: int = 0, trace_allocations: bool = False, top_allocations: int = 0) -> Iterator[PhaseResult]:
+    '''
+    Measure the enclosed code wall time, http and disk traffic
+    (as reported by the yaam profiler), peak RSS and, optionally,
+    python allocations by means of tracemalloc.
+
+    If top_allocations > 0, the given number of allocation sites
+    still alive at the end of the phase are reported as well.
+    '''
+    result = PhaseResult(name=name, size=size)
+
+    was_enabled = profiler().is_enabled
+    profiler().enable()
+
+    counters = profiler().counters
+    spans_before = len(profiler().spans)
+
+    sampler = RSSSampler()
+    sampler.start()
+
+    if trace_allocations:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result.wall = time.perf_counter() - start
+
+        if trace_allocations:
+            (result.alloc_current, result.alloc_peak) = tracemalloc.get_traced_memory()
+            if top_allocations > 0:
+                snapshot = tracemalloc.take_snapshot().filter_traces([
+                    tracemalloc.Filter(False, __file__),
+                    tracemalloc.Filter(False, tracemalloc.__file__),
+                ])
+                statistics = snapshot.statistics("lineno")
+                result.top_allocations = [str(_) for _ in statistics[:top_allocations]]
+            tracemalloc.stop()
+
+        sampler.stop()
+        result.peak_rss = sampler.peak_rss
+        if sampler.peak_rss is not None and sampler.start_rss is not None:
+            result.rss_delta = sampler.peak_rss - sampler.start_rss
+
+        after = profiler().counters
+        result.requests = after.get("http.requests", 0) - counters.get("http.requests", 0)
+        result.http_bytes = after.get("http.bytes", 0) - counters.get("http.bytes", 0)
+        result.disk_bytes = after.get("disk.bytes", 0) - counters.get("disk.bytes", 0)
+
+        for _ in profiler().spans[spans_before:]:
+            if _.category == "phase" and not _.name.endswith(".addon"):
+                result.spans[_.name] = result.spans.get(_.name, 0.0) + _.delta()
+
+        if not was_enabled:
+            profiler().disable()
+
+
+def print_results(results: List[PhaseResult], printer: Callable[[str], None] = print):
+    '''
+    Print the given results as a table
+    '''
+    rows = [_.to_table() for _ in results]
+
+    try:
+        from tabulate import tabulate  # pylint: disable=C0415
+
+        printer(tabulate(rows, headers="keys", tablefmt="github"))
+    except ImportError:
+        for row in rows:
+            printer(", ".join(f"{k}: {v}" for (k, v) in row.items()))
+
+    for _ in results:
+        if len(_.spans) > 0:
+            spans = ", ".join(f"{k}={v:.4f}s" for (k, v) in _.spans.items())
+            printer(f"{_.name}[{_.size}] spans: {spans}")
+
+    for _ in results:
+        if len(_.top_allocations) > 0:
+            printer(f"{_.name}[{_.size}] top allocations:")
+            for line in _.top_allocations:
+                printer(f"  {line}")
+
+
+def write_results(results: List[PhaseResult], path: Path, **metadata):
+    '''
+    Write the given results as json
+    '''
+    with open(path, "w", encoding="utf-8") as _:
+        json.dump({
+            'python': sys.version,
+            'platform': sys.platform,
+            **metadata,
+            'results': [asdict(_) for _ in results]
+        }, _, indent=4)
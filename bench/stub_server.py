@@ -0,0 +1,333 @@
+'''
+Local GitHub-like HTTP stand-in for benchmarks
+
+Serves release lists, rate-limit headers, redirected asset downloads
+and raw datastreams with a configurable latency and bandwidth, and
+provides a requests transport adapter that reroutes https://api.github.com
+to the local server.
+'''
+
+import json
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+from urllib.parse import urlparse
+
+from requests.adapters import HTTPAdapter
+
+GITHUB_API_ROOT = "https://api.github.com"
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    '''
+    Threaded HTTP server ignoring the connections dropped by the clients
+    (e.g.: downloads abandoned on timeout or once the benchmark is over)
+    '''
+
+    def handle_error(self, request, client_address):
+        if isinstance(sys.exc_info()[1], (ConnectionResetError, ConnectionAbortedError, BrokenPipeError)):
+            return
+        super().handle_error(request, client_address)
+
+
+@dataclass(frozen=True)
+class StubObject(object):
+    '''
+    Downloadable payload served by the stub
+    '''
+    name: str = field(default_factory=str)
+    payload: bytes = field(default_factory=bytes)
+    last_modified: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    content_type: str = field(default="application/octet-stream")
+
+    @property
+    def etag(self) -> str:
+        '''
+        Weak etag of the payload
+        '''
+        return f'"{len(self.payload):x}-{int(self.last_modified.timestamp()):x}"'
+
+
+@dataclass
+class StubStats(object):
+    '''
+    Server side request statistics
+    '''
+    requests: Dict[str, int] = field(default_factory=dict)
+    bytes_sent: int = field(default=0)
+
+    def reset(self):
+        '''
+        Reset the statistics
+        '''
+        self.requests.clear()
+        self.bytes_sent = 0
+
+
+class StubServer(object):
+    '''
+    Threaded local HTTP server mimicking the GitHub releases API
+    and its asset storage
+
+    @latency: float -- seconds to wait before answering any request
+    @bandwidth: int -- bytes per second for response bodies (None = unlimited)
+    @rate_limit: int -- API calls available before the server answers 403
+    '''
+
+    def __init__(self, latency: float = 0.0, bandwidth: int = None, rate_limit: int = 5000) -> None:
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.rate_limit = rate_limit
+        self.stats = StubStats()
+
+        self.__lock = threading.Lock()
+        self.__api_calls = 0
+        self.__objects: Dict[str, StubObject] = dict()
+        self.__releases: Dict[Tuple[str, str], List[dict]] = dict()
+        self.__server: ThreadingHTTPServer = None
+        self.__thread: threading.Thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, typing, value, traceback):
+        self.stop()
+
+    @property
+    def root(self) -> str:
+        '''
+        Return the server root url
+        '''
+        (host, port) = self.__server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        '''
+        Start serving on a free local port
+        '''
+        self.__server = _QuietHTTPServer(("127.0.0.1", 0), _make_handler(self))
+        self.__server.daemon_threads = True
+        self.__thread = threading.Thread(target=self.__server.serve_forever, daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        '''
+        Stop serving
+        '''
+        if self.__server is not None:
+            self.__server.shutdown()
+            self.__server.server_close()
+            self.__thread.join()
+            self.__server = None
+
+    def adapter(self) -> HTTPAdapter:
+        '''
+        Return a transport adapter rerouting the GitHub API to this server
+        '''
+        return RerouteAdapter(GITHUB_API_ROOT, self.root)
+
+    def add_object(self, obj: StubObject) -> str:
+        '''
+        Serve the given payload as raw datastream and return its url
+        '''
+        self.__objects[obj.name] = obj
+        return f"{self.root}/objects/{obj.name}"
+
+    def add_release(self, owner: str, repo: str, tag: str, assets: List[StubObject]) -> str:
+        '''
+        Publish a release with the given assets and return the release list API url
+        '''
+        published_at = max([_.last_modified for _ in assets], default=datetime.now(timezone.utc))
+
+        release = {
+            'name': f"{repo} {tag}",
+            'tag_name': tag,
+            'draft': False,
+            'prerelease': False,
+            'published_at': published_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            'assets': []
+        }
+
+        for _ in assets:
+            self.__objects[_.name] = _
+            release['assets'].append({
+                'name': _.name,
+                'size': len(_.payload),
+                'browser_download_url': f"{self.root}/{owner}/{repo}/releases/download/{tag}/{_.name}"
+            })
+
+        self.__releases.setdefault((owner, repo), list()).insert(0, release)
+
+        return f"{GITHUB_API_ROOT}/repos/{owner}/{repo}/releases"
+
+    def _count(self, kind: str) -> int:
+        with self.__lock:
+            self.stats.requests[kind] = self.stats.requests.get(kind, 0) + 1
+            if kind == "api":
+                self.__api_calls += 1
+            return self.__api_calls
+
+    def _sent(self, size: int):
+        with self.__lock:
+            self.stats.bytes_sent += size
+
+    def _ratelimit_headers(self) -> Dict[str, str]:
+        remaining = max(self.rate_limit - self.__api_calls, 0)
+        return {
+            'x-ratelimit-limit': str(self.rate_limit),
+            'x-ratelimit-remaining': str(remaining),
+            'x-ratelimit-used': str(self.__api_calls),
+            'x-ratelimit-reset': str(int(time.time()) + 3600)
+        }
+
+    def _object(self, name: str) -> StubObject:
+        return self.__objects.get(name, None)
+
+    def _releases(self, owner: str, repo: str) -> List[dict]:
+        return self.__releases.get((owner, repo), None)
+
+
+class RerouteAdapter(HTTPAdapter):
+    '''
+    Transport adapter rewriting the source url prefix to the target one
+    '''
+
+    def __init__(self, source: str, target: str, **kwargs) -> None:
+        self.__source = source
+        self.__target = target
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):  # pylint: disable=W0221
+        if request.url.startswith(self.__source):
+            request.url = self.__target + request.url[len(self.__source):]
+        return super().send(request, **kwargs)
+
+
+def _make_handler(server: StubServer):
+
+    class StubHandler(BaseHTTPRequestHandler):
+        '''
+        Stub request handler
+        '''
+
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):  # pylint: disable=W0622
+            pass
+
+        def do_HEAD(self):  # pylint: disable=C0103
+            '''
+            HTTP HEAD
+            '''
+            self.__dispatch(send_body=False)
+
+        def do_GET(self):  # pylint: disable=C0103
+            '''
+            HTTP GET
+            '''
+            self.__dispatch(send_body=True)
+
+        def __dispatch(self, send_body: bool):
+            if server.latency > 0:
+                time.sleep(server.latency)
+
+            path = urlparse(self.path).path
+            parts = [_ for _ in path.split("/") if len(_) > 0]
+
+            if parts == ["rate_limit"]:
+                # as on GitHub, querying the rate limit doesn't consume it
+                server._count("rate_limit")
+                self.__send_json({'resources': {}}, server._ratelimit_headers(), send_body)
+            elif len(parts) >= 4 and parts[0] == "repos" and parts[3] == "releases":
+                self.__send_releases(parts, send_body)
+            elif len(parts) == 6 and parts[2:4] == ["releases", "download"]:
+                server._count("redirect")
+                self.__send_status(302, {'Location': f"{server.root}/objects/{parts[5]}"})
+            elif len(parts) == 2 and parts[0] == "objects" and server._object(parts[1]) is not None:
+                self.__send_object(server._object(parts[1]), send_body)
+            else:
+                server._count("missing")
+                self.__send_status(404)
+
+        def __send_releases(self, parts: List[str], send_body: bool):
+            api_calls = server._count("api")
+            releases = server._releases(parts[1], parts[2])
+            headers = server._ratelimit_headers()
+
+            if api_calls > server.rate_limit:
+                self.__send_status(403, headers)
+            elif releases is None:
+                self.__send_status(404, headers)
+            elif len(parts) == 5 and parts[4] == "latest":
+                self.__send_json(releases[0], headers, send_body)
+            else:
+                self.__send_json(releases, headers, send_body)
+
+        def __send_status(self, code: int, headers: Dict[str, str] = None):
+            self.send_response(code)
+            for (key, value) in (headers or dict()).items():
+                self.send_header(key, value)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def __send_json(self, obj, headers: Dict[str, str], send_body: bool):
+            payload = json.dumps(obj).encode("utf-8")
+            headers = dict(headers)
+            headers['Content-Type'] = "application/json; charset=utf-8"
+            self.__send_payload(payload, headers, send_body)
+
+        def __send_object(self, obj: StubObject, send_body: bool):
+            server._count("object")
+
+            headers = {
+                'Content-Type': obj.content_type,
+                'Content-Disposition': f'attachment; filename="{obj.name}"',
+                'Last-Modified': format_datetime(obj.last_modified, usegmt=True),
+                'ETag': obj.etag,
+                'Accept-Ranges': 'bytes'
+            }
+
+            payload = obj.payload
+            status = 200
+
+            byte_range = self.headers.get('Range', None)
+            if byte_range is not None and byte_range.startswith("bytes="):
+                (start, _, end) = byte_range[len("bytes="):].partition("-")
+                start = int(start) if len(start) > 0 else 0
+                end = min(int(end), len(obj.payload) - 1) if len(end) > 0 else len(obj.payload) - 1
+                payload = obj.payload[start:end + 1]
+                headers['Content-Range'] = f"bytes {start}-{end}/{len(obj.payload)}"
+                status = 206
+
+            self.__send_payload(payload, headers, send_body, status)
+
+        def __send_payload(self, payload: bytes, headers: Dict[str, str], send_body: bool, status: int = 200):
+            self.send_response(status)
+            for (key, value) in headers.items():
+                self.send_header(key, value)
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+
+            if send_body:
+                self.__write_throttled(payload)
+
+        def __write_throttled(self, payload: bytes):
+            chunk_size = 64 * 1024
+            if server.bandwidth is not None and server.bandwidth > 0:
+                chunk_size = max(min(chunk_size, server.bandwidth // 10), 1)
+
+            for offset in range(0, len(payload), chunk_size):
+                chunk = payload[offset:offset + chunk_size]
+                self.wfile.write(chunk)
+                server._sent(len(chunk))
+                if server.bandwidth is not None and server.bandwidth > 0:
+                    time.sleep(len(chunk) / server.bandwidth)
+
+    return StubHandler
@@ -0,0 +1,80 @@
+'''
+Import-time audit script
+
+Run the given module under `python -X importtime` and report
+the most expensive imports, optionally failing if any of the
+forbidden modules is imported at start-up.
+
+usage: python res/scripts/importtime-report.py [--module main] [--top 20] [--forbid requests,bs4,lxml,dateutil,tabulate,sqlite3,concurrent.futures]
+'''
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+
+def collect_import_times(module: str, src_dir: Path) -> List[Tuple[str, int, int, int]]:
+    '''
+    Return the list of (module, self_us, cumulative_us, depth) imported by the given module
+    '''
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([str(src_dir), env.get('PYTHONPATH', '')])
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(src_dir), env=env, capture_output=True, text=True, check=False
+    )
+
+    if proc.returncode != 0:
+        print(proc.stderr, file=sys.stderr)
+        sys.exit(proc.returncode)
+
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        [self_us, cumulative_us, name] = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+
+    return entries
+
+
+def main() -> int:
+    '''
+    Script entrypoint
+    '''
+    root = Path(__file__).resolve().parents[2]
+
+    parser = argparse.ArgumentParser(description="YAAM import-time audit")
+    parser.add_argument("--module", default="main", help="Module to import (default: main)")
+    parser.add_argument("--top", type=int, default=20, help="Number of entries to report")
+    parser.add_argument("--forbid", default="", help="Comma separated modules that must not be imported")
+    args = parser.parse_args()
+
+    entries = collect_import_times(args.module, root / "src")
+
+    total = next((_[2] for _ in entries if _[0] == args.module), 0)
+    print(f"Importing {args.module} took {total / 1000:.1f} ms ({len(entries)} modules)\n")
+
+    print(f"{'cumulative [ms]':>16} {'self [ms]':>10}  module")
+    for (name, self_us, cumulative_us, depth) in sorted(entries, key=lambda x: x[2], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>16.1f} {self_us / 1000:>10.1f}  {'  ' * depth}{name}")
+
+    imported = set(_[0] for _ in entries)
+    forbidden = [_.strip() for _ in args.forbid.split(",") if len(_.strip()) > 0]
+    violations = [_ for _ in forbidden if _ in imported]
+
+    if len(violations) > 0:
+        print(f"\nForbidden modules imported at start-up: {', '.join(violations)}", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,24 +4,24 @@ YAAM main module
 
 import sys
 from copy import deepcopy
+from typing import List, Set
 # from yaam.controller.cmd.repl import repl
-from yaam.controller.http import HttpRequestManager
-from yaam.controller.metadata import MetadataCollector
-from yaam.controller.update.updater import AddonUpdater
-from yaam.controller.manage import AddonManager
+# controllers are imported by the code paths using them, as to keep the start-up light
 from yaam.model.game.factory import GameFactory, IGame
 from yaam.model.mutable.addon_base import AddonBase
+from yaam.model.mutable.addon import Addon
 from yaam.model.mutable.binding import Binding
 from yaam.model.type.binding import BindingType
 from yaam.utils import process
 from yaam.model.options import Option
 from yaam.utils.counter import ForwardCounter
 from yaam.utils.logger import init_static_logger, logging
-from yaam.utils.print import print_addon_tableau
+from yaam.utils.print import print_addon_tableau, print_update_report, print_verify_report
 from yaam.utils.exceptions import ConfigLoadException
 from yaam.model.appcontext import AppContext
 from yaam.utils.timer import Timer
 from yaam.utils.exceptions import exception_handler
+from yaam.utils.profiler import static_profiler as profiler
 
 #####################################################################
 
@@ -49,18 +49,110 @@ def select_game(app_context: AppContext, logger: logging.Logger) -> str:
     return game_name
 
 
+def update_all_games(app_context: AppContext, logger: logging.Logger) -> bool:
+    '''
+    Update the addons of every configured game through a shared HTTP pool
+    '''
+    from yaam.controller.batch import BatchUpdater
+    from yaam.controller.download import SegmentedDownloader
+    from yaam.controller.http import HttpRequestManager
+    from yaam.controller.update.installer import InstallerExecutor
+
+    game_names = app_context.game_list()
+
+    if len(game_names) == 0:
+        logger.error(msg="Game directory is empty...")
+        return False
+
+    force_updates: bool = app_context.config.get_property(Option.FORCE_ACTION)
+    interactive: bool = not app_context.config.get_property(Option.NON_INTERACTIVE)
+    workers: int = max(int(app_context.config.get_property(Option.JOBS)), 1)
+    installer = InstallerExecutor(float(app_context.config.get_property(Option.INSTALLER_TIMEOUT)))
+    segments: int = max(int(app_context.config.get_property(Option.SEGMENTS)), 1)
+
+    with HttpRequestManager(app_context.config, memoize=True, state_dir=app_context.cache_dir) as http:
+        results = BatchUpdater(
+            http, app_context, force_updates, interactive, workers, installer, SegmentedDownloader(http, segments)
+        ).run(game_names)
+
+    print_update_report(results, lambda x: logger.info(msg=x))
+
+    logger.info(msg="Batch update complete. Closing...")
+
+    return len(results) > 0
+
+
+def uninstall_addons(game: IGame[AddonBase, Binding], addons: List[Addon], names: List[str],
+                     force: bool, logger: logging.Logger) -> bool:
+    '''
+    Delete the files written by the updates of the given addons and disable them
+    '''
+    from yaam.controller.metadata import MetadataCollector
+
+    installed_files = MetadataCollector(None, game.context).installed_files
+
+    found: Set[str] = set()
+
+    for addon in addons:
+        if addon.base.name not in names:
+            continue
+
+        found.add(addon.base.name)
+
+        if len(installed_files.files(addon)) == 0:
+            logger.warning(msg=f"No file written by {addon.base.name} has been recorded (installers are not tracked). It must be removed manually.")
+        else:
+            (removed, kept) = installed_files.uninstall(addon, force)
+            logger.info(msg=f"Uninstalled {addon.base.name}: {len(removed)} files removed, {len(kept)} kept.")
+
+        # otherwise it would be installed again by the next update
+        binding = game.settings.bindings[addon.binding.typing].get(addon.base.name, None)
+        if binding is not None:
+            binding.is_enabled = False
+
+    for _ in sorted(set(names) - found):
+        logger.error(msg=f"No addon named {_} is configured for the current binding.")
+
+    if len(found) > 0:
+        game.settings.save()
+
+    return len(found) == len(set(names))
+
+
+def verify_addons(game: IGame[AddonBase, Binding], addons: List[Addon], workers: int, logger: logging.Logger) -> bool:
+    '''
+    Verify the files written by the updates of the enabled addons
+    '''
+    from yaam.controller.metadata import MetadataCollector
+    from yaam.controller.verify import IntegrityVerifier
+
+    verifier = IntegrityVerifier(MetadataCollector(None, game.context).installed_files, workers)
+
+    reports = verifier.verify(addons)
+
+    print_verify_report(reports, lambda x: logger.info(msg=x))
+
+    return all(_.is_intact for _ in reports)
+
+
 def run_yaam(app_context: AppContext, logger: logging.Logger):
     '''
     Main thread
     '''
 
+    if app_context.config.get_property(Option.ALL_GAMES):
+        return update_all_games(app_context, logger)
+
     game: IGame[AddonBase, Binding] = None
     game_stasis: IGame[AddonBase, Binding] = None
+    # outcome of the requested action, as the process exit code
+    succeeded = True
     try:
         game_name = select_game(app_context, logger)
         if game_name is not None:
-            game = GameFactory.incarnate(game_name, app_context)
-            game_stasis = deepcopy(game)
+            with profiler().span("incarnation", game=game_name):
+                game = GameFactory.incarnate(game_name, app_context)
+                game_stasis = deepcopy(game)
 
     except ConfigLoadException as ex:
         logger.info(ex)
@@ -69,6 +161,13 @@ def run_yaam(app_context: AppContext, logger: logging.Logger):
             # is_edit_mode = app_context.config.get_property(Option.EDIT)
             is_addon_update_only = app_context.config.get_property(Option.UPDATE_ADDONS)
             is_run_only = app_context.config.get_property(Option.RUN_STACK)
+            is_daemon = app_context.config.get_property(Option.DAEMON)
+            uninstall_names: List[str] = app_context.config.get_property(Option.UNINSTALL)
+            is_verify = app_context.config.get_property(Option.VERIFY)
+            is_background_update: bool = (
+                app_context.config.get_property(Option.BACKGROUND_UPDATES)
+                and not is_run_only and not is_addon_update_only
+            )
             # is_export_only = app_context.config.get_property(Option.EXPORT)
             prefetch_updates: bool = not is_run_only
             # ignore_disabled: bool = False
@@ -93,7 +192,8 @@ def run_yaam(app_context: AppContext, logger: logging.Logger):
             logger.debug(msg=f"Previous settings digest is {prev_settings_digest}.")
 
             if curr_settings_digest != prev_settings_digest:
-                game.settings.save()
+                with profiler().span("settings.save"):
+                    game.settings.save()
                 logger.info(msg="Settings changes have been saved.")
             else:
                 logger.info(msg="No settings changes have been registered.")
@@ -105,55 +205,129 @@ def run_yaam(app_context: AppContext, logger: logging.Logger):
 
             timer = Timer()
             timer.tick()
-            addons_synthesis = game.synthetize()
+            with profiler().span("synthesis"):
+                addons_synthesis = game.synthetize()
             timer.tock()
             logger.debug(msg=f"Addon synthesis lasted {timer.delta()} seconds.")
 
             if curr_settings_digest != prev_settings_digest:
                 print_addon_tableau(addons_synthesis, lambda x: logger.info(msg=x))
 
-            with HttpRequestManager(app_context.config) as http:
-
-                addon_updater = AddonUpdater(http)
-                meta_collector = MetadataCollector(http, game.context)
-
-                manager = AddonManager(meta_collector, addon_updater, curr_game_binding)
-                manager.initialize_metadata(addons_synthesis, prefetch_updates, force_updates)
-                manager.resolve_renames(addons_synthesis, prev_addons_synthesis)
-                manager.update_disabled_addons_suffixes(addons_synthesis, ".disabled", "_0")
-                manager.disable_addons(addons_synthesis, prev_addons_synthesis, "_0")
-                manager.restore_addons(addons_synthesis, prev_addons_synthesis, "_0")
-
-                if not is_run_only:
-                    manager.update_addons(addons_synthesis, force_updates)
-
-            if not is_addon_update_only:
-                # for some reasons compiling this 4 line of code as
-                # args = [
-                #     str(_.synthetize())
-                #     for _ in game.settings.arguments
-                #     if not _.meta.is_deprecated and _.enabled
-                # ]
-                # will make Nuitka go completely bonkers
-                # therefore, future me, don't change it again.
-                args = []
-                for _ in game.settings.arguments:
-                    if not _.meta.is_deprecated and _.enabled:
-                        args.append(str(_.synthetize()))
-
-                process.arun(
-                    game.config.game_path,
-                    game.config.game_root,
-                    args
+            if uninstall_names:
+                succeeded = uninstall_addons(
+                    game, addons_synthesis, uninstall_names,
+                    app_context.config.get_property(Option.FORCE_ACTION), logger
                 )
-
-                for addon in addons_synthesis:
-                    if addon.binding.is_enabled and addon.binding.is_exe():
-                        process.arun(addon.binding.path, addon.binding.path.parent, addon.binding.args)
+            elif is_verify:
+                succeeded = verify_addons(
+                    game, addons_synthesis,
+                    max(int(app_context.config.get_property(Option.JOBS)), 1), logger
+                )
+            elif is_daemon:
+                from yaam.controller.daemon import UpdateDaemon
+                from yaam.controller.http import HttpRequestManager
+
+                with HttpRequestManager(app_context.config, state_dir=app_context.cache_dir) as http:
+                    daemon = UpdateDaemon(
+                        http, game.context,
+                        lambda: GameFactory.incarnate(game_name, app_context).synthetize(),
+                        interval=float(app_context.config.get_property(Option.DAEMON_INTERVAL))
+                    )
+                    daemon.serve_forever()
+            else:
+                from yaam.controller.daemon import DaemonClient
+                from yaam.controller.download import SegmentedDownloader
+                from yaam.controller.http import HttpRequestManager
+                from yaam.controller.manage import AddonManager
+                from yaam.controller.metadata import MetadataCollector
+                from yaam.controller.update.installer import InstallerExecutor
+                from yaam.controller.update.scheduler import UpdateScheduler
+                from yaam.controller.update.updater import AddonUpdater
+
+                with HttpRequestManager(app_context.config, state_dir=app_context.cache_dir) as http:
+
+                    addon_updater = AddonUpdater(
+                        http, interactive=not app_context.config.get_property(Option.NON_INTERACTIVE),
+                        installer=InstallerExecutor(float(app_context.config.get_property(Option.INSTALLER_TIMEOUT))),
+                        downloader=SegmentedDownloader(http, max(int(app_context.config.get_property(Option.SEGMENTS)), 1))
+                    )
+                    meta_collector = MetadataCollector(http, game.context)
+
+                    manager = AddonManager(
+                        meta_collector, addon_updater, curr_game_binding,
+                        journal_path=game.context.cache_dir / "renames.journal"
+                    )
+
+                    # addons not loaded by the game can be updated once it has been launched
+                    scheduler = UpdateScheduler(
+                        manager, curr_game_binding, force_updates,
+                        workers=max(int(app_context.config.get_property(Option.JOBS)), 1)
+                    )
+                    blocking_addons = addons_synthesis
+                    deferred_addons = []
+                    if is_background_update:
+                        (blocking_addons, deferred_addons) = scheduler.partition(addons_synthesis)
+
+                    manager.recover_renames()
+
+                    # a running daemon may already know the available updates
+                    prefetched = None
+                    if prefetch_updates and not force_updates:
+                        with profiler().span("daemon.query"):
+                            prefetched = DaemonClient(game.context.cache_dir).fetch_updates(addons_synthesis, http)
+
+                    # updates are fetched by the scheduler jobs, once their dependencies are updated
+                    manager.initialize_metadata(
+                        addons_synthesis, prefetch_updates, force_updates, [], prefetched
+                    )
+
+                    manager.manage_addons(addons_synthesis, prev_addons_synthesis)
+
+                    # deferred addons depending on these are not updated
+                    failed_addons = set()
+
+                    if not is_run_only:
+                        with profiler().span("update"):
+                            for (addon, result) in scheduler.run(blocking_addons):
+                                if result.is_failure:
+                                    failed_addons.add(addon.base.name)
+
+                    if not is_addon_update_only:
+                        # for some reasons compiling this 4 line of code as
+                        # args = [
+                        #     str(_.synthetize())
+                        #     for _ in game.settings.arguments
+                        #     if not _.meta.is_deprecated and _.enabled
+                        # ]
+                        # will make Nuitka go completely bonkers
+                        # therefore, future me, don't change it again.
+                        args = []
+                        for _ in game.settings.arguments:
+                            if not _.meta.is_deprecated and _.enabled:
+                                args.append(str(_.synthetize()))
+
+                        with profiler().span("launch"):
+                            process.arun(
+                                game.config.game_path,
+                                game.config.game_root,
+                                args
+                            )
+
+                            for addon in addons_synthesis:
+                                if addon.binding.is_enabled and addon.binding.is_exe() and addon not in deferred_addons:
+                                    with profiler().span("launch.companion", addon=addon.base.name):
+                                        process.arun(addon.binding.path, addon.binding.path.parent, addon.binding.args)
+
+                        # companions with deferred updates are launched as soon as they are updated
+                        with profiler().span("update.background"):
+                            for (addon, result) in scheduler.run(deferred_addons, failed_addons):
+                                if addon.binding.is_exe() and not result.is_failure:
+                                    with profiler().span("launch.companion", addon=addon.base.name):
+                                        process.arun(addon.binding.path, addon.binding.path.parent, addon.binding.args)
 
             logger.info(msg="Stack complete. Closing...")
 
-    return game is not None
+    return game is not None and succeeded
 
 
 if __name__ == "__main__":
@@ -173,7 +347,18 @@ if __name__ == "__main__":
     _logger.debug(msg=_app_context.working_dir)
     _logger.debug(msg=str(_app_context.config))
 
-    execution_result = run_yaam(_app_context, _logger)
+    is_profiling = _app_context.config.get_property(Option.PROFILE)
+    if is_profiling:
+        profiler().enable()
+
+    with profiler().span("yaam"):
+        execution_result = run_yaam(_app_context, _logger)
+
+    if is_profiling:
+        profile_path = _app_context.temp_dir / "yaam-profile.json"
+        profiler().report(lambda x: _logger.info(msg=x))
+        profiler().dump(profile_path)
+        _logger.info(msg=f"Execution profile saved to {profile_path}.")
 
     # 0 == success, 1 == failure
     sys.exit(0 if execution_result else 1)
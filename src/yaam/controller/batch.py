@@ -0,0 +1,99 @@
+'''
+Multi-game batch update module
+'''
+
+from typing import Dict, List, Tuple
+from yaam.controller.download import SegmentedDownloader
+from yaam.controller.http import HttpRequestManager
+from yaam.controller.manage import AddonManager
+from yaam.controller.metadata import MetadataCollector
+from yaam.controller.update.installer import InstallerExecutor
+from yaam.controller.update.results import UpdateResult
+from yaam.controller.update.scheduler import UpdateScheduler
+from yaam.controller.update.updater import AddonUpdater
+from yaam.model.appcontext import AppContext
+from yaam.model.game.contract.base import IGame
+from yaam.model.game.factory import GameFactory
+from yaam.model.mutable.addon import Addon
+from yaam.model.mutable.addon_base import AddonBase
+from yaam.model.mutable.binding import Binding
+from yaam.utils.exceptions import ConfigLoadException
+from yaam.utils.logger import static_logger as logger
+from yaam.utils.profiler import static_profiler as profiler
+
+
+class BatchUpdater(object):
+    '''
+    Update the addons of several games in a single run
+
+    All games share the same memoizing HTTP manager, therefore
+    addons pointing to the same upstream uri are fetched only once.
+    '''
+
+    def __init__(self, http: HttpRequestManager, app_context: AppContext,
+                 force_updates: bool = False, interactive: bool = True, workers: int = 4,
+                 installer: InstallerExecutor = None, downloader: SegmentedDownloader = None) -> None:
+        self.__http = http
+        self.__app_context = app_context
+        self.__force_updates = force_updates
+        self.__interactive = interactive
+        self.__workers = workers
+        self.__installer = installer
+        self.__downloader = downloader
+
+    def incarnate(self, game_names: List[str]) -> List[Tuple[str, IGame[AddonBase, Binding], List[Addon]]]:
+        '''
+        Incarnate the given games along their addon synthesis, skipping the broken ones
+        '''
+        games = list()
+
+        for game_name in game_names:
+            try:
+                with profiler().span("incarnation", game=game_name):
+                    game = GameFactory.incarnate(game_name, self.__app_context)
+                    games.append((game_name, game, game.synthetize()))
+            except ConfigLoadException as ex:
+                logger().error(msg=f"Cannot load {game_name}: {ex}")
+
+        return games
+
+    def update_game(self, game: IGame[AddonBase, Binding], addons: List[Addon]) -> Dict[str, UpdateResult]:
+        '''
+        Update the addons of a single game
+        '''
+        manager = AddonManager(
+            MetadataCollector(self.__http, game.context),
+            AddonUpdater(
+                self.__http, interactive=self.__interactive, installer=self.__installer, downloader=self.__downloader
+            ),
+            game.settings.binding_type,
+            journal_path=game.context.cache_dir / "renames.journal"
+        )
+
+        manager.recover_renames()
+        manager.initialize_metadata(addons, True, self.__force_updates, [])
+
+        # as a single game run, whose settings are never edited in batch mode
+        manager.manage_addons(addons, addons)
+
+        scheduler = UpdateScheduler(manager, game.settings.binding_type, self.__force_updates, self.__workers)
+
+        return dict((addon.base.name, result) for (addon, result) in scheduler.run(addons))
+
+    def run(self, game_names: List[str]) -> Dict[str, Dict[str, UpdateResult]]:
+        '''
+        Update the addons of all the given games and return the results of each game
+        '''
+        games = self.incarnate(game_names)
+
+        uris = [str(addon.base.uri) for (_, _, addons) in games for addon in addons if addon.base.uri.is_valid()]
+        logger().info(msg=f"Updating {len(games)} games: {len(uris)} addons from {len(set(uris))} distinct sources.")
+
+        results: Dict[str, Dict[str, UpdateResult]] = dict()
+
+        for (game_name, game, addons) in games:
+            logger().info(msg=f"Updating {game_name} addons...")
+            with profiler().span("update.game", game=game_name):
+                results[game_name] = self.update_game(game, addons)
+
+        return results
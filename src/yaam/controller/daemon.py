@@ -0,0 +1,387 @@
+'''
+Background update daemon module
+'''
+
+import hmac
+import json
+import os
+import random
+import secrets
+import socket
+import socketserver
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Tuple
+from yaam.controller.download import parse_digest
+from yaam.controller.http import HttpRequestManager
+from yaam.controller.manage import AddonManager, PrefetchedUpdate
+from yaam.controller.metadata import MetadataCollector
+from yaam.controller.update.results import UpdateResult
+from yaam.controller.update.updater import AddonUpdateData, AddonUpdater
+from yaam.model.appcontext import GameContext
+from yaam.model.mutable.addon import Addon
+from yaam.model.mutable.metadata import AddonMetadata
+from yaam.model.type.binding import BindingType
+from yaam.utils.exceptions import GitHubException
+from yaam.utils.hashing import Hasher
+from yaam.utils.json.io import dump_json, read_json, write_atomic
+from yaam.utils.logger import static_logger as logger
+from yaam.utils.webasset import Release
+import yaam.utils.response as responses
+
+DAEMON_STATE_FILE = "daemon.json"
+DAEMON_DOWNLOADS_DIR = "downloads"
+
+# API calls spent by each github hosted addon in a poll (metadata HEAD + release list GET)
+GITHUB_CALLS_PER_ADDON = 2
+
+
+class UpdateDaemon(object):
+    '''
+    Long running update checker
+
+    Periodically (with jitter) fetches the remote metadata of the addons,
+    pre-downloads the available updates in the game cache directory
+    and serves the results over a local socket with a JSON-lines protocol:
+
+    > {"command": "ping" | "updates" | "poll" | "stop", "token": <token>}
+    < {"ok": true, ...}
+
+    Requests must carry the random token advertised, along with the daemon address,
+    in a state file only the user can read.
+    '''
+
+    def __init__(self, http: HttpRequestManager, context: GameContext, load_addons: Callable[[], List[Addon]],
+                 interval: float = 1800.0, jitter: float = 0.1, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.__http = http
+        self.__context = context
+        self.__load_addons = load_addons
+        self.__interval = interval
+        self.__jitter = jitter
+        self.__address = (host, port)
+
+        self.__lock = threading.Lock()
+        self.__stop = threading.Event()
+        self.__wake = threading.Event()
+        self.__server: socketserver.ThreadingTCPServer = None
+
+        self.__updates: Dict[str, dict] = dict()
+        self.__polled_at: float = None
+        self.__token = secrets.token_urlsafe(32)
+
+    @property
+    def state_path(self) -> Path:
+        '''
+        Return the path of the file advertising the daemon address
+        '''
+        return self.__context.cache_dir / DAEMON_STATE_FILE
+
+    @property
+    def downloads_dir(self) -> Path:
+        '''
+        Return the directory of the pre-downloaded updates
+        '''
+        return self.__context.cache_dir / DAEMON_DOWNLOADS_DIR
+
+    def poll(self, addons: List[Addon]) -> int:
+        '''
+        Fetch the updates of the given addons and pre-download them.
+        Return the number of addons with a known update status.
+        '''
+        logger().info(msg=f"Checking updates of {len(addons)} addons...")
+
+        metadata = MetadataCollector(self.__http, self.__context)
+        # nobody is there to choose among ambiguous release assets
+        updater = AddonUpdater(self.__http, interactive=False)
+
+        AddonManager(metadata, updater, BindingType.AGNOSTIC).initialize_metadata(addons, True, False)
+
+        self.downloads_dir.mkdir(parents=True, exist_ok=True)
+
+        updates: Dict[str, dict] = dict()
+        for addon in addons:
+            update = updater.get_addon_update(addon)
+            remote = metadata.get_remote_metadata(addon)
+
+            if update is None or remote is None or update.status not in [
+                UpdateResult.TO_INSTALL, UpdateResult.TO_UPDATE, UpdateResult.UP_TO_DATE
+            ]:
+                continue
+
+            entry = {'status': int(update.status), 'uri': str(remote.uri), 'metadata': remote.to_json()}
+
+            download_path = download_path_of(self.__context.cache_dir, addon)
+
+            if update.status is not UpdateResult.UP_TO_DATE and update.http_response is not None:
+                download_path.write_bytes(update.http_response.content)
+                # the client looks for the content by itself and verifies it against the remote
+                entry['download'] = {'headers': dict(update.http_response.headers)}
+            elif download_path.exists():
+                os.remove(download_path)
+
+            updates[addon.base.name] = entry
+
+        with self.__lock:
+            self.__updates = updates
+            self.__polled_at = time.time()
+
+        n_updates = sum(1 for _ in updates.values() if 'download' in _)
+        logger().info(msg=f"Update check completed: {n_updates} updates are available.")
+
+        return len(updates)
+
+    def __rate_limit_delay(self, addons: List[Addon]) -> float:
+        '''
+        Return how long to wait for the github API calls to be enough for a whole poll
+        '''
+        n_calls = GITHUB_CALLS_PER_ADDON * sum(1 for _ in addons if _.base.route.is_github_api)
+
+        if n_calls == 0:
+            return 0.0
+
+        (remaining, _, epoch_until_reset) = self.__http.get_api_rate_limits()
+
+        if 0 <= remaining < n_calls and epoch_until_reset > 0:
+            delay = max(epoch_until_reset - time.time(), 0.0) + random.uniform(0.0, self.__jitter * self.__interval)
+            logger().warning(msg=f"Only {remaining} Github API calls left, {n_calls} needed. Next check in {delay:.0f} seconds.")
+            return delay
+
+        return 0.0
+
+    def __next_delay(self) -> float:
+        return self.__interval * random.uniform(1.0 - self.__jitter, 1.0 + self.__jitter)
+
+    def handle(self, request: dict) -> dict:
+        '''
+        Answer a client request
+        '''
+        if not hmac.compare_digest(str(request.get('token', '')), self.__token):
+            return {'ok': False, 'error': "Unauthorized"}
+
+        command = request.get('command', None)
+
+        if command == "ping":
+            return {'ok': True, 'pid': os.getpid()}
+        elif command == "updates":
+            with self.__lock:
+                return {
+                    'ok': self.__polled_at is not None,
+                    'polled_at': self.__polled_at,
+                    'interval': self.__interval,
+                    'addons': self.__updates
+                }
+        elif command == "poll":
+            self.__wake.set()
+            return {'ok': True}
+        elif command == "stop":
+            self.stop()
+            return {'ok': True}
+
+        return {'ok': False, 'error': f"Unknown command {command}"}
+
+    def start(self):
+        '''
+        Start serving client requests and advertise the daemon address
+        '''
+        self.__server = _DaemonServer(self.__address, _make_handler(self))
+        threading.Thread(target=self.__server.serve_forever, daemon=True).start()
+
+        (host, port) = self.__server.server_address[:2]
+        write_atomic(dump_json({'host': host, 'port': port, 'pid': os.getpid(), 'token': self.__token}), self.state_path, mode=0o600)
+
+        logger().info(msg=f"Daemon listening on {host}:{port}.")
+
+    def stop(self):
+        '''
+        Stop polling and serving
+        '''
+        self.__stop.set()
+        self.__wake.set()
+
+    def serve_forever(self):
+        '''
+        Poll the addon updates until stopped
+        '''
+        self.start()
+
+        try:
+            while not self.__stop.is_set():
+                addons = self.__load_addons()
+
+                delay = self.__rate_limit_delay(addons)
+                if delay <= 0:
+                    self.poll(addons)
+                    delay = self.__next_delay()
+
+                self.__wake.wait(delay)
+                self.__wake.clear()
+        except KeyboardInterrupt:
+            logger().info(msg="Daemon interrupted.")
+        finally:
+            self.close()
+
+    def close(self):
+        '''
+        Stop serving client requests and withdraw the daemon address
+        '''
+        if self.__server is not None:
+            self.__server.shutdown()
+            self.__server.server_close()
+            self.__server = None
+
+        if self.state_path.exists():
+            os.remove(self.state_path)
+
+
+def download_path_of(cache_dir: Path, addon: Addon) -> Path:
+    '''
+    Return the path of the update of the given addon pre-downloaded by the daemon
+    '''
+    return cache_dir / DAEMON_DOWNLOADS_DIR / Hasher.SHA256.make_hash_from_string(addon.base.name)
+
+
+class _DaemonServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+def _make_handler(daemon: UpdateDaemon):
+
+    class DaemonRequestHandler(socketserver.StreamRequestHandler):
+        '''
+        JSON-lines request handler
+        '''
+
+        def handle(self):
+            for line in self.rfile:
+                try:
+                    answer = daemon.handle(json.loads(line))
+                except json.JSONDecodeError:
+                    answer = {'ok': False, 'error': "Malformed request"}
+
+                self.wfile.write(json.dumps(answer).encode('utf-8') + b"\n")
+                self.wfile.flush()
+
+    return DaemonRequestHandler
+
+
+class DaemonClient(object):
+    '''
+    Update daemon client
+    '''
+
+    def __init__(self, cache_dir: Path, timeout: float = 1.0) -> None:
+        self.__cache_dir = cache_dir
+        self.__state_path = cache_dir / DAEMON_STATE_FILE
+        self.__timeout = timeout
+
+    def request(self, command: str) -> dict:
+        '''
+        Send the command to the daemon and return its answer, or None if the daemon can't be reached
+        '''
+        state: dict = read_json(self.__state_path)
+
+        if 'port' not in state:
+            return None
+
+        try:
+            with socket.create_connection((state.get('host', "127.0.0.1"), state['port']), timeout=self.__timeout) as conn:
+                conn.sendall(json.dumps({'command': command, 'token': state.get('token', '')}).encode('utf-8') + b"\n")
+                with conn.makefile('rb') as stream:
+                    return json.loads(stream.readline())
+        except (OSError, ValueError) as ex:
+            logger().debug(msg=f"Update daemon not reachable: {ex}")
+
+        return None
+
+    def fetch_updates(self, addons: Iterable[Addon], http: HttpRequestManager) -> Dict[str, PrefetchedUpdate]:
+        '''
+        Return the updates of the given addons prefetched by the daemon, if reachable and up-to-date.
+        Pre-downloaded updates are verified against the size or digest advertised by the remote.
+        '''
+        prefetched: Dict[str, PrefetchedUpdate] = dict()
+
+        answer = self.request("updates")
+
+        if answer is None or not answer.get('ok', False):
+            return prefetched
+
+        age = time.time() - answer.get('polled_at', 0)
+        if age > 1.5 * answer.get('interval', 0):
+            logger().info(msg=f"Ignoring update daemon results of {age:.0f} seconds ago.")
+            return prefetched
+
+        entries: Dict[str, dict] = answer.get('addons', dict())
+
+        for addon in addons:
+            entry = entries.get(addon.base.name, None)
+            if entry is None:
+                continue
+
+            status = UpdateResult(entry['status'])
+
+            remote = AddonMetadata.from_json(entry['metadata'])
+            remote.uri = addon.base.uri
+
+            response = None
+            download: dict = entry.get('download', None)
+            if download is not None:
+                response = self.__load_download(addon, remote, download, http)
+                if response is None:
+                    continue
+
+            prefetched[addon.base.name] = (remote, AddonUpdateData(addon.base.name, status, response))
+
+        logger().info(msg=f"Update daemon results of {age:.0f} seconds ago are available.")
+
+        return prefetched
+
+    def __load_download(self, addon: Addon, remote: AddonMetadata, download: dict, http: HttpRequestManager):
+        '''
+        Return the pre-downloaded update as a response, if it matches the remote content
+        '''
+        try:
+            content = download_path_of(self.__cache_dir, addon).read_bytes()
+        except OSError:
+            return None
+
+        (url, size, digest) = DaemonClient.__remote_content(addon, remote, http)
+
+        if digest is not None and len(digest) > 0:
+            (hasher, hashcode) = parse_digest(digest)
+            is_valid = hasher.is_available and hasher.make_hash_from_bytes(content) == hashcode
+        else:
+            is_valid = size is not None and len(content) == size
+
+        if not is_valid:
+            logger().warning(msg=f"Ignoring the update of {addon.base.name} pre-downloaded by the daemon: it cannot be verified.")
+            return None
+
+        return responses.from_bytes(content, url, download.get('headers', dict()))
+
+    @staticmethod
+    def __remote_content(addon: Addon, remote: AddonMetadata, http: HttpRequestManager) -> Tuple[str, int, str]:
+        '''
+        Return the (url, size, digest) of the addon update content, as advertised by the remote
+        '''
+        route = addon.base.route
+
+        if route.is_github_release:
+            try:
+                releases = [_ for _ in http.get_downloadable_assets(route) if isinstance(_, Release) and not _.is_draft]
+            except GitHubException as ex:
+                logger().debug(msg=str(ex))
+                releases = []
+
+            # the asset chosen by the daemon, among the ones of the latest release
+            asset = next((_ for _ in releases[0].assets if _.name == remote.asset), None) if len(releases) > 0 else None
+
+            return (str(asset.download_url), asset.size, asset.digest) if asset is not None else (None, None, None)
+
+        response = http.head(route, allow_redirects=True)
+
+        if response is None or not response.ok or 'content-length' not in response.headers:
+            return (route.url, None, None)
+
+        return (response.url, int(response.headers['content-length']), None)
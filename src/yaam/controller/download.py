@@ -0,0 +1,204 @@
+'''
+Segmented downloads module
+'''
+
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, List, Tuple, Union
+from yaam.controller.http import HttpRequestManager
+from yaam.utils import response as responses
+from yaam.utils.hashing import Hasher
+from yaam.utils.logger import static_logger as logger
+from yaam.utils.profiler import static_profiler as profiler
+from yaam.utils.route import Route, classify
+from yaam.utils.uri import URI
+
+if TYPE_CHECKING:
+    import requests
+
+CHUNK_SIZE = 1 << 20
+
+# (first byte, last byte) of a segment, both included as in the Range header
+Segment = Tuple[int, int]
+
+
+def split_segments(length: int, segments: int) -> List[Segment]:
+    '''
+    Split the given content length into (at most) the given number of contiguous segments
+    '''
+    segments = max(min(segments, length), 1)
+    size = -(-length // segments)
+
+    return [(start, min(start + size, length) - 1) for start in range(0, length, size)]
+
+
+def parse_digest(digest: str) -> Tuple[Hasher, str]:
+    '''
+    Return the algorithm and the hashcode of a digest string (e.g.: sha256:<hex>),
+    hashcodes without algorithm being SHA256 ones
+    '''
+    (algorithm, _, hashcode) = digest.rpartition(":")
+
+    return (Hasher.from_string(algorithm) if len(algorithm) > 0 else Hasher.SHA256, hashcode.lower())
+
+
+class SegmentedDownloader(object):
+    '''
+    Download large resources over several connections
+
+    When the server accepts byte ranges, the resource is fetched as parallel segments
+    into a preallocated temporary file, otherwise (or if anything goes wrong) it is downloaded
+    as a single stream. Either way the content length and digest are verified, if known.
+    Segmented downloads are verified on disk and handed over as a response streaming
+    the temporary file, which is deleted once closed.
+    '''
+
+    def __init__(self, http: HttpRequestManager, segments: int = 4, min_segment_size: int = 1 << 20,
+                 download_dir: Path = None) -> None:
+        self.__http = http
+        self.__segments = max(segments, 1)
+        self.__min_segment_size = min_segment_size
+        self.__download_dir = download_dir if download_dir is not None else Path(tempfile.gettempdir())
+
+    def get(self, url: Union[Route, URI, str], size: int = None, digest: str = None, **kwargs) -> 'requests.Response':
+        '''
+        HTTP GET <URL> <ARGS>, segmented if possible, verifying the given content size and digest
+        '''
+        route = classify(url)
+
+        # github api responses are json documents, never worth segmenting,
+        # nor are resources known to be too small, which are not even probed
+        if self.__segments > 1 and not route.is_github_release and (size is None or size >= 2 * self.__min_segment_size):
+            segmented = self.__get_segmented(route.url, **kwargs)
+
+            if segmented is not None:
+                (response, file) = segmented
+                if self.__verify(route.url, file, size, digest):
+                    return response
+                file.close()
+                return None
+
+        response = self.__http.get(url, **kwargs)
+
+        if response is not None and response.ok and not self.__verify(route.url, response.content, size, digest):
+            response = None
+
+        return response
+
+    def __verify(self, url: str, content: Union[bytes, BinaryIO], size: int, digest: str) -> bool:
+        '''
+        Verify the downloaded content, either in memory or in a file
+        '''
+        is_file = not isinstance(content, bytes)
+        length = os.fstat(content.fileno()).st_size if is_file else len(content)
+
+        if size is not None and length != size:
+            logger().error(msg=f"Download of {url} is {length} bytes long, {size} were expected.")
+            return False
+
+        if digest is not None and len(digest) > 0:
+            (hasher, hashcode) = parse_digest(digest)
+            if not hasher.is_available:
+                logger().warning(msg=f"Cannot verify the download of {url}, {hasher.signature} is not available.")
+            else:
+                if is_file:
+                    content.seek(0)
+                    actual = hasher.make_hash_from_stream(content)
+                    content.seek(0)
+                else:
+                    actual = hasher.make_hash_from_bytes(content)
+
+                if actual != hashcode:
+                    logger().error(msg=f"Download of {url} doesn't match its {hasher.signature} digest.")
+                    return False
+
+        return True
+
+    def __get_segmented(self, url: str, **kwargs) -> Tuple['requests.Response', BinaryIO]:
+        '''
+        Download the resource as parallel segments, if the server accepts byte ranges,
+        and return a response streaming the downloaded file along the file itself
+        '''
+        from concurrent.futures import ThreadPoolExecutor
+        import requests
+
+        kwargs.pop('allow_redirects', None)
+        kwargs.pop('stream', None)
+
+        # redirects are resolved once, so that every segment hits the final location
+        probe = self.__http.head(url, allow_redirects=True, **kwargs)
+
+        if probe is None or not probe.ok or 'bytes' not in probe.headers.get('accept-ranges', '').lower():
+            return None
+
+        length = int(probe.headers.get('content-length', 0))
+
+        if length < 2 * self.__min_segment_size:
+            return None
+
+        segments = split_segments(length, min(self.__segments, length // self.__min_segment_size))
+
+        # the content must not change between the segments requests
+        validator = probe.headers.get('etag', probe.headers.get('last-modified', None))
+
+        # anonymous file, deleted as soon as closed
+        file = tempfile.TemporaryFile(prefix=".yaam-", suffix=".part", dir=self.__download_dir)
+        lock = threading.Lock()
+
+        try:
+            with profiler().span("download.segmented", url=url, segments=len(segments)):
+                file.truncate(length)
+
+                with ThreadPoolExecutor(max_workers=len(segments), thread_name_prefix="yaam-segment") as executor:
+                    written = list(executor.map(lambda x: self.__get_segment(probe.url, file, lock, x, validator, **kwargs), segments))
+
+            if written == [end - start + 1 for (start, end) in segments]:
+                file.flush()
+                logger().debug(msg=f"Downloaded {url} in {len(segments)} segments.")
+                return (responses.from_file(file, probe.url, dict(probe.headers)), file)
+
+            logger().warning(msg=f"Segmented download of {url} is incomplete, falling back to a single stream.")
+        except (requests.RequestException, OSError) as ex:
+            logger().warning(msg=f"Segmented download of {url} failed ({ex}), falling back to a single stream.")
+
+        file.close()
+
+        return None
+
+    def __get_segment(self, url: str, file: BinaryIO, lock: threading.Lock, segment: Segment,
+                      validator: str, **kwargs) -> int:
+        '''
+        Download a segment into its place in the file and return the number of bytes written
+        '''
+        (start, end) = segment
+
+        headers = dict(kwargs.pop('headers', None) or dict())
+        headers['Range'] = f"bytes={start}-{end}"
+        if validator is not None:
+            headers['If-Range'] = validator
+
+        response = self.__http.get(url, headers=headers, stream=True, allow_redirects=False, **kwargs)
+
+        written = 0
+
+        if response is None:
+            return written
+
+        with response:
+            # a full (200) response means the range or the validator has been ignored
+            if response.status_code != 206 or not response.headers.get('content-range', '').startswith(f"bytes {start}-{end}/"):
+                return written
+
+            for chunk in response.iter_content(CHUNK_SIZE):
+                chunk = chunk[:end - start + 1 - written]
+                # the segments share the file position
+                with lock:
+                    file.seek(start + written)
+                    file.write(chunk)
+                written += len(chunk)
+
+        profiler().count("http.bytes", written)
+
+        return written
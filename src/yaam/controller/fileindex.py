@@ -0,0 +1,228 @@
+'''
+Installed addon files index module
+'''
+
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+from yaam.controller.metastore import MetadataStore
+from yaam.model.mutable.addon import Addon
+from yaam.utils.hashing import Hasher
+from yaam.utils.logger import static_logger as logger
+
+
+def file_key(path: Path or str) -> str:
+    '''
+    Return the index key of the given path (absolute, case-normalized on Windows)
+    '''
+    return os.path.normcase(os.path.abspath(path))
+
+
+def file_owner(addon: Addon) -> str:
+    '''
+    Return the index owner of the given addon binding
+    '''
+    return f"{addon.binding.typing.signature}:{addon.base.name}"
+
+
+def owner_name(owner: str) -> str:
+    '''
+    Return the addon name of the given index owner
+    '''
+    return owner.split(":", 1)[-1]
+
+
+@dataclass(frozen=True)
+class InstalledFile(object):
+    '''
+    File written by an addon update, as it was when written
+    '''
+    path: Path = field(default_factory=Path)
+    size: int = field(default=0)
+    mtime_ns: int = field(default=0)
+    digest: str = field(default_factory=str)
+    algorithm: Hasher = field(default=Hasher.SHA256)
+
+    @property
+    def key(self) -> str:
+        '''
+        Return the index key of the file
+        '''
+        return file_key(self.path)
+
+    def is_untouched(self) -> bool:
+        '''
+        Return whether the file still exists with the recorded size and modification time
+        '''
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+
+    def is_unchanged(self) -> bool:
+        '''
+        Return whether the file still has the recorded content,
+        hashing it only if its size or modification time changed
+        '''
+        if self.is_untouched():
+            return True
+
+        # a digest made with an algorithm unavailable here can't be checked
+        return self.path.is_file() and self.algorithm.is_available and self.algorithm.make_hash_from_file(self.path) == self.digest
+
+    @staticmethod
+    def from_path(path: Path, hasher: Hasher = Hasher.SHA256):
+        '''
+        Create the index entry of the given existing file
+        '''
+        stat = os.stat(path)
+        return InstalledFile(Path(os.path.abspath(path)), stat.st_size, stat.st_mtime_ns, hasher.make_hash_from_file(path), hasher)
+
+    def to_row(self) -> tuple:
+        '''
+        Map the object into its store row
+        '''
+        return (self.key, str(self.path), self.size, self.mtime_ns, self.digest, self.algorithm.signature)
+
+    @staticmethod
+    def from_row(row: tuple):
+        '''
+        Create object representation of this class from its store row
+        '''
+        (_, path, size, mtime_ns, digest, algorithm) = row
+        return InstalledFile(Path(path), size, mtime_ns, digest, Hasher.from_string(algorithm))
+
+
+class InstalledFileIndex(object):
+    '''
+    Persistent index of the files written by each addon binding
+
+    The index is kept in the metadata store and updated by the updaters,
+    so that verification, uninstallation and ownership conflicts
+    never need to walk the game folder.
+    '''
+
+    def __init__(self, store: MetadataStore, hasher: Hasher = Hasher.fastest(secure=True)) -> None:
+        self.__store = store
+        self.__hasher = hasher
+
+    def files(self, addon: Addon) -> List[InstalledFile]:
+        '''
+        Return the files recorded for the given addon
+        '''
+        return [InstalledFile.from_row(_) for _ in self.__store.get_files(file_owner(addon))]
+
+    def owners(self, paths: Iterable[Path]) -> Dict[Path, List[str]]:
+        '''
+        Return the names of the addons owning each of the given paths, if any
+        '''
+        paths = list(paths)
+        owners = self.__store.get_file_owners(file_key(_) for _ in paths)
+
+        return dict(
+            (_, sorted(set(owner_name(o) for o in owners[file_key(_)])))
+            for _ in paths if file_key(_) in owners
+        )
+
+    def record(self, addon: Addon, paths: Iterable[Path]) -> Dict[Path, List[str]]:
+        '''
+        Record the files just written by an update of the given addon and
+        return those also owned by other addons, with their owners.
+
+        Files recorded by the previous update and not written anymore
+        are deleted, unless modified since or owned by another addon.
+        '''
+        owner = file_owner(addon)
+
+        installed = dict((_.key, _) for _ in (InstalledFile.from_path(p, self.__hasher) for p in paths if p.is_file()))
+        previous = self.files(addon)
+
+        owners = self.__store.get_file_owners(list(installed) + [_.key for _ in previous])
+
+        conflicts: Dict[Path, List[str]] = dict()
+        for (key, file) in installed.items():
+            others = sorted(set(owner_name(_) for _ in owners.get(key, list()) if owner_name(_) != addon.base.name))
+            if len(others) > 0:
+                conflicts[file.path] = others
+                logger().warning(msg=f"{file.path} has been overwritten by {addon.base.name}, but is also owned by {', '.join(others)}.")
+
+        for file in previous:
+            if file.key in installed or any(_ != owner for _ in owners.get(file.key, list())):
+                continue
+
+            if file.is_untouched():
+                logger().info(msg=f"Removing {file.path}, no longer part of {addon.base.name}.")
+                try:
+                    os.remove(file.path)
+                except OSError as ex:
+                    logger().warning(msg=f"Cannot remove {file.path}: {ex}")
+
+        self.__store.set_files(owner, (_.to_row() for _ in installed.values()))
+
+        return conflicts
+
+    def move(self, src: Path, dst: Path):
+        '''
+        Follow the rename of a file or directory
+        '''
+        self.__store.move_files(file_key(src), file_key(dst), os.path.abspath(dst), os.sep)
+
+    def forget(self, addon: Addon):
+        '''
+        Drop every file recorded for the given addon
+        '''
+        self.__store.set_files(file_owner(addon), [])
+
+    def uninstall(self, addon: Addon, force: bool = False) -> Tuple[List[Path], List[Path]]:
+        '''
+        Delete the files recorded for the given addon and return the (removed, kept) ones.
+
+        Files modified since they were written are kept unless forced,
+        files owned by other addons are always kept.
+        '''
+        files = self.files(addon)
+        owners = self.owners(_.path for _ in files)
+
+        removed: List[Path] = list()
+        kept: List[Path] = list()
+
+        for file in files:
+            others = [_ for _ in owners.get(file.path, list()) if _ != addon.base.name]
+
+            if not file.path.exists():
+                continue
+            elif len(others) > 0:
+                logger().warning(msg=f"Keeping {file.path}, also owned by {', '.join(others)}.")
+                kept.append(file.path)
+            elif not force and not file.is_unchanged():
+                logger().warning(msg=f"Keeping {file.path}, modified since installed (use --force to remove it).")
+                kept.append(file.path)
+            else:
+                try:
+                    os.remove(file.path)
+                    removed.append(file.path)
+                except OSError as ex:
+                    logger().error(msg=f"Cannot remove {file.path}: {ex}")
+                    kept.append(file.path)
+
+        # empty folders left behind, up to the addon own folder (shared workspaces are kept)
+        workspace = Path(os.path.abspath(addon.binding.workspace))
+        folders = set(
+            p for _ in removed for p in _.parents
+            if workspace in p.parents or (p == workspace and addon.binding.is_headless)
+        )
+        for folder in sorted(folders, reverse=True):
+            try:
+                folder.rmdir()
+            except OSError:
+                pass
+
+        if len(kept) == 0:
+            self.forget(addon)
+        else:
+            self.__store.set_files(file_owner(addon), (_.to_row() for _ in files if _.path in kept))
+
+        return (removed, kept)
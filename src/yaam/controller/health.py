@@ -0,0 +1,177 @@
+'''
+Remote hosts health tracking module
+'''
+
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Tuple
+from yaam.utils.json.io import read_json, write_json
+from yaam.utils.logger import static_logger as logger
+
+# responses of an overloaded or unreachable upstream, worth retrying
+RETRY_STATUSES = frozenset([502, 503, 504])
+
+# persisted latencies older than this (in seconds) are forgotten
+STATE_TTL = 24 * 60 * 60
+
+
+@dataclass
+class HostHealth(object):
+    '''
+    Latency estimate and failures of a remote host
+    '''
+    # smoothed response time and its variation (in seconds), as of RFC 6298
+    srtt: float = field(default=None)
+    rttvar: float = field(default=None)
+    failures: int = field(default=0)
+    # epoch until which the host is skipped, even by the next runs
+    open_until: float = field(default=0.0)
+    updated: float = field(default_factory=time.time)
+
+
+class HostHealthTracker(object):
+    '''
+    Track the health of each remote host, as to adapt the requests timeouts
+    to their latency and stop calling the failing ones (circuit breaker).
+
+    A host failing failure_threshold times in a row is skipped for the rest
+    of the run and, if the state is persisted, by the runs within the cooldown.
+    A host whose cooldown expired gets a single chance before being skipped again.
+    '''
+
+    def __init__(self, state_path: Path = None, min_timeout: float = 10.0, max_timeout: float = 120.0,
+                 connect_timeout: float = 10.0, failure_threshold: int = 3, cooldown: float = 600.0,
+                 retries: int = 2, backoff: float = 0.5) -> None:
+        self.__state_path = state_path
+        self.__min_timeout = min_timeout
+        self.__max_timeout = max_timeout
+        self.__connect_timeout = connect_timeout
+        self.__failure_threshold = failure_threshold
+        self.__cooldown = cooldown
+        self.__retries = retries
+        self.__backoff = backoff
+        self.__lock = threading.Lock()
+        self.__hosts: Dict[str, HostHealth] = dict()
+        # hosts skipped for the rest of the run
+        self.__tripped = set()
+
+        self.load()
+
+    @property
+    def retries(self) -> int:
+        '''
+        Return the number of retries of a failed idempotent request
+        '''
+        return self.__retries
+
+    def __host(self, host: str) -> HostHealth:
+        if host not in self.__hosts:
+            self.__hosts[host] = HostHealth()
+        return self.__hosts[host]
+
+    def is_open(self, host: str) -> bool:
+        '''
+        Return whether the requests to the given host should be skipped
+        '''
+        with self.__lock:
+            return host in self.__tripped or (host in self.__hosts and self.__hosts[host].open_until > time.time())
+
+    def timeout(self, host: str, timeout: float = None) -> Tuple[float, float]:
+        '''
+        Return the (connect, read) timeouts of a request to the given host,
+        the read one never exceeding the given timeout, if any
+        '''
+        if isinstance(timeout, tuple):
+            timeout = timeout[-1]
+
+        limit = self.__max_timeout if timeout is None else min(float(timeout), self.__max_timeout)
+
+        with self.__lock:
+            health = self.__hosts.get(host, None)
+
+            if health is None or health.srtt is None:
+                read_timeout = limit
+            else:
+                read_timeout = min(max(health.srtt + 4 * health.rttvar, self.__min_timeout), limit)
+
+        return (min(self.__connect_timeout, read_timeout), read_timeout)
+
+    def backoff(self, attempt: int) -> float:
+        '''
+        Return the seconds to wait before the given retry attempt (exponential, with jitter)
+        '''
+        return self.__backoff * (2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+
+    def success(self, host: str, elapsed: float):
+        '''
+        Record a response of the given host, received after the given seconds
+        '''
+        with self.__lock:
+            health = self.__host(host)
+
+            if health.srtt is None:
+                (health.srtt, health.rttvar) = (elapsed, elapsed / 2)
+            else:
+                health.rttvar = 0.75 * health.rttvar + 0.25 * abs(health.srtt - elapsed)
+                health.srtt = 0.875 * health.srtt + 0.125 * elapsed
+
+            health.failures = 0
+            health.open_until = 0.0
+            health.updated = time.time()
+
+    def failure(self, host: str) -> bool:
+        '''
+        Record a failed request to the given host and return whether the host is now skipped
+        '''
+        with self.__lock:
+            health = self.__host(host)
+            health.failures += 1
+            health.updated = time.time()
+
+            if health.failures >= self.__failure_threshold and host not in self.__tripped:
+                self.__tripped.add(host)
+                health.open_until = health.updated + self.__cooldown
+                logger().warning(msg=f"{host} failed {health.failures} times in a row, it will be skipped for the rest of the run.")
+
+            return host in self.__tripped
+
+    def load(self):
+        '''
+        Load the persisted hosts health, if any
+        '''
+        if self.__state_path is None:
+            return
+
+        now = time.time()
+
+        with self.__lock:
+            for (host, obj) in read_json(self.__state_path).get('hosts', dict()).items():
+                try:
+                    health = HostHealth(**obj)
+                except TypeError:
+                    continue
+
+                if now - health.updated > STATE_TTL and health.open_until < now:
+                    continue
+
+                # a host whose cooldown expired is tripped again by its next failure
+                if 0 < health.open_until < now:
+                    health.failures = self.__failure_threshold - 1
+
+                self.__hosts[host] = health
+
+    def save(self):
+        '''
+        Persist the hosts health
+        '''
+        if self.__state_path is None:
+            return
+
+        with self.__lock:
+            state = {'hosts': dict((host, asdict(health)) for (host, health) in self.__hosts.items())}
+
+        self.__state_path.parent.mkdir(parents=True, exist_ok=True)
+        write_json(state, self.__state_path, only_if_changed=True)
@@ -5,29 +5,62 @@ HTTP Requests manager class module
 '''
 
 # from pathlib import Path
-from typing import Callable, List, Union
+import functools
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Tuple, Union
+from urllib.parse import urljoin, urlparse
 # from typing import Optional, Tuple
 
-import requests
-
+from yaam.controller.health import RETRY_STATUSES, HostHealthTracker
+from yaam.controller.redirect import STALE_STATUSES, RedirectCache
 from yaam.model.appconfig import AppConfig
 from yaam.model.options import Option
 from yaam.utils.github import Github as GithubAPI
 from yaam.utils.exceptions import GitHubException
 from yaam.utils.logger import static_logger as logger
+from yaam.utils.profiler import static_profiler as profiler
+from yaam.utils.route import Route, classify
 from yaam.utils.uri import URI
 from yaam.utils.webasset import Release
 
+if TYPE_CHECKING:
+    import requests
+
+# as requests does
+MAX_REDIRECTS = 30
+
 
 class HttpRequestManager(object):
     '''
     Http requests manager class
+
+    If memoize is set, successful HEAD responses, GitHub API responses and release lists
+    are kept for the whole session so that addons sharing the same upstream (e.g.: across games)
+    are checked only once. Downloaded contents are never kept, as to not hold every asset in memory.
+
+    Requests timeouts adapt to the latency of each host, failed requests are retried
+    and failing hosts are skipped. Redirects of web requests are followed by hand,
+    going straight to the cached targets while valid.
+    If state_dir is set, the hosts health and the redirects are kept across runs.
     '''
 
-    def __init__(self, config: AppConfig) -> None:
+    def __init__(self, config: AppConfig, memoize: bool = False, state_dir: Path = None,
+                 health: HostHealthTracker = None, redirects: RedirectCache = None) -> None:
         self.__config: AppConfig = config
-        self.__web_session: requests.Session = None
+        self.__health = health if health is not None else HostHealthTracker(
+            state_dir / "hosts.json" if state_dir is not None else None
+        )
+        self.__redirects = redirects if redirects is not None else RedirectCache(
+            state_dir / "redirects.json" if state_dir is not None else None
+        )
+        self.__memoize = memoize
+        self.__memo: Dict[tuple, object] = dict()
+        self.__memo_lock = threading.Lock()
+        self.__web_session: 'requests.Session' = None
         self.__gh_session: GithubAPI = None
+        self.__adapters: List[Tuple[str, 'requests.adapters.BaseAdapter']] = list()
         self.__gh_user = self.__config.get_property(Option.GITHUB_USER)
         self.__gh_api_token = self.__config.get_property(Option.GITHUB_API_TOKEN)
 
@@ -48,9 +81,11 @@ class HttpRequestManager(object):
 
         if self.__gh_session is None:
             self.__gh_session = GithubAPI.open_session(self.__gh_user, self.__gh_api_token)
+            for (prefix, adapter) in self.__adapters:
+                self.__gh_session.mount(prefix, adapter)
 
-        if self.__web_session is None:
-            self.__web_session = requests.Session()
+        # NOTE: the web session (and therefore requests) is created upon the first request
+        # in order to not pay its import cost on runs that never touch the network
 
     def close_sessions(self):
         '''
@@ -59,52 +94,236 @@ class HttpRequestManager(object):
 
         if self.__web_session is not None:
             self.__web_session.close()
+            self.__web_session = None
+
+        if self.__gh_session is not None:
+            self.__gh_session.close()
+
+        self.__health.save()
+        self.__redirects.save()
+
+        self.clear_memo()
+
+    def clear_memo(self):
+        '''
+        Drop the memoized responses
+        '''
+        with self.__memo_lock:
+            self.__memo.clear()
+
+    def __memoized(self, key: tuple, fetch: Callable[[], object], is_valid: Callable[[object], bool]) -> object:
+        '''
+        Return the memoized result of the given key, fetching it if necessary.
+        Only valid results are memoized.
+        '''
+        if not self.__memoize:
+            return fetch()
+
+        with self.__memo_lock:
+            if key in self.__memo:
+                profiler().count("http.memo_hits")
+                return self.__memo[key]
+
+        result = fetch()
+
+        if is_valid(result):
+            with self.__memo_lock:
+                self.__memo[key] = result
+
+        return result
+
+    @staticmethod
+    def __memo_key(method: str, url: str, kwargs: dict) -> tuple:
+        return (method, url, repr(sorted(kwargs.items())))
+
+    @staticmethod
+    def __is_ok(response: 'requests.Response') -> bool:
+        return response is not None and response.ok
+
+    def mount(self, prefix: str, adapter: 'requests.adapters.BaseAdapter'):
+        '''
+        Register a transport adapter for any url starting with the given prefix
+        on both the web and the github api sessions
+        '''
+        self.__adapters.append((prefix, adapter))
+
+        if self.__web_session is not None:
+            self.__web_session.mount(prefix, adapter)
+
+        if self.__gh_session is not None:
+            self.__gh_session.mount(prefix, adapter)
+
+    def __get_web_session(self) -> 'requests.Session':
+        '''
+        Return the web session, creating it if necessary
+        '''
+        if self.__web_session is None:
+            import requests
+
+            self.__web_session = requests.Session()
+            for (prefix, adapter) in self.__adapters:
+                self.__web_session.mount(prefix, adapter)
+
+        return self.__web_session
+
+    def __request_wrapper(self, func: Callable[..., 'requests.Response'], url: str = None, **kwargs) -> 'requests.Response':
+        '''
+        Send the request, with the given url and arguments, as long as its host is not failing.
+
+        Only idempotent requests are sent through here, so they are retried
+        upon connection errors, timeouts and unavailable upstreams.
+        '''
+        import requests
 
-    def __request_wrapper(self, func: Callable[[], requests.Response]) -> requests.Response:
         response = None
 
-        try:
-            response = func()
-        except requests.HTTPError as http_ex:
-            logger().error(http_ex)
-        except requests.RequestException as req_ex:
-            logger().error(req_ex)
-        except TimeoutError as timeout_ex:
-            logger().error(timeout_ex)
-        except GitHubException as ex:
-            logger().error(ex)
+        host = urlparse(url).hostname if url is not None else None
+
+        if host is not None and self.__health.is_open(host):
+            logger().warning(msg=f"Skipping {url}, {host} is failing.")
+            profiler().count("http.skipped")
+            return response
+
+        attempts = 1 + (self.__health.retries if host is not None else 0)
+
+        for attempt in range(attempts):
+            if attempt > 0:
+                time.sleep(self.__health.backoff(attempt))
+                profiler().count("http.retries")
+
+            request_kwargs = dict(kwargs)
+            if host is not None:
+                request_kwargs['timeout'] = self.__health.timeout(host, kwargs.get('timeout', None))
+
+            failed = False
+
+            try:
+                response = func(**request_kwargs)
+                failed = response is not None and response.status_code in RETRY_STATUSES
+            except (requests.ConnectionError, requests.Timeout, TimeoutError) as ex:
+                logger().error(ex)
+                failed = True
+            except requests.HTTPError as http_ex:
+                logger().error(http_ex)
+            except requests.RequestException as req_ex:
+                logger().error(req_ex)
+            except GitHubException as ex:
+                logger().error(ex)
+
+            if host is None:
+                break
+            elif not failed:
+                if response is not None:
+                    self.__health.success(host, response.elapsed.total_seconds())
+                break
+            elif self.__health.failure(host):
+                break
 
         return response
 
-    def get(self, url: URI, **kwargs) -> requests.Response:
+    def __web_request(self, method: str, url: str, **kwargs) -> 'requests.Response':
         '''
-        HTTP GET <URL> <ARGS>
+        Send the request through the web session, following its redirects (if allowed) one by one,
+        so that the redirect targets are cached and each hop is tracked against its own host
         '''
-        def __get_internal() -> requests.Response:
-            response = None
-            if GithubAPI.assert_latest_release_url(url) or GithubAPI.assert_release_list_url(url):
-                response = self.__gh_session.get(url, **kwargs)
-            else:
-                response = self.__web_session.get(url, **kwargs)
+        # same defaults as requests
+        follow = kwargs.pop('allow_redirects', method != "HEAD")
+
+        def __send(target: str, **request_kwargs) -> 'requests.Response':
+            response = self.__get_web_session().request(method, target, **request_kwargs)
+            profiler().count("http.requests")
+
+            if method == "GET" and not request_kwargs.get('stream', False):
+                profiler().count("http.bytes", len(response.content))
+
             return response
 
-        return self.__request_wrapper(__get_internal)
+        target = self.__redirects.resolve(url) if follow else url
+        is_cached = target != url
+        if is_cached:
+            profiler().count("http.redirect_hits")
+
+        response = None
+
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self.__request_wrapper(
+                functools.partial(__send, target), target, allow_redirects=False, **kwargs
+            )
+
+            if response is not None and is_cached and response.status_code in STALE_STATUSES:
+                # the cached target has expired before its time, start over from the source
+                logger().debug(msg=f"Redirect of {url} to {target} is stale.")
+                self.__redirects.invalidate(url)
+                (target, is_cached) = (url, False)
+                continue
+
+            if response is None or not follow or not response.is_redirect:
+                return response
+
+            location = urljoin(target, response.headers['location'])
+            logger().debug(msg=f"Redirecting to {location}")
+            self.__redirects.record(target, response.status_code, location, response.headers)
+            response.close()
+
+            target = location
+
+        logger().error(msg=f"Too many redirects from {url}.")
 
-    def head(self, url: URI, **kwargs) -> requests.Response:
+        return response
+
+    def get(self, url: Union[Route, URI, str], **kwargs) -> 'requests.Response':
+        '''
+        HTTP GET <URL> <ARGS>
+        '''
+        route = classify(url)
+
+        def __get_internal() -> 'requests.Response':
+            if route.is_github_release:
+                return self.__request_wrapper(
+                    lambda **request_kwargs: self.__gh_session.get(route.url, **request_kwargs), route.url, **kwargs
+                )
+
+            return self.__web_request("GET", route.url, **kwargs)
+
+        if kwargs.get('stream', False) or not route.is_github_api:
+            # streamed contents can be consumed only once, downloads are too large to be kept
+            return __get_internal()
+
+        return self.__memoized(
+            HttpRequestManager.__memo_key("GET", route.url, kwargs),
+            __get_internal,
+            HttpRequestManager.__is_ok
+        )
+
+    def head(self, url: Union[Route, URI, str], **kwargs) -> 'requests.Response':
         '''
         HTTP HEAD <URL> <ARGS>
         '''
-        def __head_internal() -> requests.Response:
-            response = None
-            if GithubAPI.assert_latest_release_url(url) or GithubAPI.assert_release_list_url(url):
-                response = self.__gh_session.head(url, **kwargs)
-            else:
-                response = self.__web_session.head(url, **kwargs)
-            return response
+        route = classify(url)
+
+        def __head_internal() -> 'requests.Response':
+            if route.is_github_release:
+                return self.__request_wrapper(
+                    lambda **request_kwargs: self.__gh_session.head(route.url, **request_kwargs), route.url, **kwargs
+                )
+
+            return self.__web_request("HEAD", route.url, **kwargs)
 
-        return self.__request_wrapper(__head_internal)
+        return self.__memoized(
+            HttpRequestManager.__memo_key("HEAD", route.url, kwargs),
+            __head_internal,
+            HttpRequestManager.__is_ok
+        )
 
-    def get_downloadable_assets(self, url: URI, **kwargs) -> List[Union[Release, URI]]:
+    def get_api_rate_limits(self, **kwargs) -> Tuple[int, int, int]:
+        '''
+        Return the github API (remaining calls, used calls, reset epoch), or -1s if unknown
+        '''
+        limits = self.__request_wrapper(lambda: self.__gh_session.get_api_rate_limits(**kwargs))
+
+        return limits if limits is not None else (-1, -1, -1)
+
+    def get_downloadable_assets(self, url: Union[Route, URI, str], **kwargs) -> List[Union[Release, URI]]:
         '''
         HTTP GET <URL> <ARG>
 
@@ -114,15 +333,17 @@ class HttpRequestManager(object):
 
         releases = []
 
-        if GithubAPI.assert_release_list_url(url):
-
-            if GithubAPI.assert_latest_release_url(url):
-                # releases.append(GithubAPI.fetch_latest_release_assets(url, self.__gh_session, **kwargs))
-                url = url.parent()
-
-            releases = self.__gh_session.fetch_release_list_assets(url, **kwargs)
+        route = classify(url)
 
+        if route.is_github_release:
+            # latest release urls are resolved against the release list
+            # in order to also know the previous releases
+            releases = self.__memoized(
+                HttpRequestManager.__memo_key("RELEASES", route.release_list_url, kwargs),
+                lambda: self.__gh_session.fetch_release_list_assets(route.release_list_url, **kwargs),
+                lambda x: len(x) > 0
+            )
         else:
-            releases.append(url)
+            releases.append(url if isinstance(url, URI) else route.uri)
 
         return releases
@@ -2,16 +2,23 @@
 Addon enable-disable management module
 '''
 
-import os
-
 from pathlib import Path
-from typing import Iterable
+from typing import Dict, Iterable, Set, Tuple
 from yaam.controller.metadata import MetadataCollector
-from yaam.controller.update.updater import AddonUpdater
+from yaam.controller.rename import RenamePlan
+from yaam.controller.update.results import UpdateResult
+from yaam.controller.update.updater import AddonUpdateData, AddonUpdater
 from yaam.model.type.binding import BindingType
 # import yaam.utils.metadata as meta
 from yaam.model.mutable.addon import Addon
+from yaam.model.mutable.metadata import AddonMetadata
+from yaam.utils.detetimeutils import compare_epoch
 from yaam.utils.logger import static_logger as logger
+from yaam.utils.profiler import static_profiler as profiler
+from yaam.utils.workspace import WorkspaceSnapshot
+
+# remote metadata and update data of an addon fetched elsewhere
+PrefetchedUpdate = Tuple[AddonMetadata, AddonUpdateData]
 
 
 class AddonManager(object):
@@ -19,13 +26,19 @@ class AddonManager(object):
     Addon management class
     '''
 
-    def __init__(self, metadata: MetadataCollector, updater: AddonUpdater, binding_type: BindingType) -> None:
+    def __init__(self, metadata: MetadataCollector, updater: AddonUpdater, binding_type: BindingType, journal_path: Path = None) -> None:
         self.__metadata = metadata
         self.__updater = updater
+        self.__workspace: WorkspaceSnapshot = None
+        self.__journal_path = journal_path
+        self.__plan: RenamePlan = None
+        self.__pending_metadata: Dict[str, AddonMetadata] = dict()
+        # namings of the pending metadata before the planned renames, restored on rollback
+        self.__previous_namings: Dict[str, Dict[BindingType, Dict[str, str]]] = dict()
         # self.__binding_type = binding_type
 
+        # timeouts are adapted to each host latency by the http request manager
         self.__default_request_args = {
-            'timeout': 120,
             'allow_redirects': True,
             'headers': {
                 'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.45 Safari/537.36',
@@ -34,27 +47,160 @@ class AddonManager(object):
             }
         }
 
-    def initialize_metadata(self, addons: Iterable[Addon], prefetch_updates: bool, force_updates: bool):
+    def __snapshot(self) -> WorkspaceSnapshot:
+        '''
+        Return the workspace snapshot of the current run, creating it if necessary
+        '''
+        if self.__workspace is None:
+            self.__workspace = WorkspaceSnapshot()
+        return self.__workspace
+
+    def __rename_plan(self) -> RenamePlan:
+        '''
+        Return the rename plan of the current run, creating it if necessary
+        '''
+        if self.__plan is None:
+            self.__plan = RenamePlan(self.__snapshot())
+        return self.__plan
+
+    def initialize_metadata(self, addons: Iterable[Addon], prefetch_updates: bool, force_updates: bool,
+                            preload: Iterable[Addon] = None, prefetched: Dict[str, PrefetchedUpdate] = None):
         '''
         Initialize local and remote metadata
+
+        @preload : Iterable[Addon] -- The addons whose updates should be prefetched (default: all)
+        @prefetched : Dict[str, PrefetchedUpdate] -- Updates already fetched elsewhere (e.g.: by the daemon)
         '''
 
         logger().info(msg="Fetching all addon metadata...")
 
-        self.__metadata.load_local_metadata(addons)
+        with profiler().span("metadata.local"):
+            self.__metadata.load_local_metadata(addons)
+
+        adopted: Set[str] = set()
+        if prefetched is not None and len(prefetched) > 0 and not force_updates:
+            adopted = self.__adopt_updates(addons, prefetched)
+            logger().info(msg=f"Using prefetched updates for {len(adopted)} addons.")
 
         if prefetch_updates:
-            self.__metadata.load_remote_metadata(addons, False, **self.__default_request_args)
-            self.__updater.preload_addons_updates(addons, self.__metadata, force_updates, **self.__default_request_args)
+            pending = [_ for _ in addons if _.base.name not in adopted]
+            preload = pending if preload is None else [_ for _ in preload if _.base.name not in adopted]
+
+            with profiler().span("metadata.remote"):
+                self.__metadata.load_remote_metadata(pending, False, **self.__default_request_args)
+            with profiler().span("preload"):
+                self.__updater.preload_addons_updates(
+                    preload, self.__metadata, force_updates, keep_cached=len(adopted) > 0, **self.__default_request_args
+                )
+
+    def __adopt_updates(self, addons: Iterable[Addon], prefetched: Dict[str, PrefetchedUpdate]) -> Set[str]:
+        '''
+        Use the prefetched remote metadata and update data of the given addons,
+        as long as they are still consistent with the local state
+        '''
+        adopted: Set[str] = set()
+
+        for addon in addons:
+            (remote, update) = prefetched.get(addon.base.name, (None, None))
+            local = self.__metadata.get_local_metadata(addon)
+
+            if remote is None or update is None or local is None:
+                continue
+
+            is_installed = self.__snapshot().exists(addon.binding.path)
+
+            if update.status in [UpdateResult.TO_INSTALL, UpdateResult.TO_UPDATE] and update.http_response is not None:
+                # the local state might have changed since the updates were fetched
+                if not is_installed and addon.binding.is_enabled:
+                    update.status = UpdateResult.TO_INSTALL
+                elif remote.has_same_signature(local):
+                    update.status = UpdateResult.UP_TO_DATE
+                else:
+                    update.status = UpdateResult.TO_UPDATE
+            elif update.status is not UpdateResult.UP_TO_DATE or not is_installed or (
+                compare_epoch(remote.timestamp, local.timestamp) > 0
+            ):
+                continue
+
+            remote.namings = local.namings
+
+            self.__metadata.set_remote_metadata(addon, remote)
+            self.__updater.cache_addon_update(addon, update)
+            adopted.add(addon.base.name)
+
+        return adopted
+
+    def recover_renames(self) -> int:
+        '''
+        Roll back the renames of a previous interrupted run, if any
+        '''
+        reverted = RenamePlan.recover(self.__journal_path)
+
+        if reverted > 0:
+            self.__workspace = None
+            self.__plan = None
+
+        return reverted
+
+    def apply_renames(self) -> int:
+        '''
+        Apply all the planned renames in a single pass and then save the affected metadata
+        '''
+        applied = 0
+
+        plan = self.__plan
+        if plan is None or plan.is_empty:
+            logger().debug(msg="No addon needs to be renamed.")
+        else:
+            applied = plan.apply(self.__journal_path)
+
+        if plan is not None and applied != len(plan.operations):
+            # the plan has been rolled back, the snapshot and the naming changes are stale
+            self.__workspace = None
+            for (uri, namings) in self.__previous_namings.items():
+                self.__pending_metadata[uri].namings = namings
+            self.__pending_metadata.clear()
+
+        # the renames are acknowledged before being recorded, so that an interruption
+        # can only leave renamed files behind, whose namings are adopted by the next run
+        RenamePlan.commit(self.__journal_path)
+
+        if plan is not None and applied == len(plan.operations):
+            for _ in plan.operations:
+                self.__metadata.installed_files.move(_.src, _.dst)
+
+        self.__metadata.save_metadata_batch(self.__pending_metadata.values())
+
+        self.__plan = None
+        self.__pending_metadata.clear()
+        self.__previous_namings.clear()
+
+        return applied
+
+    def manage_addons(self, addons: Iterable[Addon], prev: Iterable[Addon] = None) -> int:
+        '''
+        Plan and apply the renames, suffix changes, suppressions and restorations
+        aligning the installed addons to the given ones
+        '''
+        with profiler().span("manage"):
+            with profiler().span("manage.plan"):
+                self.resolve_renames(addons, prev)
+                self.update_disabled_addons_suffixes(addons, ".disabled", "_0")
+                self.disable_addons(addons, prev, "_0")
+                self.restore_addons(addons, prev, "_0")
+            with profiler().span("manage.apply"):
+                return self.apply_renames()
 
     def resolve_renames(self, addons: Iterable[Addon], prev: Iterable[Addon] = None) -> int:
         '''
-        Detect and resolve renamed addons by aligning physical names to pointed ones
+        Plan the renames aligning the physical names of renamed addons to the pointed ones
         '''
 
+        ret = 0
         for addon in addons:
             metadata = self.__metadata.get_local_metadata(addon)
             binding_namings = metadata.namings.get(addon.binding.typing, dict())
+            previous_namings = dict((k, dict(v)) for (k, v) in metadata.namings.items())
 
             modified: bool = False
             if len(binding_namings) > 0:
@@ -64,6 +210,7 @@ class AddonManager(object):
                         if self.__check_and_rename(addon, prev_rule, new_rule):
                             binding_namings[key] = new_rule
                             modified = True
+                            ret += 1
 
                 elif not addon.binding.is_headless:
                     new_rule = addon.binding.default_naming
@@ -72,23 +219,31 @@ class AddonManager(object):
                             if self.__check_and_rename(addon, prev_rule, new_rule):
                                 binding_namings[key] = new_rule
                                 modified = True
+                                ret += 1
                                 break
 
             if modified:
-                self.__metadata.save_metadata(metadata, metadata.uri)
+                # metadata are saved once the renames are applied
+                self.__previous_namings.setdefault(str(metadata.uri), previous_namings)
+                self.__pending_metadata[str(metadata.uri)] = metadata
+
+        return ret
 
     def __check_and_rename(self, addon: Addon, prev_rule: str, new_rule: str) -> bool:
         '''
-        ...
+        Plan the rename of an addon file whose naming changed
+        and return whether its naming can be updated
         '''
         ret: bool = False
         if prev_rule is not None and new_rule is not None and prev_rule != new_rule:
             logger().info(msg=f"Detected a name change in {addon.base.name}: {prev_rule} is now {new_rule}")
             prev_target = addon.binding.workspace / prev_rule
             new_target = addon.binding.workspace / new_rule
-            if prev_target.exists():
-                prev_target.rename(new_target)
-            ret = True
+            if self.__snapshot().exists(prev_target):
+                ret = self.__rename_plan().add(prev_target, new_target, addon.base.name, "rename")
+            else:
+                # already renamed, e.g. by a run interrupted before saving the namings
+                ret = self.__snapshot().exists(new_target)
         return ret
 
     def __get_naming_rules(self, addon: Addon) -> list:
@@ -113,7 +268,7 @@ class AddonManager(object):
 
     def update_disabled_addons_suffixes(self, addons: Iterable[Addon], old_disabled_suffix: str, new_disabled_suffix: str) -> int:
         '''
-        Update the suffix of disabled addons to match the new one
+        Plan the renames updating the suffix of disabled addons to match the new one
         @addons : Iterable[Addon] -- The list of addons to be updated (.dll only, .exe are filtered out)
         @old_disabled_suffix : str -- The old suffix used to mark disabled addons
         @new_disabled_suffix : str -- The new suffix used to mark disabled addons
@@ -132,16 +287,16 @@ class AddonManager(object):
                         path_disabled_old = workspace / f"{_}{old_disabled_suffix}"
                         path_disabled_new = workspace / f"{_}{new_disabled_suffix}"
 
-                        if path_disabled_old.exists() and path_disabled_old.is_file():
+                        if self.__snapshot().is_file(path_disabled_old):
                             logger().info(msg=f"Addon {addon.base.name}({path_disabled_old.name}) will be renamed to match the new disabled suffix...")
-                            os.rename(str(path_disabled_old), str(path_disabled_new))
-                            ret += 1
+                            if self.__rename_plan().add(path_disabled_old, path_disabled_new, addon.base.name, "suffix"):
+                                ret += 1
 
         return ret
 
     def disable_addons(self, addons: Iterable[Addon], prev: Iterable[Addon] = None, disabled_suffix: str = "_0") -> int:
         '''
-        Overrides the typing of installed addons (.dll -> .dll_0)
+        Plan the renames overriding the typing of installed addons (.dll -> .dll_0)
         @addons : Iterable[Addon] -- The list of addons to be disabled (.dll only, .exe are filtered out)
         '''
 
@@ -186,16 +341,16 @@ class AddonManager(object):
                             else:
                                 can_disable = False
 
-                        if path.exists() and path.is_file() and can_disable:
+                        if can_disable and self.__snapshot().is_file(path):
                             logger().info(msg=f"Addon {addon.base.name}({path.name}) will be suppressed...")
-                            os.rename(str(path), str(path_disabled))
-                            ret += 1
+                            if self.__rename_plan().add(path, path_disabled, addon.base.name, "disable"):
+                                ret += 1
 
         return ret
 
     def restore_addons(self, addons: Iterable[Addon], prev: Iterable[Addon] = None, disabled_suffix: str = "_0") -> int:
         '''
-        Restore disabled addons.
+        Plan the renames restoring disabled addons.
         @addons : Iterable[Addon] -- The list of addons to be enabled (.dll only, .exe are filtered out)
         '''
         ret = 0
@@ -223,10 +378,10 @@ class AddonManager(object):
                             # but it supposed to not be possible
                             # can_enable = match_dll_metainfo(addon, path_disabled)
 
-                        if path_disabled.exists() and can_enable:
+                        if can_enable and self.__snapshot().exists(path_disabled):
                             logger().info(msg=f"Addon {addon.base.name}({path.name}) will be restored...")
-                            os.rename(str(path_disabled), str(path))
-                            ret += 1
+                            if self.__rename_plan().add(path_disabled, path, addon.base.name, "restore"):
+                                ret += 1
 
         return ret
 
@@ -256,9 +411,36 @@ class AddonManager(object):
 
         return any_match
 
-    def update_addons(self, addons: Iterable[Addon], force_updates: bool = False) -> None:
+    def update_addons(self, addons: Iterable[Addon], force_updates: bool = False) -> Dict[str, UpdateResult]:
         '''
         Updated the provided addons with the update metadata results provided by the metadata collector
+        and return the update result of each enabled addon
+        '''
+
+        results = self.__updater.update_addons(addons, self.__metadata, force_updates, **self.__default_request_args)
+
+        # updates write to the workspaces, any snapshot taken before is stale
+        self.__workspace = None
+
+        return results
+
+    def fetch_addon_update(self, addon: Addon, force_updates: bool = False):
+        '''
+        Fetch the update of a single addon, unless already prefetched
         '''
+        if self.__updater.get_addon_update(addon) is None:
+            self.__updater.preload_addon_update(addon, self.__metadata, force_updates, **self.__default_request_args)
 
-        self.__updater.update_addons(addons, self.__metadata, force_updates, **self.__default_request_args)
+    def update_addon(self, addon: Addon, force_updates: bool = False) -> UpdateResult:
+        '''
+        Fetch, unless already prefetched, and apply the updates of a single addon
+        '''
+
+        self.fetch_addon_update(addon, force_updates)
+
+        with profiler().span("update.addon", addon=addon.base.name):
+            ret = self.__updater.update_addon(addon, self.__metadata, force_updates)
+
+        self.__workspace = None
+
+        return ret
@@ -7,14 +7,18 @@ from os import makedirs
 from os import remove as remove_file
 from shutil import copy2 as copy_file
 from pathlib import Path
-from typing import Dict, List, Union
+from typing import Dict, Iterable, List, Union
 from yaam.controller.http import HttpRequestManager
+from yaam.controller.fileindex import InstalledFileIndex
+from yaam.controller.metastore import MetadataStore
+from yaam.controller.probe import RemoteProbe
 from yaam.model.appcontext import GameContext
 from yaam.model.mutable.addon import Addon
 from yaam.model.mutable.metadata import AddonMetadata
-from yaam.utils.json.io import read_json, write_json
 from yaam.utils.logger import static_logger as logger
 from yaam.utils.hashing import Hasher
+from yaam.utils.profiler import static_profiler as profiler
+from yaam.utils.route import RouteType
 
 
 class MetadataCollector(object):
@@ -22,13 +26,25 @@ class MetadataCollector(object):
     Addon metadata collector
     '''
 
-    def __init__(self, http: HttpRequestManager, context: GameContext) -> None:
+    def __init__(self, http: HttpRequestManager, context: GameContext, probe: RemoteProbe = None, store: MetadataStore = None,
+                 hasher: Hasher = Hasher.fastest()) -> None:
         self.__http = http
         self.__context = context
+        self.__hasher = hasher
+        self.__probe = probe if probe is not None else RemoteProbe(http, context.cache_dir / "probes.json")
+        self.__store = store if store is not None else MetadataStore(context.metadata_dir / "metadata.db")
+        self.__installed_files = InstalledFileIndex(self.__store)
         self.__local_metadata: Dict[str, AddonMetadata] = dict()
         self.__local_metadata_backup: Dict[str, AddonMetadata] = dict()
         self.__remote_metadata: Dict[str, AddonMetadata] = dict()
 
+    @property
+    def installed_files(self) -> InstalledFileIndex:
+        '''
+        Return the index of the files written by the addons updates
+        '''
+        return self.__installed_files
+
     def get_local_metadata(self, addon: Addon) -> AddonMetadata:
         '''
         Get the local addon metadata if exists
@@ -61,11 +77,18 @@ class MetadataCollector(object):
         self.__local_metadata.clear()
         self.__local_metadata_backup.clear()
 
-        self.__manage_backward_compatibility(addons)
+        self.__store.migrate("json_files", lambda: self.__migrate_json_files(addons))
+
+        paths = dict((_.base.name, Path(self.__get_metadata_path(_))) for _ in addons)
+
+        # all the metadata are read at once
+        stored = self.__store.get_many(self.__get_metadata_key(_) for _ in paths.values())
 
         for _ in addons:
 
-            curr_metadata = self.fetch_local_metadata(_)
+            with profiler().span("metadata.local.addon", addon=_.base.name):
+                metadata_path = paths[_.base.name]
+                curr_metadata = self.__make_local_metadata(stored.get(self.__get_metadata_key(metadata_path), dict()), metadata_path, _)
 
             if curr_metadata is not None:
                 self.set_local_metadata(_, curr_metadata)
@@ -82,7 +105,9 @@ class MetadataCollector(object):
         logger().info(msg=f"Fetching {addon.base.name} local metadata...")
         logger().debug(msg=f"{addon.base.name} metadata storage URI is {curr_metadata_path}")
 
-        curr_metadata = self.__read_metadata_from_local_path(curr_metadata_path, addon)
+        curr_metadata = self.__make_local_metadata(
+            self.__store.get(self.__get_metadata_key(curr_metadata_path)) or dict(), curr_metadata_path, addon
+        )
 
         if curr_metadata is not None:
             logger().debug(msg=f"Fetching {addon.base.name} local metadata completed.")
@@ -105,16 +130,28 @@ class MetadataCollector(object):
 
         return metadata_path
 
-    def __read_metadata_from_local_path(self, metadata_path: Path, addon: Addon) -> AddonMetadata:
+    def __get_metadata_key(self, metadata_path: Union[Path, str]) -> str:
         '''
-        Retrieve local addon metadata
+        Return the store key of the given metadata path
         '''
+        metadata_path = Path(metadata_path)
 
-        metadata: AddonMetadata = AddonMetadata.from_json(read_json(metadata_path))
+        try:
+            return metadata_path.relative_to(self.__context.metadata_dir).as_posix()
+        except ValueError:
+            return metadata_path.as_posix()
+
+    def __make_local_metadata(self, json_obj: dict, metadata_path: Path, addon: Addon) -> AddonMetadata:
+        '''
+        Make the local addon metadata from the stored ones
+        '''
+
+        metadata: AddonMetadata = AddonMetadata.from_json(json_obj)
 
         # if its a single physical file and not a collection, we recompute the hash signature...
         if len(metadata.hash_signature) == 0 and not addon.binding.is_headless:
-            metadata.hash_signature = Hasher.SHA256.make_hash_from_file(addon.binding.path)
+            metadata.hash_signature = self.__hasher.make_hash_from_file(addon.binding.path)
+            metadata.hash_algorithm = self.__hasher
 
         metadata.uri = metadata_path
         metadata.addon = addon.base.name
@@ -126,10 +163,13 @@ class MetadataCollector(object):
         Retrieve remote metadata for the provided addons collection and store them
         '''
         for _ in addons:
-            metadata = self.fetch_remote_metadata(_, follow, **kwargs)
+            with profiler().span("metadata.remote.addon", addon=_.base.name):
+                metadata = self.fetch_remote_metadata(_, follow, **kwargs)
             if metadata is not None:
                 self.set_remote_metadata(_, metadata)
 
+        self.__probe.save()
+
     def fetch_remote_metadata(self, addon: Addon, follow: bool = False, **kwargs) -> AddonMetadata:
         '''
         Fetch metadata for the given Addon from remote
@@ -139,19 +179,26 @@ class MetadataCollector(object):
         logger().debug(msg=f"Fetching {addon.base.name} remote metadata from {addon.base.uri}")
         logger().debug(msg=f"{addon.base.name} metadata storage URI is {addon.base.uri}")
 
-        response = self.__http.head(addon.base.uri, **kwargs)
+        headers = None
+
+        if addon.base.route.typing is RouteType.DATASTREAM:
+            # plain web resources are probed with the cheapest strategy their host supports
+            headers = self.__probe.probe(addon.base.route, self.get_local_metadata(addon), **kwargs)
+        else:
+            # redirects are followed (and their targets cached) by the http request manager
+            if follow:
+                kwargs['allow_redirects'] = True
+
+            response = self.__http.head(addon.base.route, **kwargs)
 
-        if response is not None:
-            # detect redirect
-            if 'location' in response.headers and follow:
-                logger().debug(msg=f"Redirecting to {response.headers['location']}")
-                response = self.__http.head(response.headers['location'], **kwargs)
+            headers = response.headers if response is not None else None
 
+        if headers is not None:
             metadata = AddonMetadata(
                 addon=addon.base.name,
                 uri=addon.base.uri,
-                etag=response.headers.get('etag', ''),
-                last_modified=response.headers.get('last-modified', '')
+                etag=headers.get('etag', ''),
+                last_modified=headers.get('last-modified', '')
             )
 
             logger().debug(msg=f"Fetching {addon.base.name} remote metadata completed.")
@@ -175,22 +222,36 @@ class MetadataCollector(object):
         '''
         Save all the local addon metadata
         '''
-        self.__local_metadata.clear()
-        for (_, metadata) in self.__local_metadata.items():
-            self.save_metadata(metadata, metadata.uri)
+        self.save_metadata_batch(self.__local_metadata.values())
 
     def save_metadata(self, metadata: AddonMetadata, path: Union[Path, str]):
         '''
         Save metadata locally
         '''
 
-        if isinstance(path, str):
-            path = Path(path)
-
         logger().info(msg=f"Saving {metadata.addon} metadata ...")
         logger().debug(msg=f"{metadata.addon} metadata storage storage URI is {path}")
-        makedirs(path.parent, exist_ok=True)
-        write_json(metadata.to_json(), path)
+        self.__store.put(self.__get_metadata_key(path), metadata.to_json())
+
+    def save_metadata_batch(self, metadata_list: Iterable[AddonMetadata]):
+        '''
+        Save the given metadata locally, all at once
+        '''
+        metadata_list = list(metadata_list)
+
+        if len(metadata_list) > 0:
+            logger().info(msg=f"Saving {len(metadata_list)} addon metadata ...")
+            self.__store.put_many((self.__get_metadata_key(_.uri), _.to_json()) for _ in metadata_list)
+
+    def __migrate_json_files(self, addons: List[Addon]):
+        '''
+        Import the per-addon metadata files, from both the current and the old locations, into the store
+        '''
+        self.__manage_backward_compatibility(addons)
+
+        n_files = self.__store.import_json_tree(self.__context.metadata_dir)
+
+        logger().info(msg=f"Moved {n_files} metadata files to {self.__store.path}.")
 
     def __manage_backward_compatibility(self, addons: List[Addon]):
         '''
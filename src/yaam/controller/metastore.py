@@ -0,0 +1,246 @@
+'''
+Consolidated addon metadata store module
+'''
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple
+from yaam.utils.logger import static_logger as logger
+
+if TYPE_CHECKING:
+    import sqlite3
+
+# sqlite default limit of host parameters is 999
+MAX_BATCH_SIZE = 500
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, data TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)",
+    (
+        "CREATE TABLE IF NOT EXISTS files ("
+        "owner TEXT NOT NULL, key TEXT NOT NULL, path TEXT NOT NULL, size INTEGER, mtime_ns INTEGER, digest TEXT, "
+        "algorithm TEXT NOT NULL DEFAULT 'sha256', PRIMARY KEY (owner, key))"
+    ),
+    "CREATE INDEX IF NOT EXISTS files_by_key ON files (key)"
+]
+
+# columns added after the table creation, with their definition
+FILES_COLUMNS = {
+    'algorithm': "TEXT NOT NULL DEFAULT 'sha256'"
+}
+
+# (key, path, size, mtime_ns, digest, algorithm)
+FileRow = Tuple[str, str, int, int, str, str]
+
+
+class MetadataStore(object):
+    '''
+    Single file (SQLite, WAL mode) addon metadata store
+
+    Metadata are stored as json objects indexed by key and are read
+    and written in batches, each batch being a single transaction.
+    The store can be shared between threads.
+    '''
+
+    def __init__(self, path: Path, timeout: float = 10.0) -> None:
+        self.__path = path
+        self.__timeout = timeout
+        self.__connection: 'sqlite3.Connection' = None
+        self.__lock = threading.RLock()
+
+    @property
+    def path(self) -> Path:
+        '''
+        Return the path of the store file
+        '''
+        return self.__path
+
+    def __connect(self) -> 'sqlite3.Connection':
+        '''
+        Return the store connection, opening it if necessary
+        '''
+        if self.__connection is None:
+            import sqlite3
+
+            self.__path.parent.mkdir(parents=True, exist_ok=True)
+
+            self.__connection = sqlite3.connect(str(self.__path), timeout=self.__timeout, check_same_thread=False)
+            self.__connection.execute("PRAGMA journal_mode=WAL")
+            self.__connection.execute("PRAGMA synchronous=NORMAL")
+            with self.__connection:
+                for _ in SCHEMA:
+                    self.__connection.execute(_)
+
+                columns = set(_[1] for _ in self.__connection.execute("PRAGMA table_info(files)"))
+                for (name, definition) in FILES_COLUMNS.items():
+                    if name not in columns:
+                        self.__connection.execute(f"ALTER TABLE files ADD COLUMN {name} {definition}")
+
+        return self.__connection
+
+    def close(self):
+        '''
+        Close the store connection
+        '''
+        with self.__lock:
+            if self.__connection is not None:
+                self.__connection.close()
+                self.__connection = None
+
+    def get(self, key: str) -> dict:
+        '''
+        Return the metadata stored with the given key, if any
+        '''
+        return self.get_many([key]).get(key, None)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, dict]:
+        '''
+        Return the metadata stored with the given keys, if any
+        '''
+        keys = list(set(keys))
+        result: Dict[str, dict] = dict()
+
+        with self.__lock:
+            connection = self.__connect()
+            for i in range(0, len(keys), MAX_BATCH_SIZE):
+                batch = keys[i:i + MAX_BATCH_SIZE]
+                rows = connection.execute(
+                    f"SELECT key, data FROM metadata WHERE key IN ({','.join('?' * len(batch))})", batch
+                )
+                for (key, data) in rows:
+                    result[key] = json.loads(data)
+
+        return result
+
+    def put(self, key: str, data: dict):
+        '''
+        Store the given metadata with the given key
+        '''
+        self.put_many([(key, data)])
+
+    def put_many(self, items: Iterable[Tuple[str, dict]]):
+        '''
+        Store all the given (key, metadata) in a single transaction
+        '''
+        rows = [(key, json.dumps(data)) for (key, data) in items]
+
+        if len(rows) == 0:
+            return
+
+        with self.__lock:
+            connection = self.__connect()
+            with connection:
+                connection.executemany("INSERT OR REPLACE INTO metadata (key, data) VALUES (?, ?)", rows)
+
+    def get_meta(self, name: str) -> str:
+        '''
+        Return the value of the given store property, if any
+        '''
+        with self.__lock:
+            row = self.__connect().execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+
+        return row[0] if row is not None else None
+
+    def set_meta(self, name: str, value: str):
+        '''
+        Set the value of the given store property
+        '''
+        with self.__lock:
+            connection = self.__connect()
+            with connection:
+                connection.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value))
+
+    def get_files(self, owner: str) -> List[FileRow]:
+        '''
+        Return the files recorded for the given owner
+        '''
+        with self.__lock:
+            return self.__connect().execute(
+                "SELECT key, path, size, mtime_ns, digest, algorithm FROM files WHERE owner = ? ORDER BY key", (owner,)
+            ).fetchall()
+
+    def set_files(self, owner: str, rows: Iterable[FileRow]):
+        '''
+        Replace the files recorded for the given owner in a single transaction
+        '''
+        rows = [(owner, *_) for _ in rows]
+
+        with self.__lock:
+            connection = self.__connect()
+            with connection:
+                connection.execute("DELETE FROM files WHERE owner = ?", (owner,))
+                connection.executemany(
+                    "INSERT OR REPLACE INTO files (owner, key, path, size, mtime_ns, digest, algorithm) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+
+    def get_file_owners(self, keys: Iterable[str]) -> Dict[str, List[str]]:
+        '''
+        Return the owners of each of the given file keys, if any
+        '''
+        keys = list(set(keys))
+        result: Dict[str, List[str]] = dict()
+
+        with self.__lock:
+            connection = self.__connect()
+            for i in range(0, len(keys), MAX_BATCH_SIZE):
+                batch = keys[i:i + MAX_BATCH_SIZE]
+                rows = connection.execute(
+                    f"SELECT key, owner FROM files WHERE key IN ({','.join('?' * len(batch))}) ORDER BY owner", batch
+                )
+                for (key, owner) in rows:
+                    result.setdefault(key, list()).append(owner)
+
+        return result
+
+    def move_files(self, src_key: str, dst_key: str, dst_path: str, separator: str):
+        '''
+        Move the files recorded at the given key, or below it if it's a directory, to the destination
+        '''
+        with self.__lock:
+            connection = self.__connect()
+            with connection:
+                rows = connection.execute(
+                    "SELECT owner, key, path FROM files WHERE key = ? OR substr(key, 1, ?) = ?",
+                    (src_key, len(src_key) + len(separator), src_key + separator)
+                ).fetchall()
+
+                for (owner, key, path) in rows:
+                    connection.execute(
+                        "UPDATE OR REPLACE files SET key = ?, path = ? WHERE owner = ? AND key = ?",
+                        (dst_key + key[len(src_key):], dst_path + path[len(src_key):], owner, key)
+                    )
+
+    def import_json_tree(self, root: Path, pattern: str = "*/metadata_*.json") -> int:
+        '''
+        Store every json file under the given root matching the pattern, with its relative path as key,
+        and return the number of imported files
+        '''
+        items = list()
+
+        for path in sorted(root.glob(pattern)):
+            try:
+                with open(path, 'r', encoding='utf8') as _:
+                    items.append((path.relative_to(root).as_posix(), json.load(_)))
+            except (IOError, json.JSONDecodeError) as ex:
+                logger().warning(msg=f"Skipping unreadable metadata {path}: {ex}")
+
+        self.put_many(items)
+
+        return len(items)
+
+    def migrate(self, name: str, migration) -> bool:
+        '''
+        Run the given migration only once, recording its completion
+        '''
+        with self.__lock:
+            if self.get_meta(f"migration.{name}") is not None:
+                return False
+
+            migration()
+
+            self.set_meta(f"migration.{name}", str(int(time.time())))
+
+        return True
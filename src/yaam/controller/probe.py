@@ -0,0 +1,256 @@
+'''
+Remote resource freshness probe module
+'''
+
+import threading
+import time
+from enum import Enum
+from pathlib import Path
+from typing import Dict, List, Mapping, Tuple
+from urllib.parse import urlparse
+from yaam.controller.http import HttpRequestManager
+from yaam.model.mutable.metadata import AddonMetadata
+from yaam.utils.json.io import read_json, write_json
+from yaam.utils.logger import static_logger as logger
+from yaam.utils.profiler import static_profiler as profiler
+from yaam.utils.route import Route
+
+# weight of the last latency sample in the moving average
+EWMA_ALPHA = 0.3
+# samples of each strategy to be collected before trusting the averages
+MIN_SAMPLES = 2
+# consecutive failures after which a strategy is no longer used for a host
+MAX_FAILURES = 2
+# seconds after which a strategy discarded for a host is tried again
+FAILURES_TTL = 24 * 60 * 60
+
+
+class ProbeStrategy(Enum):
+    '''
+    Ways of fetching the freshness headers of a remote resource without downloading it
+
+    - HEAD: plain HEAD request, slow on origins computing the payload headers
+    - RANGE: GET of the first byte only (Range: bytes=0-0)
+    - CONDITIONAL: GET validated against the local etag / last-modified (304 if unchanged)
+    '''
+    HEAD = "head"
+    RANGE = "range"
+    CONDITIONAL = "conditional"
+
+
+class ProbeStats(object):
+    '''
+    Latency statistics of a probe strategy for a host
+
+    Failures are the times the host rejected the strategy itself (e.g.: no 206 or 304 support)
+    and are forgotten after FAILURES_TTL seconds, since hosts may change their behaviour.
+    '''
+
+    def __init__(self, ewma: float = 0.0, samples: int = 0, failures: int = 0, updated: float = 0.0) -> None:
+        self.ewma = ewma
+        self.samples = samples
+        self.failures = failures
+        self.updated = updated
+
+    @property
+    def is_usable(self) -> bool:
+        '''
+        Return whether the strategy hasn't recently failed too many times in a row
+        '''
+        if self.failures >= MAX_FAILURES and time.time() - self.updated > FAILURES_TTL:
+            self.failures = 0
+
+        return self.failures < MAX_FAILURES
+
+    def record(self, latency: float):
+        '''
+        Record a successful probe latency
+        '''
+        self.ewma = latency if self.samples == 0 else EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.ewma
+        self.samples += 1
+        self.failures = 0
+        self.updated = time.time()
+
+    def fail(self):
+        '''
+        Record a probe rejected by the host
+        '''
+        self.failures += 1
+        self.updated = time.time()
+
+    def to_json(self) -> dict:
+        '''
+        Map the object into its json representation
+        '''
+        return {'ewma': self.ewma, 'samples': self.samples, 'failures': self.failures, 'updated': self.updated}
+
+    @staticmethod
+    def from_json(json_obj: dict):
+        '''
+        Create object representation of this class from dict representation
+        '''
+        return ProbeStats(
+            ewma=json_obj.get('ewma', 0.0),
+            samples=json_obj.get('samples', 0),
+            failures=json_obj.get('failures', 0),
+            updated=json_obj.get('updated', 0.0)
+        )
+
+
+class RemoteProbe(object):
+    '''
+    Freshness probe learning the cheapest strategy supported by each host
+
+    Each strategy is sampled a few times per host, after which the one with
+    the lowest moving average latency is used. Statistics persist across runs.
+    '''
+
+    def __init__(self, http: HttpRequestManager, stats_path: Path = None) -> None:
+        self.__http = http
+        self.__stats_path = stats_path
+        self.__stats: Dict[str, Dict[ProbeStrategy, ProbeStats]] = None
+        self.__lock = threading.Lock()
+        self.__dirty = False
+
+    def __host_stats(self, host: str) -> Dict[ProbeStrategy, ProbeStats]:
+        if self.__stats is None:
+            self.__stats = dict()
+            if self.__stats_path is not None:
+                for (_host, strategies) in read_json(self.__stats_path).items():
+                    self.__stats[_host] = dict(
+                        (ProbeStrategy(key), ProbeStats.from_json(value))
+                        for (key, value) in strategies.items()
+                        if key in [_.value for _ in ProbeStrategy]
+                    )
+
+        return self.__stats.setdefault(host, dict((_, ProbeStats()) for _ in ProbeStrategy))
+
+    def strategies(self, host: str, local: AddonMetadata = None) -> List[ProbeStrategy]:
+        '''
+        Return the strategies to be tried for the given host, best first
+        '''
+        candidates = list(ProbeStrategy)
+
+        # without validators a conditional GET would download the whole resource
+        if local is None or (len(local.etag) == 0 and len(local.last_modified) == 0):
+            candidates.remove(ProbeStrategy.CONDITIONAL)
+
+        with self.__lock:
+            stats = self.__host_stats(host)
+
+            usable = [_ for _ in candidates if stats[_].is_usable]
+            unexplored = [_ for _ in usable if stats[_].samples < MIN_SAMPLES]
+            explored = sorted((_ for _ in usable if _ not in unexplored), key=lambda x: stats[x].ewma)
+
+        ordered = unexplored[:1] + explored + unexplored[1:]
+
+        # HEAD is always the last resort
+        if ProbeStrategy.HEAD not in ordered:
+            ordered.append(ProbeStrategy.HEAD)
+
+        return ordered
+
+    def probe(self, route: Route, local: AddonMetadata = None, **kwargs) -> Mapping[str, str]:
+        '''
+        Return the freshness headers (etag, last-modified, ...) of the given resource, or None
+        '''
+        host = urlparse(route.url).hostname or ""
+
+        # headers without any validator, in case no strategy can do better
+        fallback: Mapping[str, str] = None
+
+        for strategy in self.strategies(host, local):
+            start = time.perf_counter()
+
+            with profiler().span("probe", strategy=strategy.value, host=host):
+                (headers, rejected) = self.__request(strategy, route, local, **kwargs)
+
+            latency = time.perf_counter() - start
+
+            is_valid = headers is not None and ('etag' in headers or 'last-modified' in headers)
+
+            # transient errors (timeouts, 5xx, ...) say nothing about the strategy support
+            if is_valid or rejected:
+                with self.__lock:
+                    stats = self.__host_stats(host)[strategy]
+                    if rejected:
+                        stats.fail()
+                    else:
+                        stats.record(latency)
+                    self.__dirty = True
+
+            if is_valid:
+                logger().debug(msg=f"Probed {route.url} with {strategy.value} in {latency:.3f} seconds.")
+                return headers
+
+            if fallback is None:
+                fallback = headers
+
+        return fallback
+
+    def __request(self, strategy: ProbeStrategy, route: Route, local: AddonMetadata,
+                  **kwargs) -> Tuple[Mapping[str, str], bool]:
+        '''
+        Probe the resource with the given strategy and return its headers, or None if failed,
+        along whether the host rejected the strategy itself
+        '''
+        headers = dict(kwargs.pop('headers', dict()))
+        kwargs.pop('stream', None)
+
+        if strategy is ProbeStrategy.HEAD:
+            response = self.__http.head(route, headers=headers, **kwargs)
+        else:
+            if strategy is ProbeStrategy.RANGE:
+                headers['range'] = "bytes=0-0"
+            else:
+                if len(local.etag) > 0:
+                    headers['if-none-match'] = local.etag
+                if len(local.last_modified) > 0:
+                    headers['if-modified-since'] = local.last_modified
+
+            # the body is never read, even if the origin ignores the request headers
+            response = self.__http.get(route, headers=headers, stream=True, **kwargs)
+            if response is not None:
+                response.close()
+
+        if response is None or response.status_code >= 400:
+            return (None, False)
+
+        if strategy is ProbeStrategy.RANGE and response.status_code != 206:
+            # ranges unsupported, the origin started sending the whole resource
+            return (None, True)
+
+        result = response.headers
+
+        if strategy is ProbeStrategy.CONDITIONAL and response.status_code != 304 and all(
+            result.get(k, "") == v for (k, v) in [('etag', local.etag), ('last-modified', local.last_modified)] if len(v) > 0
+        ):
+            # validators unchanged but not honoured, the origin started sending the whole resource
+            return (result, True)
+
+        if strategy is ProbeStrategy.CONDITIONAL and response.status_code == 304:
+            # 304 responses may omit the validators, which are unchanged
+            result = dict((k.lower(), v) for (k, v) in response.headers.items())
+            result.setdefault('etag', local.etag)
+            result.setdefault('last-modified', local.last_modified)
+
+        # a response without validators can't tell the resource freshness
+        return (result, 'etag' not in result and 'last-modified' not in result)
+
+    def save(self):
+        '''
+        Persist the learned statistics, if changed
+        '''
+        with self.__lock:
+            if self.__stats_path is None or not self.__dirty:
+                return
+
+            self.__stats_path.parent.mkdir(parents=True, exist_ok=True)
+            write_json(
+                dict(
+                    (host, dict((_.value, stats.to_json()) for (_, stats) in strategies.items()))
+                    for (host, strategies) in self.__stats.items()
+                ),
+                self.__stats_path
+            )
+            self.__dirty = False
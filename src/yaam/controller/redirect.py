@@ -0,0 +1,207 @@
+'''
+Redirect targets cache module
+'''
+
+import base64
+import json
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Mapping
+from urllib.parse import parse_qs, urlparse
+from yaam.utils.json.io import read_json, write_json
+
+# redirects whose target never changes
+PERMANENT_STATUSES = frozenset([301, 308])
+
+# permanent redirects are checked again after this many seconds
+PERMANENT_TTL = 24 * 60 * 60
+
+# signed targets are not used in their last seconds of validity,
+# as the request might reach the host after they expired
+EXPIRY_MARGIN = 30.0
+
+# the redirected request is not worth sending again to the cached target
+STALE_STATUSES = frozenset([401, 403, 404, 410])
+
+
+def _epoch(value: str) -> float:
+    '''
+    Return the epoch of an ISO 8601 or compact (20240101T000000Z) UTC datetime, if valid
+    '''
+    for parse in (
+        lambda x: datetime.strptime(x, "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc),
+        lambda x: datetime.fromisoformat(x.replace("Z", "+00:00")),
+    ):
+        try:
+            moment = parse(value)
+            return (moment if moment.tzinfo is not None else moment.replace(tzinfo=timezone.utc)).timestamp()
+        except ValueError:
+            continue
+
+    return None
+
+
+def _jwt_expiry(token: str) -> float:
+    '''
+    Return the expiry (exp claim) of a json web token, if any
+    '''
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims['exp'])
+    except (IndexError, ValueError, KeyError, TypeError):
+        return None
+
+
+def signed_url_expiry(url: str) -> float:
+    '''
+    Return the epoch at which the signature of the given url expires,
+    if it's a signed url (AWS S3, Azure SAS, CloudFront or JWT query parameters)
+    '''
+    query = dict((k.lower(), v[0]) for (k, v) in parse_qs(urlparse(url).query).items())
+
+    expiry = None
+
+    if 'x-amz-date' in query and 'x-amz-expires' in query:
+        date = _epoch(query['x-amz-date'])
+        if date is not None and query['x-amz-expires'].isdigit():
+            expiry = date + int(query['x-amz-expires'])
+    elif 'se' in query:
+        expiry = _epoch(query['se'])
+    elif 'expires' in query and query['expires'].isdigit():
+        expiry = float(query['expires'])
+    elif 'jwt' in query:
+        expiry = _jwt_expiry(query['jwt'])
+
+    return expiry
+
+
+def redirect_expiry(status_code: int, target: str, headers: Mapping[str, str], now: float = None) -> float:
+    '''
+    Return the epoch until which the redirect to the given target can be reused, if cacheable
+    '''
+    now = time.time() if now is None else now
+
+    expiry = signed_url_expiry(target)
+
+    if expiry is None and status_code in PERMANENT_STATUSES:
+        expiry = now + PERMANENT_TTL
+
+    # the redirect response itself may be explicitly cacheable
+    max_age = re.search(r"max-age=(\d+)", headers.get('cache-control', ''))
+    if max_age is not None and 'no-store' not in headers.get('cache-control', ''):
+        expiry = min(expiry, now + int(max_age.group(1))) if expiry is not None else now + int(max_age.group(1))
+    elif expiry is None and 'expires' in headers:
+        try:
+            expiry = parsedate_to_datetime(headers['expires']).timestamp()
+        except (TypeError, ValueError):
+            pass
+
+    return expiry
+
+
+@dataclass(frozen=True)
+class RedirectEntry(object):
+    '''
+    Cached redirect target
+    '''
+    target: str = field(default_factory=str)
+    expires_at: float = field(default=0.0)
+
+    def is_valid(self, now: float = None) -> bool:
+        '''
+        Return whether the target can still be used
+        '''
+        return self.expires_at - EXPIRY_MARGIN > (time.time() if now is None else now)
+
+
+class RedirectCache(object):
+    '''
+    Cache of the redirect targets of each url, as long as they are valid,
+    so that requests can go straight to the target (e.g.: GitHub release assets
+    redirecting to their signed download url) saving a round trip.
+    '''
+
+    def __init__(self, state_path: Path = None) -> None:
+        self.__state_path = state_path
+        self.__lock = threading.Lock()
+        self.__entries: Dict[str, RedirectEntry] = dict()
+
+        self.load()
+
+    def record(self, url: str, status_code: int, target: str, headers: Mapping[str, str]) -> bool:
+        '''
+        Record the redirect of the given url and return whether it has been cached
+        '''
+        expires_at = redirect_expiry(status_code, target, headers)
+
+        entry = RedirectEntry(target, expires_at) if expires_at is not None else None
+
+        with self.__lock:
+            if entry is not None and entry.is_valid():
+                self.__entries[url] = entry
+            else:
+                self.__entries.pop(url, None)
+
+        return entry is not None and entry.is_valid()
+
+    def resolve(self, url: str) -> str:
+        '''
+        Return the last valid target of the redirects chain starting at the given url
+        '''
+        seen = set()
+
+        with self.__lock:
+            while url not in seen:
+                seen.add(url)
+
+                entry = self.__entries.get(url, None)
+                if entry is None or not entry.is_valid():
+                    break
+
+                url = entry.target
+
+        return url
+
+    def invalidate(self, url: str):
+        '''
+        Drop the redirects chain starting at the given url
+        '''
+        with self.__lock:
+            while url in self.__entries:
+                url = self.__entries.pop(url).target
+
+    def load(self):
+        '''
+        Load the persisted redirects still valid, if any
+        '''
+        if self.__state_path is None:
+            return
+
+        with self.__lock:
+            for (url, obj) in read_json(self.__state_path).get('redirects', dict()).items():
+                try:
+                    entry = RedirectEntry(**obj)
+                except TypeError:
+                    continue
+
+                if entry.is_valid():
+                    self.__entries[url] = entry
+
+    def save(self):
+        '''
+        Persist the redirects still valid
+        '''
+        if self.__state_path is None:
+            return
+
+        with self.__lock:
+            state = {'redirects': dict((url, asdict(_)) for (url, _) in self.__entries.items() if _.is_valid())}
+
+        self.__state_path.parent.mkdir(parents=True, exist_ok=True)
+        write_json(state, self.__state_path, only_if_changed=True)
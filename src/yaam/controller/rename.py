@@ -0,0 +1,228 @@
+'''
+Transactional addon rename plan module
+'''
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List
+from yaam.utils.logger import static_logger as logger
+from yaam.utils.workspace import WorkspaceSnapshot
+
+
+@dataclass(frozen=True)
+class RenameOperation(object):
+    '''
+    Single planned rename
+    '''
+    src: Path = field(default_factory=Path)
+    dst: Path = field(default_factory=Path)
+    addon: str = field(default_factory=str)
+    reason: str = field(default_factory=str)
+
+    def to_json(self) -> dict:
+        '''
+        Map the object into its json representation
+        '''
+        return {'src': str(self.src), 'dst': str(self.dst), 'addon': self.addon, 'reason': self.reason}
+
+    @staticmethod
+    def from_json(json_obj: dict):
+        '''
+        Create object representation of this class from dict representation
+        '''
+        return RenameOperation(
+            src=Path(json_obj.get('src', '')),
+            dst=Path(json_obj.get('dst', '')),
+            addon=json_obj.get('addon', ''),
+            reason=json_obj.get('reason', '')
+        )
+
+
+class RenamePlan(object):
+    '''
+    Batch of renames planned against a workspace snapshot
+    and applied in a single pass backed by a rollback journal.
+
+    Planned renames are applied to the snapshot as soon as they are added,
+    so that later planning steps see the workspace as it will be.
+    '''
+
+    def __init__(self, workspace: WorkspaceSnapshot) -> None:
+        self.__workspace = workspace
+        self.__operations: List[RenameOperation] = list()
+        self.__conflicts: List[RenameOperation] = list()
+
+    @property
+    def operations(self) -> List[RenameOperation]:
+        '''
+        Return the planned operations
+        '''
+        return list(self.__operations)
+
+    @property
+    def conflicts(self) -> List[RenameOperation]:
+        '''
+        Return the rejected conflicting operations
+        '''
+        return list(self.__conflicts)
+
+    @property
+    def is_empty(self) -> bool:
+        '''
+        Return whether there is nothing to be renamed
+        '''
+        return len(self.__operations) == 0
+
+    def add(self, src: Path, dst: Path, addon: str = str(), reason: str = str()) -> bool:
+        '''
+        Plan the rename of src to dst.
+
+        Duplicated renames are ignored, while renames whose source is missing
+        or whose target is already taken are rejected as conflicts.
+        '''
+        operation = RenameOperation(Path(src), Path(dst), addon, reason)
+
+        if operation.src == operation.dst or any(
+            _.src == operation.src and _.dst == operation.dst for _ in self.__operations
+        ):
+            return False
+
+        is_case_change = os.path.normcase(str(operation.src)) == os.path.normcase(str(operation.dst))
+
+        if not self.__workspace.exists(operation.src):
+            logger().warning(msg=f"Cannot rename {operation.src} for {addon}: the file doesn't exist.")
+            self.__conflicts.append(operation)
+            return False
+
+        if self.__workspace.exists(operation.dst) and not is_case_change:
+            logger().warning(msg=f"Cannot rename {operation.src} to {operation.dst} for {addon}: the target already exists.")
+            self.__conflicts.append(operation)
+            return False
+
+        self.__workspace.moved(operation.src, operation.dst)
+        self.__operations.append(operation)
+
+        return True
+
+    def apply(self, journal_path: Path = None) -> int:
+        '''
+        Apply all the planned renames in order.
+
+        If a journal path is provided, every rename is recorded there before
+        and after being applied until commit() is called, so that an interrupted
+        run can be rolled back by recover(). If a rename fails, the applied ones
+        are rolled back.
+        '''
+        applied: List[RenameOperation] = list()
+
+        journal = None
+        if journal_path is not None:
+            os.makedirs(Path(journal_path).parent, exist_ok=True)
+            journal = open(journal_path, 'w', encoding='utf-8')
+            RenamePlan.__journal(journal, {'plan': [_.to_json() for _ in self.__operations]})
+
+        try:
+            for (i, operation) in enumerate(self.__operations):
+                logger().debug(msg=f"Renaming {operation.src} to {operation.dst} ({operation.reason})...")
+                if journal is not None:
+                    RenamePlan.__journal(journal, {'applying': i})
+                os.rename(str(operation.src), str(operation.dst))
+                applied.append(operation)
+                if journal is not None:
+                    RenamePlan.__journal(journal, {'applied': i})
+        except OSError as ex:
+            logger().error(msg=f"Renaming failed: {ex}. Rolling back {len(applied)} renames...")
+            RenamePlan.__rollback(applied)
+            applied.clear()
+            if journal is not None:
+                journal.close()
+                journal = None
+                os.remove(journal_path)
+        finally:
+            if journal is not None:
+                journal.close()
+
+        return len(applied)
+
+    @staticmethod
+    def commit(journal_path: Path):
+        '''
+        Discard the journal once the applied plan has been acknowledged
+        '''
+        if journal_path is not None and Path(journal_path).exists():
+            os.remove(journal_path)
+
+    @staticmethod
+    def recover(journal_path: Path) -> int:
+        '''
+        Roll back the renames recorded in a journal left behind by an interrupted run
+        and return the number of reverted renames
+        '''
+        if journal_path is None or not Path(journal_path).exists():
+            return 0
+
+        plan: List[RenameOperation] = list()
+        applied: List[RenameOperation] = list()
+        applying: RenameOperation = None
+
+        with open(journal_path, 'r', encoding='utf-8') as _:
+            for line in _:
+                try:
+                    entry: dict = json.loads(line)
+                except json.JSONDecodeError:
+                    # the last entry might have been truncated
+                    break
+
+                if 'plan' in entry:
+                    plan = [RenameOperation.from_json(op) for op in entry['plan']]
+                elif 'applying' in entry and entry['applying'] < len(plan):
+                    applying = plan[entry['applying']]
+                elif 'applied' in entry and entry['applied'] < len(plan):
+                    applied.append(plan[entry['applied']])
+                    applying = None
+
+        # the run might have been interrupted right after the last rename
+        if applying is not None and RenamePlan.__is_applied(applying):
+            applied.append(applying)
+
+        logger().warning(msg=f"Found an interrupted rename plan. Rolling back {len(applied)} renames...")
+
+        reverted = RenamePlan.__rollback(applied)
+
+        os.remove(journal_path)
+
+        return reverted
+
+    @staticmethod
+    def __journal(journal, entry: dict):
+        journal.write(json.dumps(entry) + "\n")
+        journal.flush()
+        os.fsync(journal.fileno())
+
+    @staticmethod
+    def __is_applied(operation: RenameOperation) -> bool:
+        '''
+        Return whether the given rename is found applied on disk
+        '''
+        if os.path.normcase(str(operation.src)) == os.path.normcase(str(operation.dst)):
+            # both paths exist on case-insensitive file systems, only the listing tells them apart
+            try:
+                return operation.dst.name in os.listdir(operation.dst.parent)
+            except OSError:
+                return False
+
+        return operation.dst.exists() and not operation.src.exists()
+
+    @staticmethod
+    def __rollback(applied: List[RenameOperation]) -> int:
+        reverted = 0
+        for operation in reversed(applied):
+            if RenamePlan.__is_applied(operation):
+                try:
+                    os.rename(str(operation.dst), str(operation.src))
+                    reverted += 1
+                except OSError as ex:
+                    logger().error(msg=f"Cannot restore {operation.src}: {ex}")
+        return reverted
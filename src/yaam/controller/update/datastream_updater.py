@@ -4,26 +4,32 @@ Datastreamed addons updater module
 from os import makedirs
 from pathlib import Path
 import shutil
-from typing import Dict
+from typing import TYPE_CHECKING, Dict, List
 from urllib.parse import urlparse
-from requests.models import Response
+from yaam.controller.update.installer import InstallerExecutor
 from yaam.controller.update.results import UpdateResult
 from yaam.utils.logger import static_logger as logger
+from yaam.utils.profiler import static_profiler as profiler
 from yaam.model.mutable.addon import Addon
-from yaam.utils import process
 from yaam.utils import response as responses
 
+if TYPE_CHECKING:
+    from requests.models import Response
+
 
 class DatastreamUpdater(object):
     '''
     Static datastream addon updater class
     '''
 
-    def __init__(self, code: UpdateResult = UpdateResult.NONE) -> None:
+    def __init__(self, code: UpdateResult = UpdateResult.NONE, installer: InstallerExecutor = None) -> None:
         self.__code = code
+        self.__installer = installer if installer is not None else InstallerExecutor()
         self.naming: Dict[str, str] = dict()
+        # files written by the update
+        self.installed: List[Path] = list()
 
-    def __fallback_addon_name(self, response: Response, addon: Addon) -> str:
+    def __fallback_addon_name(self, response: 'Response', addon: Addon) -> str:
         response_alias: str = None
 
         addon_suffix = ".dll" if addon.binding.is_dll() else ".exe"
@@ -43,7 +49,7 @@ class DatastreamUpdater(object):
 
         return response_alias
 
-    def update_from_datastream(self, response: Response, addon: Addon) -> UpdateResult:
+    def update_from_datastream(self, response: 'Response', addon: Addon) -> UpdateResult:
         '''
         Update addon from simple datastream
         '''
@@ -79,6 +85,10 @@ class DatastreamUpdater(object):
             with open(unpack_dir / unpack_alias, 'wb') as _:
                 _.write(response.content)
 
+            profiler().count("disk.bytes", len(response.content))
+
+            self.installed.append(unpack_dir / unpack_alias)
+
             # Add the rename map (given or generated) to addon metadata
             if can_add_alias and rename_enabled:
                 self.naming[response_alias] = unpack_alias
@@ -93,7 +103,7 @@ class DatastreamUpdater(object):
 
     ####################################################################################################################
 
-    def update_from_installer(self, response: Response, addon: Addon) -> UpdateResult:
+    def update_from_installer(self, response: 'Response', addon: Addon) -> UpdateResult:
         '''
         Update addon from installer datastream
         '''
@@ -111,17 +121,17 @@ class DatastreamUpdater(object):
             with open(installer_path, 'wb') as _:
                 _.write(response.content)
 
-            if "msi" in installer_path.suffix:
-                process.run_command(f"msiexec.exe /i {installer_path}", slack=0)
-            else:
-                process.run(installer_path, installer_dir, slack=0)
+            profiler().count("disk.bytes", len(response.content))
 
-            shutil.rmtree(installer_dir)
+            install_code = self.__installer.install(installer_path, installer_dir, addon)
+
+            # a killed installer might still hold some files
+            shutil.rmtree(installer_dir, ignore_errors=install_code.is_failure)
 
         except IOError as ex:
             logger().error(ex)
             ret_code = ret_code.error()
         else:
-            ret_code = ret_code.complete()
+            ret_code = install_code if install_code.is_failure else ret_code.complete()
 
         return ret_code
@@ -0,0 +1,72 @@
+'''
+Addon installers execution module
+'''
+
+import threading
+from pathlib import Path
+from subprocess import TimeoutExpired
+from yaam.controller.update.results import UpdateResult
+from yaam.model.mutable.addon import Addon
+from yaam.utils import process
+from yaam.utils.logger import static_logger as logger
+from yaam.utils.profiler import static_profiler as profiler
+
+# msiexec exit codes
+# https://learn.microsoft.com/en-us/windows/win32/msi/error-codes
+MSI_SUCCESS_REBOOT_INITIATED = 1641
+MSI_SUCCESS_REBOOT_REQUIRED = 3010
+
+
+class InstallerExecutor(object):
+    '''
+    Addon installers executor
+
+    Installers run with a timeout, after which they are killed, and their
+    exit codes are mapped to update results. Installers of different addons
+    can run concurrently, except for .msi packages since Windows Installer
+    allows a single installation at a time.
+    '''
+
+    def __init__(self, timeout: float = 600.0) -> None:
+        self.__timeout = timeout if timeout is not None and timeout > 0 else None
+        self.__msi_lock = threading.Lock()
+
+    @property
+    def timeout(self) -> float:
+        '''
+        Return the seconds an installer is allowed to run, if limited
+        '''
+        return self.__timeout
+
+    def install(self, installer_path: Path, workspace: Path, addon: Addon) -> UpdateResult:
+        '''
+        Run the given installer and return the relative update result:
+        NONE if successful, INSTALLER_FAILED or INSTALLER_TIMEOUT otherwise.
+        '''
+        if installer_path is None or not installer_path.is_file():
+            logger().error(msg=f"No installer found for {addon.base.name}.")
+            return UpdateResult.INSTALLER_FAILED
+
+        try:
+            with profiler().span("installer", addon=addon.base.name):
+                if "msi" in installer_path.suffix:
+                    with self.__msi_lock:
+                        exit_code = process.run_command(
+                            f"msiexec.exe /i \"{installer_path}\"", slack=0, timeout=self.__timeout
+                        ).returncode
+                else:
+                    exit_code = process.run(installer_path, workspace, slack=0, timeout=self.__timeout)
+        except TimeoutExpired:
+            logger().error(msg=f"{addon.base.name} installer has been killed after {self.__timeout} seconds.")
+            return UpdateResult.INSTALLER_TIMEOUT
+        except OSError as ex:
+            logger().error(msg=f"Cannot run {addon.base.name} installer: {ex}")
+            return UpdateResult.INSTALLER_FAILED
+
+        if exit_code in [MSI_SUCCESS_REBOOT_INITIATED, MSI_SUCCESS_REBOOT_REQUIRED]:
+            logger().warning(msg=f"{addon.base.name} installation requires a reboot.")
+        elif exit_code != 0:
+            logger().error(msg=f"{addon.base.name} installer exited with code {exit_code}.")
+            return UpdateResult.INSTALLER_FAILED
+
+        return UpdateResult.NONE
@@ -35,6 +35,23 @@ class UpdateResult(IntEnum):
     DOWNLOAD_FAILED = auto()
     EMPTY_CONTENT = auto()
     INVALID_ZIP = auto()
+    FILE_LOCKED = auto()
+    NO_ASSET = auto()
+    DEPENDENCY_FAILED = auto()
+    INSTALLER_FAILED = auto()
+    INSTALLER_TIMEOUT = auto()
+
+    @property
+    def is_failure(self) -> bool:
+        '''
+        Return whether the addon couldn't be installed or updated
+        '''
+        return self in [
+            UpdateResult.CREATE_FAILED, UpdateResult.UPDATE_FAILED, UpdateResult.UNPACKING_FAILED,
+            UpdateResult.HTTP_REQUEST_FAILED, UpdateResult.DOWNLOAD_FAILED, UpdateResult.EMPTY_CONTENT,
+            UpdateResult.INVALID_ZIP, UpdateResult.FILE_LOCKED, UpdateResult.NO_ASSET, UpdateResult.DEPENDENCY_FAILED,
+            UpdateResult.INSTALLER_FAILED, UpdateResult.INSTALLER_TIMEOUT
+        ]
 
     def complete(self):
         '''
@@ -78,6 +95,8 @@ class UpdateResult(IntEnum):
             logger().error(msg=f"Received empty content from {addon.base.uri}. Updates check will be skipped.")
         elif self is UpdateResult.NO_METADATA:
             logger().error(msg="Local or remote metadata are missing. Updates check will be skipped.")
+        elif self is UpdateResult.NO_ASSET:
+            logger().error(msg=f"No release asset of {addon.base.name} has been selected. Updates check will be skipped.")
 
     def log_update(self, addon: Addon):
         '''
@@ -103,3 +122,11 @@ class UpdateResult(IntEnum):
             logger().info(msg=f"Unpacked {addon.base.name} updates to ({addon.binding.workspace}).")
         elif self is UpdateResult.UNPACKING_FAILED:
             logger().error(msg=f"Failed to unpack {addon.base.name} updates to ({addon.binding.workspace}).")
+        elif self is UpdateResult.FILE_LOCKED:
+            logger().error(msg=f"Failed to update {addon.base.name}({filename}): the file is in use.")
+        elif self is UpdateResult.DEPENDENCY_FAILED:
+            logger().error(msg=f"Skipped {addon.base.name}({filename}) update: a dependency failed to update.")
+        elif self is UpdateResult.INSTALLER_FAILED:
+            logger().error(msg=f"Failed to install {addon.base.name}: the installer failed.")
+        elif self is UpdateResult.INSTALLER_TIMEOUT:
+            logger().error(msg=f"Failed to install {addon.base.name}: the installer timed out.")
@@ -0,0 +1,273 @@
+'''
+Background addon update scheduler module
+'''
+
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Set, Tuple
+from yaam.controller.manage import AddonManager
+from yaam.controller.update.results import UpdateResult
+from yaam.model.mutable.addon import Addon
+from yaam.model.type.binding import BindingType
+from yaam.utils.logger import static_logger as logger
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+
+def is_locked(path: Path) -> bool:
+    '''
+    Return whether the given file exists and can't be opened for writing
+    (e.g.: a running executable on Windows)
+    '''
+    try:
+        with open(path, 'r+b'):
+            return False
+    except (FileNotFoundError, IsADirectoryError):
+        return False
+    except OSError:
+        return True
+
+
+def dependency_graph(addons: Iterable[Addon]) -> Dict[str, List[str]]:
+    '''
+    Return the dependencies of each addon among the given ones
+    '''
+    names = set(_.base.name for _ in addons)
+    return dict(
+        (_.base.name, [dep for dep in _.base.dependencies if dep in names])
+        for _ in addons
+    )
+
+
+def find_cycles(graph: Dict[str, List[str]]) -> List[List[str]]:
+    '''
+    Return the dependency cycles of the graph (Tarjan's strongly connected components)
+    '''
+    index: Dict[str, int] = dict()
+    lowlink: Dict[str, int] = dict()
+    stack: List[str] = list()
+    on_stack: Set[str] = set()
+    cycles: List[List[str]] = list()
+
+    def connect(node: str):
+        index[node] = lowlink[node] = len(index)
+        stack.append(node)
+        on_stack.add(node)
+
+        for dep in graph.get(node, []):
+            if dep not in index:
+                connect(dep)
+                lowlink[node] = min(lowlink[node], lowlink[dep])
+            elif dep in on_stack:
+                lowlink[node] = min(lowlink[node], index[dep])
+
+        if lowlink[node] == index[node]:
+            component = list()
+            while True:
+                _ = stack.pop()
+                on_stack.discard(_)
+                component.append(_)
+                if _ == node:
+                    break
+
+            if len(component) > 1 or node in graph.get(node, []):
+                cycles.append(list(reversed(component)))
+
+    for node in graph:
+        if node not in index:
+            connect(node)
+
+    return cycles
+
+
+class UpdateScheduler(object):
+    '''
+    Addon update scheduler
+
+    Updates the addons concurrently, each one after its dependencies.
+    Dependents of an addon whose update failed are not updated at all.
+
+    Also splits the addons in those that must be updated before launching the game
+    and those that can be safely updated once the game has been launched,
+    since the game doesn't load them:
+    - enabled .exe companions (launched only after their update)
+    - enabled libraries of a binding different from the active one
+    '''
+
+    def __init__(self, manager: AddonManager, binding_type: BindingType, force_updates: bool = False,
+                 workers: int = 4, lock_timeout: float = 30.0, lock_interval: float = 1.0) -> None:
+        self.__manager = manager
+        self.__binding_type = binding_type
+        self.__force_updates = force_updates
+        self.__workers = workers
+        self.__lock_timeout = lock_timeout
+        self.__lock_interval = lock_interval
+        self.__workspace_locks: Dict[str, threading.Lock] = dict()
+
+    def is_deferrable(self, addon: Addon) -> bool:
+        '''
+        Return whether the addon can be updated after the game launch
+        '''
+        if not addon.binding.is_enabled:
+            return False
+
+        if addon.binding.is_exe():
+            return True
+
+        return addon.binding.typing.is_library() and addon.binding.typing not in [
+            BindingType.AGNOSTIC, self.__binding_type
+        ]
+
+    def partition(self, addons: Iterable[Addon]) -> Tuple[List[Addon], List[Addon]]:
+        '''
+        Split the addons in (blocking, deferred) updates.
+        Deferrable addons any blocking addon (transitively) depends on remain blocking.
+        '''
+        blocking: List[Addon] = list()
+        deferred: List[Addon] = list()
+
+        for _ in addons:
+            (deferred if self.is_deferrable(_) else blocking).append(_)
+
+        required = set(dep for _ in blocking for dep in _.base.dependencies)
+
+        # the dependencies of required addons are required as well
+        while True:
+            grown = required.union(dep for _ in deferred if _.base.name in required for dep in _.base.dependencies)
+            if len(grown) == len(required):
+                break
+            required = grown
+
+        blocking.extend(_ for _ in deferred if _.base.name in required)
+        deferred = [_ for _ in deferred if _.base.name not in required]
+
+        return (blocking, deferred)
+
+    def __wait_unlocked(self, addon: Addon) -> bool:
+        '''
+        Wait until the addon file can be written, up to the lock timeout
+        '''
+        if addon.binding.is_headless:
+            return True
+
+        deadline = time.monotonic() + self.__lock_timeout
+        while is_locked(addon.binding.path):
+            if time.monotonic() >= deadline:
+                return False
+            logger().debug(msg=f"{addon.binding.path.name} is in use, retrying in {self.__lock_interval} seconds...")
+            time.sleep(self.__lock_interval)
+
+        return True
+
+    def __update(self, addon: Addon) -> UpdateResult:
+        # downloads don't touch the workspace and can run concurrently
+        self.__manager.fetch_addon_update(addon, self.__force_updates)
+
+        # updates unpacking in the same workspace must not overlap
+        with self.__workspace_locks[str(addon.binding.workspace)]:
+            if not self.__wait_unlocked(addon):
+                ret = UpdateResult.FILE_LOCKED
+                ret.log_update(addon)
+                return ret
+
+            return self.__manager.update_addon(addon, self.__force_updates)
+
+    def run(self, addons: Iterable[Addon], failed: Iterable[str] = None) -> Iterator[Tuple[Addon, UpdateResult]]:
+        '''
+        Update the given enabled addons concurrently in dependency order
+        and yield each (addon, result) as soon as it completes.
+        Addons depending on the failed ones (e.g. by a previous run) are not updated.
+        '''
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+        addons = [_ for _ in addons if _.binding.is_enabled]
+
+        if len(addons) == 0:
+            return
+
+        for _ in addons:
+            self.__workspace_locks.setdefault(str(_.binding.workspace), threading.Lock())
+
+        graph = dependency_graph(addons)
+
+        for cycle in find_cycles(graph):
+            logger().warning(msg=f"Dependency cycle detected: {' -> '.join(cycle + cycle[:1])}. Updates will follow the addons order.")
+
+        by_name: Dict[str, Addon] = dict((_.base.name, _) for _ in addons)
+        pending: Dict[str, Set[str]] = dict((name, set(deps)) for (name, deps) in graph.items())
+        dependents: Dict[str, List[str]] = defaultdict(list)
+        for (name, deps) in graph.items():
+            for dep in deps:
+                dependents[dep].append(name)
+
+        failed = set(failed) if failed is not None else set()
+        for addon in addons:
+            if addon.base.name in pending and not failed.isdisjoint(addon.base.dependencies):
+                pending.pop(addon.base.name)
+                for name in [addon.base.name] + self.__cancel_dependents(addon.base.name, pending, dependents):
+                    cancelled = UpdateResult.DEPENDENCY_FAILED
+                    cancelled.log_update(by_name[name])
+                    yield (by_name[name], cancelled)
+
+        logger().info(msg=f"Updating {len(pending)} addons...")
+
+        with ThreadPoolExecutor(max_workers=self.__workers, thread_name_prefix="yaam-update") as executor:
+            running: Dict['Future', Addon] = dict()
+
+            def submit_ready():
+                ready = [_ for _ in pending if len(pending[_]) == 0]
+
+                if len(ready) == 0 and len(running) == 0 and len(pending) > 0:
+                    # only cycles are left, break them in the addons order
+                    ready = [next(iter(pending))]
+
+                for _ in ready:
+                    pending.pop(_)
+                    running[executor.submit(self.__update, by_name[_])] = by_name[_]
+
+            submit_ready()
+
+            while len(running) > 0:
+                (done, _) = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    addon = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as ex:  # pylint: disable=W0703
+                        logger().error(msg=f"Update of {addon.base.name} failed: {ex}")
+                        result = UpdateResult.UPDATE_FAILED
+
+                    yield (addon, result)
+
+                    if result.is_failure:
+                        for name in self.__cancel_dependents(addon.base.name, pending, dependents):
+                            cancelled = UpdateResult.DEPENDENCY_FAILED
+                            cancelled.log_update(by_name[name])
+                            yield (by_name[name], cancelled)
+                    else:
+                        for name in dependents[addon.base.name]:
+                            if name in pending:
+                                pending[name].discard(addon.base.name)
+
+                submit_ready()
+
+    @staticmethod
+    def __cancel_dependents(name: str, pending: Dict[str, Set[str]], dependents: Dict[str, List[str]]) -> List[str]:
+        '''
+        Remove the pending dependents of the given addon, transitively, and return their names
+        '''
+        cancelled: List[str] = list()
+
+        stack = list(dependents[name])
+        while len(stack) > 0:
+            _ = stack.pop()
+            if _ in pending:
+                pending.pop(_)
+                cancelled.append(_)
+                stack.extend(dependents[_])
+
+        return cancelled
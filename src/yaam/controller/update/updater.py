@@ -2,30 +2,36 @@
 GW2SL update utility module
 '''
 
-from typing import Dict, Iterable, Union
-from requests import Response as UpdatePacket
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple, Union
+from yaam.controller.download import SegmentedDownloader
 from yaam.controller.http import HttpRequestManager
 from yaam.controller.metadata import MetadataCollector
 from yaam.controller.update.datastream_updater import DatastreamUpdater
+from yaam.controller.update.installer import InstallerExecutor
 from yaam.controller.update.results import UpdateResult
 from yaam.controller.update.zip_updater import ZipUpdater
 from yaam.model.mutable.addon import Addon
 from yaam.model.mutable.metadata import AddonMetadata
-from yaam.utils.detetimeutils import compare_timestamp_str
-from yaam.utils.exceptions import GitHubException
+from yaam.utils.detetimeutils import compare_epoch
+from yaam.utils.exceptions import AssetException, GitHubException
 from yaam.utils.hashing import Hasher
 from yaam.utils.logger import static_logger as logger
+from yaam.utils.profiler import static_profiler as profiler
 import yaam.utils.response as responses
 from yaam.utils.uri import URI
 from yaam.utils.webasset import Release, assets_followup
 
+if TYPE_CHECKING:
+    from requests import Response as UpdatePacket
+
 
 class AddonUpdateData(object):
     '''
     Addon update data class
     '''
 
-    def __init__(self, addon_name: str = "", status: UpdateResult = UpdateResult.NONE, http_response: UpdatePacket = None) -> None:
+    def __init__(self, addon_name: str = "", status: UpdateResult = UpdateResult.NONE, http_response: 'UpdatePacket' = None) -> None:
         self.addon_name = addon_name
         self.status = status
         self.http_response = http_response
@@ -36,8 +42,13 @@ class AddonUpdater(object):
     Addon updater class
     '''
 
-    def __init__(self, http: HttpRequestManager) -> None:
+    def __init__(self, http: HttpRequestManager, interactive: bool = True, installer: InstallerExecutor = None,
+                 hasher: Hasher = Hasher.fastest(), downloader: SegmentedDownloader = None) -> None:
         self.__http = http
+        self.__downloader = downloader if downloader is not None else SegmentedDownloader(http, segments=1)
+        self.__hasher = hasher
+        self.__interactive = interactive
+        self.__installer = installer if installer is not None else InstallerExecutor()
 
         self.__addons_updates_preloaded: bool = False
         self.__cached_addons_updates: Dict[str, AddonUpdateData] = dict()
@@ -45,32 +56,47 @@ class AddonUpdater(object):
         super().__init__()
 
     def preload_addons_updates(self, addons: Iterable[Addon], metadata_collector: MetadataCollector,
-                               force_update: bool = False, **kwargs) -> None:
+                               force_update: bool = False, keep_cached: bool = False, **kwargs) -> None:
         '''
-        Preload update data for the given addon collection
+        Preload update data for the given addon collection.
+        If keep_cached is set, the update data already cached for any addon is kept and not fetched again.
         '''
 
-        self.unload_addons_updates()
+        if not keep_cached:
+            self.unload_addons_updates()
 
         for _ in addons:
+            if keep_cached and _.base.name in self.__cached_addons_updates:
+                continue
 
-            update_data = AddonUpdateData(_.base.name)
+            self.preload_addon_update(_, metadata_collector, force_update, **kwargs)
 
-            if not _.base.uri.is_valid():
-                logger().info(msg=f"No valid update URL provided for {_.base.name}({_.binding.path.name}).")
-                update_data.status = UpdateResult.INVALID_URL
-            elif not _.binding.path.exists() or _.binding.is_updateable:
+        self.__addons_updates_preloaded = True
 
-                if force_update or (_.binding.is_enabled and _.binding.is_updateable):
-                    update_data = self.__fetch_addon_updates(_, metadata_collector, force_update, **kwargs)
+    def preload_addon_update(self, addon: Addon, metadata_collector: MetadataCollector,
+                             force_update: bool = False, **kwargs) -> AddonUpdateData:
+        '''
+        Preload and cache update data for the given addon, leaving any other cached update data untouched
+        '''
 
-            else:
-                update_data.status = UpdateResult.NO_UPDATE
-                logger().info(msg=f"Skipping {_.base.name} updates checks.")
+        update_data = AddonUpdateData(addon.base.name)
 
-            self.__cached_addons_updates[_.base.name] = update_data
+        if not addon.base.uri.is_valid():
+            logger().info(msg=f"No valid update URL provided for {addon.base.name}({addon.binding.path.name}).")
+            update_data.status = UpdateResult.INVALID_URL
+        elif not addon.binding.path.exists() or addon.binding.is_updateable:
 
-        self.__addons_updates_preloaded = True
+            if force_update or (addon.binding.is_enabled and addon.binding.is_updateable):
+                with profiler().span("preload.addon", addon=addon.base.name):
+                    update_data = self.__fetch_addon_updates(addon, metadata_collector, force_update, **kwargs)
+
+        else:
+            update_data.status = UpdateResult.NO_UPDATE
+            logger().info(msg=f"Skipping {addon.base.name} updates checks.")
+
+        self.__cached_addons_updates[addon.base.name] = update_data
+
+        return update_data
 
     def __fetch_addon_updates(self, addon: Addon, metadata_collector: MetadataCollector, force_update: bool, **kwargs) -> AddonUpdateData:
         '''
@@ -88,6 +114,9 @@ class AddonUpdater(object):
             udpate_data.status = UpdateResult.NO_METADATA
         else:
 
+            # the previously chosen asset is remembered until a new one is chosen
+            remote_metadata.asset = local_metadata.asset
+
             release: Union[Release, URI] = None
             # latest_pre_release: Union[Release, URI] = None
 
@@ -95,7 +124,7 @@ class AddonUpdater(object):
             logger().debug(msg=f"Assets data uri is {addon.base.uri}.")
 
             try:
-                releases = self.__http.get_downloadable_assets(addon.base.uri, **kwargs)
+                releases = self.__http.get_downloadable_assets(addon.base.route, **kwargs)
 
                 releases = list(filter(lambda x: isinstance(x, URI) or not x.is_draft, releases))
 
@@ -133,7 +162,7 @@ class AddonUpdater(object):
 
                 # ETAG is apparently inconsistent for latest release in github api
                 # so the check is currently only done by means of the <last-modified> HTTP header tag
-                if compare_timestamp_str(remote_metadata.last_modified, local_metadata.last_modified) > 0:
+                if compare_epoch(remote_metadata.timestamp, local_metadata.timestamp) > 0:
 
                     udpate_data.status = UpdateResult.TO_UPDATE
 
@@ -149,19 +178,33 @@ class AddonUpdater(object):
                 try:
 
                     assets_download_uri: URI = None
+                    (asset_size, asset_digest) = (None, None)
 
                     if isinstance(release, Release):
-                        assets_download_uri = assets_followup(release.assets)
+                        asset = assets_followup(
+                            release.assets, addon.base.asset_rules, local_metadata.asset, self.__interactive,
+                            addon.base.name
+                        )
+                        assets_download_uri = asset.download_url
+                        (asset_size, asset_digest) = (asset.size, asset.digest)
+                        remote_metadata.asset = asset.name
                     elif isinstance(release, URI):
                         assets_download_uri = release
 
                     if assets_download_uri is not None:
-                        udpate_data.http_response = self.__http.get(assets_download_uri, **kwargs)
+                        udpate_data.http_response = self.__downloader.get(
+                            assets_download_uri, asset_size, asset_digest, **kwargs
+                        )
 
                 except GitHubException as ghex:
                     logger().error(msg=str(ghex))
+                except AssetException as aex:
+                    logger().error(msg=str(aex))
+                    udpate_data.status = UpdateResult.NO_ASSET
 
-                if udpate_data.http_response is not None and len(udpate_data.http_response.content) > 0:
+                if udpate_data.status is UpdateResult.NO_ASSET:
+                    pass
+                elif udpate_data.http_response is not None and len(udpate_data.http_response.content) > 0:
 
                     logger().debug(msg=f"Downloaded {addon.base.name} from {addon.base.uri}.")
 
@@ -169,15 +212,26 @@ class AddonUpdater(object):
 
                     # Compute and store the update content hash signature in order to
                     # check it against the local signature as to not update needessly
-                    # since remote timestamp might be absent sometimes
-                    remote_metadata.hash_signature = Hasher.SHA256.make_hash_from_bytes(udpate_data.http_response.content)
+                    # since remote timestamp might be absent sometimes.
+                    # The local signature algorithm is used if possible, as to compare the signatures
+                    hasher = local_metadata.hash_algorithm
+                    if len(local_metadata.hash_signature) == 0 or not hasher.is_available:
+                        hasher = self.__hasher
+
+                    remote_metadata.hash_signature = hasher.make_hash_from_bytes(udpate_data.http_response.content)
+                    remote_metadata.hash_algorithm = hasher
 
-                    logger().debug(msg=f"Local signature {local_metadata.hash_signature}.")
-                    logger().debug(msg=f"Remote signature {remote_metadata.hash_signature}.")
+                    logger().debug(msg=f"Local signature {local_metadata.hash_algorithm.signature}:{local_metadata.hash_signature}.")
+                    logger().debug(msg=f"Remote signature {remote_metadata.hash_algorithm.signature}:{remote_metadata.hash_signature}.")
 
-                    if remote_metadata.hash_signature != local_metadata.hash_signature:
+                    if not remote_metadata.has_same_signature(local_metadata):
                         udpate_data.status = UpdateResult.TO_UPDATE
                         logger().debug(msg="Local and remote signatures are different. An update is required.")
+
+                        # the updated addon is signed with the preferred algorithm from now on
+                        if hasher != self.__hasher:
+                            remote_metadata.hash_signature = self.__hasher.make_hash_from_bytes(udpate_data.http_response.content)
+                            remote_metadata.hash_algorithm = self.__hasher
                     else:
                         udpate_data.status = UpdateResult.UP_TO_DATE
                         logger().debug(msg="Local and remote signatures match.")
@@ -191,6 +245,18 @@ class AddonUpdater(object):
 
         return udpate_data
 
+    def get_addon_update(self, addon: Addon) -> AddonUpdateData:
+        '''
+        Return the cached update data of the given addon, if any
+        '''
+        return self.__cached_addons_updates.get(addon.base.name, None)
+
+    def cache_addon_update(self, addon: Addon, update_data: AddonUpdateData):
+        '''
+        Cache update data fetched elsewhere (e.g.: by the daemon) for the given addon
+        '''
+        self.__cached_addons_updates[addon.base.name] = update_data
+
     def unload_addons_updates(self):
         '''
         Unload cached addon updates
@@ -198,9 +264,10 @@ class AddonUpdater(object):
         self.__addons_updates_preloaded = False
         self.__cached_addons_updates.clear()
 
-    def update_addons(self, addons: Iterable[Addon], metadata_collector: MetadataCollector, force_update: bool = False, **kwargs):
+    def update_addons(self, addons: Iterable[Addon], metadata_collector: MetadataCollector,
+                      force_update: bool = False, **kwargs) -> Dict[str, UpdateResult]:
         '''
-        Updates the provided addons
+        Updates the provided addons and return the update result of each enabled addon
 
         @addons: list -- list of addons to updated
         '''
@@ -208,12 +275,17 @@ class AddonUpdater(object):
         if not self.__addons_updates_preloaded:
             self.preload_addons_updates(addons, metadata_collector, force_update, **kwargs)
 
+        results: Dict[str, UpdateResult] = dict()
+
         for _ in addons:
             # Currently disabled addons can't be updated...
             if _.binding.is_enabled:
-                self.update_addon(_, metadata_collector, force_update)
+                with profiler().span("update.addon", addon=_.base.name):
+                    results[_.base.name] = self.update_addon(_, metadata_collector, force_update)
+
+        return results
 
-    def update_addon(self, addon: Addon, metadata_collector: MetadataCollector, force: bool = False):
+    def update_addon(self, addon: Addon, metadata_collector: MetadataCollector, force: bool = False) -> UpdateResult:
         '''
         Update the provided addon if possible
 
@@ -236,10 +308,14 @@ class AddonUpdater(object):
 
                     ret_code.log_update(addon)
 
-                    ret_code = self.__update_addon(addon, remote, update.http_response, ret_code)
+                    (ret_code, installed) = self.__update_addon(addon, remote, update.http_response, ret_code)
 
                     ret_code.log_update(addon)
 
+                    # installers don't tell which files they write
+                    if ret_code in [UpdateResult.INSTALLED, UpdateResult.UPDATED] and not addon.base.is_installer:
+                        metadata_collector.installed_files.record(addon, installed)
+
                 # local metadata must be updated if:
                 # - an addon has been created or updated
                 # - addon metadatas don't match (e.g.: date) but the addon signatures do
@@ -247,26 +323,32 @@ class AddonUpdater(object):
                     if remote != local:
                         metadata_collector.save_metadata(remote, local.uri)
 
-            elif ret_code in [UpdateResult.TO_INSTALL, UpdateResult.TO_UPDATE]:
+            elif update is not None and update.status.is_failure:
+                # failed downloads must be reported to the dependents
+                ret_code = update.status
+            elif update is not None and update.status in [UpdateResult.TO_INSTALL, UpdateResult.TO_UPDATE]:
                 logger().debug("Empty update data. Skipping update.")
 
         return ret_code
 
-    def __update_addon(self, addon: Addon, metadata: AddonMetadata, update_data: UpdatePacket, update_code: UpdateResult) -> UpdateResult:
+    def __update_addon(self, addon: Addon, metadata: AddonMetadata, update_data: 'UpdatePacket',
+                       update_code: UpdateResult) -> Tuple[UpdateResult, List[Path]]:
         '''
-        Update the provided addon if possible
+        Update the provided addon if possible and return the update result with the written files
         '''
 
         if responses.is_zip_content(update_data):
-            zip_updater = ZipUpdater(update_code)
+            zip_updater = ZipUpdater(update_code, self.__installer)
             update_code = zip_updater.update_from_zip(update_data, addon)
             metadata.namings[addon.binding.typing] = zip_updater.naming
+            installed = zip_updater.installed
         else:
-            data_stream_updater = DatastreamUpdater(update_code)
+            data_stream_updater = DatastreamUpdater(update_code, self.__installer)
             if addon.base.is_installer:
                 update_code = data_stream_updater.update_from_installer(update_data, addon)
             else:
                 update_code = data_stream_updater.update_from_datastream(update_data, addon)
             metadata.namings[addon.binding.typing] = data_stream_updater.naming
+            installed = data_stream_updater.installed
 
-        return update_code
+        return (update_code, installed)
@@ -4,25 +4,31 @@ Zipped addons updater module
 from os import makedirs, walk
 from pathlib import Path
 import shutil
-from typing import Dict
+from typing import TYPE_CHECKING, Dict, List
 from zipfile import BadZipfile, ZipFile
-from requests import Response
+from yaam.controller.update.installer import InstallerExecutor
 from yaam.controller.update.results import UpdateResult
 from yaam.utils.logger import static_logger as logger
+from yaam.utils.profiler import static_profiler as profiler
 from yaam.model.mutable.addon import Addon
-from yaam.utils import process
 import yaam.utils.response as responses
 import yaam.utils.zip as zip_helper
 
+if TYPE_CHECKING:
+    from requests import Response
+
 
 class ZipUpdater(object):
     '''
     Static zipped addons updater class
     '''
 
-    def __init__(self, code: UpdateResult = UpdateResult.NONE) -> None:
+    def __init__(self, code: UpdateResult = UpdateResult.NONE, installer: InstallerExecutor = None) -> None:
         self.__code = code
+        self.__installer = installer if installer is not None else InstallerExecutor()
         self.naming: Dict[str, str] = dict()
+        # files written by the update
+        self.installed: List[Path] = list()
 
     def __unpack_zip(self, content: ZipFile, unpack_dir: Path, addon: Addon) -> UpdateResult:
 
@@ -43,6 +49,7 @@ class ZipUpdater(object):
         for item in content.filelist:
 
             extraction_path = Path(content.extract(item, tmp_unpack_dir))
+            profiler().count("disk.bytes", item.file_size)
 
             is_single_root_folder_item = is_single_root_folder and root_dirs[0].rfind(extraction_path.parent.name) > -1
             is_root_item = item.filename in root_items or is_single_root_folder_item
@@ -106,6 +113,8 @@ class ZipUpdater(object):
             if n_files == 0:
                 shutil.rmtree(tmp_unpack_dir / root_dirs[0])
 
+        self.installed = [unpack_dir / _.relative_to(tmp_unpack_dir) for _ in tmp_unpack_dir.rglob("*") if _.is_file()]
+
         shutil.copytree(tmp_unpack_dir, unpack_dir, dirs_exist_ok=True)
         shutil.rmtree(tmp_unpack_dir)
 
@@ -142,6 +151,7 @@ class ZipUpdater(object):
         makedirs(unpack_dir, exist_ok=True)
 
         content.extractall(unpack_dir)
+        profiler().count("disk.bytes", sum(_.file_size for _ in content.filelist))
 
         logger().debug(msg=f"Unpacked {addon.base.name} installer to {unpack_dir}.")
 
@@ -151,18 +161,17 @@ class ZipUpdater(object):
 
         installer_path = self.__find_installer(content_lookup_dir)
 
-        if "msi" in installer_path.suffix:
-            process.run_command(f"msiexec.exe /i {installer_path}", slack=0)
-        else:
-            process.run(installer_path, unpack_dir, slack=0)
+        ret_code = self.__installer.install(installer_path, unpack_dir, addon)
 
-        shutil.rmtree(unpack_dir)
+        # a killed installer might still hold some files
+        shutil.rmtree(unpack_dir, ignore_errors=ret_code.is_failure)
 
-        ret_code = UpdateResult.UNPACKED
+        if not ret_code.is_failure:
+            ret_code = UpdateResult.UNPACKED
 
         return ret_code
 
-    def update_from_zip(self, response: Response, addon: Addon) -> UpdateResult:
+    def update_from_zip(self, response: 'Response', addon: Addon) -> UpdateResult:
         '''
         Updated a zipped addon package
         '''
@@ -182,9 +191,9 @@ class ZipUpdater(object):
             makedirs(unpack_dir, exist_ok=True)
 
             if addon.base.is_installer:
-                self.__unpack_installer_zip(zip_content, unpack_dir / "installer", addon)
+                unpack_code = self.__unpack_installer_zip(zip_content, unpack_dir / "installer", addon)
             else:
-                self.__unpack_zip(zip_content, unpack_dir, addon)
+                unpack_code = self.__unpack_zip(zip_content, unpack_dir, addon)
 
         except IOError as ex:
             logger().error(msg=str(ex))
@@ -193,6 +202,6 @@ class ZipUpdater(object):
             logger().error(msg=str(ex))
             ret_code = UpdateResult.INVALID_ZIP
         else:
-            ret_code = ret_code.complete()
+            ret_code = unpack_code if unpack_code.is_failure else ret_code.complete()
 
         return ret_code
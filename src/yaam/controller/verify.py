@@ -0,0 +1,208 @@
+'''
+Installed addons integrity verification module
+'''
+
+import os
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple
+from yaam.controller.fileindex import InstalledFile, InstalledFileIndex, file_key
+from yaam.model.mutable.addon import Addon
+from yaam.utils.hashing import Hasher
+from yaam.utils.logger import static_logger as logger
+from yaam.utils.profiler import static_profiler as profiler
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+
+def scan_tree(root: Path) -> List[str]:
+    '''
+    Return the paths of the regular files under the given directory, walked with os.scandir
+    '''
+    files: List[str] = list()
+    stack = [str(root)]
+
+    while len(stack) > 0:
+        try:
+            with os.scandir(stack.pop()) as iterator:
+                for entry in iterator:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file():
+                            files.append(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            # unreadable directories are empty
+            continue
+
+    return files
+
+
+class VerifyStatus(Enum):
+    '''
+    Integrity status of an installed file or addon, from best to worst
+    '''
+    OK = 0
+    UNTRACKED = 1
+    MODIFIED = 2
+    MISSING = 3
+
+
+@dataclass(frozen=True)
+class FileVerification(object):
+    '''
+    Integrity check of a single installed file
+    '''
+    file: InstalledFile = field(default_factory=InstalledFile)
+    status: VerifyStatus = field(default=VerifyStatus.OK)
+    digest: str = field(default_factory=str)
+    # whether the file had to be hashed, since its size or modification time changed
+    hashed: bool = field(default=False)
+
+
+@dataclass(frozen=True)
+class AddonVerification(object):
+    '''
+    Integrity check of the files written by an addon
+    '''
+    addon: Addon = field(default=None)
+    files: List[FileVerification] = field(default_factory=list)
+    # Merkle roots of the recorded and current directory tree of headless addons
+    recorded_tree_hash: str = field(default_factory=str)
+    tree_hash: str = field(default_factory=str)
+
+    @property
+    def status(self) -> VerifyStatus:
+        '''
+        Return the worst status among the addon files
+        '''
+        if len(self.files) == 0:
+            return VerifyStatus.UNTRACKED
+
+        return max((_.status for _ in self.files), key=lambda x: x.value)
+
+    @property
+    def is_intact(self) -> bool:
+        '''
+        Return whether none of the recorded files has been modified or removed
+        '''
+        return self.status in (VerifyStatus.OK, VerifyStatus.UNTRACKED)
+
+    def to_table(self) -> dict:
+        '''
+        Return a printable dict repr of the verification
+        '''
+        return {
+            'name': self.addon.base.name,
+            'binding': self.addon.binding.typing.name.lower(),
+            'status': self.status.name.lower(),
+            'files': len(self.files),
+            'hashed': sum(1 for _ in self.files if _.hashed),
+            'tree': self.tree_hash[:12]
+        }
+
+
+class IntegrityVerifier(object):
+    '''
+    Verify the files written by the addons updates against the installed files index
+
+    Files whose size and modification time match the recorded ones are trusted,
+    the others are hashed concurrently. The directory tree hashes of headless addons
+    cover their whole workspace: files not in the index are hashed with the given hasher.
+    '''
+
+    def __init__(self, index: InstalledFileIndex, workers: int = 4, hasher: Hasher = Hasher.SHA256) -> None:
+        self.__index = index
+        self.__workers = max(workers, 1)
+        self.__hasher = hasher
+
+    def __hash(self, file: InstalledFile) -> FileVerification:
+        # files are checked with the algorithm they have been recorded with
+        if not file.algorithm.is_available:
+            logger().warning(msg=f"Cannot verify {file.path}, {file.algorithm.signature} is not available.")
+            return FileVerification(file, VerifyStatus.UNTRACKED)
+
+        digest = file.algorithm.make_hash_from_file(file.path)
+        profiler().count("disk.bytes", file.path.stat().st_size)
+
+        status = VerifyStatus.OK if digest == file.digest else VerifyStatus.MODIFIED
+
+        return FileVerification(file, status, digest, True)
+
+    def verify(self, addons: Iterable[Addon]) -> List[AddonVerification]:
+        '''
+        Verify the installed files of the given enabled addons
+        '''
+        from concurrent.futures import Future, ThreadPoolExecutor
+
+        addons = [_ for _ in addons if _.binding.is_enabled]
+        recorded: Dict[Addon, List[InstalledFile]] = dict((_, self.__index.files(_)) for _ in addons)
+
+        checks: Dict[Addon, List['Future' or FileVerification]] = dict()
+        # files of the headless addons workspaces not written by their updates
+        unindexed: Dict[Addon, List[Tuple[str, 'Future']]] = dict()
+
+        with profiler().span("verify", addons=len(addons)):
+            with ThreadPoolExecutor(max_workers=self.__workers, thread_name_prefix="yaam-verify") as executor:
+                for (addon, files) in recorded.items():
+                    checks[addon] = list()
+                    for file in files:
+                        if not os.path.isfile(file.path):
+                            checks[addon].append(FileVerification(file, VerifyStatus.MISSING))
+                        elif file.is_untouched():
+                            checks[addon].append(FileVerification(file, VerifyStatus.OK, file.digest))
+                        else:
+                            checks[addon].append(executor.submit(self.__hash, file))
+
+                    if addon.binding.is_headless and len(files) > 0:
+                        known = set(_.key for _ in files)
+                        unindexed[addon] = [
+                            (path, executor.submit(self.__hasher.make_hash_from_file, Path(path)))
+                            for path in scan_tree(addon.binding.workspace) if file_key(path) not in known
+                        ]
+
+                results = [
+                    (addon, [_.result() if isinstance(_, Future) else _ for _ in addon_checks])
+                    for (addon, addon_checks) in checks.items()
+                ]
+                extra = dict(
+                    (addon, [(path, future.result()) for (path, future) in paths])
+                    for (addon, paths) in unindexed.items()
+                )
+
+        reports: List[AddonVerification] = list()
+
+        for (addon, files) in results:
+            (recorded_tree_hash, tree_hash) = (str(), str())
+
+            if addon.binding.is_headless and len(files) > 0:
+                workspace = addon.binding.workspace
+                recorded_tree_hash = self.__hasher.make_hash_from_tree(
+                    (os.path.relpath(_.file.path, workspace), _.file.digest) for _ in files
+                )
+                tree_hash = self.__hasher.make_hash_from_tree(
+                    [(os.path.relpath(_.file.path, workspace), _.digest) for _ in files if _.status is not VerifyStatus.MISSING]
+                    + [(os.path.relpath(path, workspace), digest) for (path, digest) in extra[addon]]
+                )
+
+                for (path, _) in extra[addon]:
+                    logger().debug(msg=f"{addon.base.name} file {path} has not been installed by its updates.")
+
+            report = AddonVerification(addon, files, recorded_tree_hash, tree_hash)
+
+            for _ in files:
+                if _.status is VerifyStatus.MISSING:
+                    logger().warning(msg=f"{addon.base.name} file {_.file.path} is missing.")
+                elif _.status is VerifyStatus.MODIFIED:
+                    logger().warning(msg=f"{addon.base.name} file {_.file.path} has been modified.")
+
+            if report.status is VerifyStatus.UNTRACKED:
+                logger().info(msg=f"No file of {addon.base.name} has been recorded yet, it will be after its next update.")
+
+            reports.append(report)
+
+        return reports
@@ -105,6 +105,13 @@ class AppContext(object):
         '''
         return self._yaam_dir
 
+    @property
+    def cache_dir(self) -> Path:
+        '''
+        Returns the yaam cache directory
+        '''
+        return self._cache_dir
+
     def init_file_path(self, game_name: str) -> Path:
         '''
         Return the path to the requested game init file
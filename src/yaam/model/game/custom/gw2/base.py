@@ -23,7 +23,7 @@ class GuildWars2(AbstractGame, IGameIncarnator):
 
     @staticmethod
     def incarnate(game_name: str = "Guild Wars 2", app_context: AppContext = None) -> IGame[AddonBase, Binding]:
-        gw2_config = GW2Config(app_context.appdata_dir)
+        gw2_config = GW2Config(app_context.appdata_dir, app_context.cache_dir)
 
         init_file_path = app_context.init_file_path(game_name)
 
@@ -2,11 +2,11 @@
 Guild Wars 2 model class
 '''
 from yaam.utils.path import Path, mkpath
-from bs4 import BeautifulSoup
 from yaam.utils.logger import static_logger as logger
 from yaam.utils.json.io import read_json
 from yaam.model.type.binding import BindingType
 from yaam.model.game.abstract.config import AbstractGameConfiguration
+from yaam.model.game.custom.gw2.gfxsettings import load_application_info
 
 #############################################################################################
 
@@ -16,7 +16,7 @@ class GW2Config(AbstractGameConfiguration):
     Guild Wars 2 model class
     '''
 
-    def __init__(self, appdata_dir: Path):
+    def __init__(self, appdata_dir: Path, cache_dir: Path = None):
 
         super().__init__(BindingType.D3D11)
 
@@ -24,6 +24,7 @@ class GW2Config(AbstractGameConfiguration):
         self._config_path = appdata_dir / self._name / "GFXSettings.Gw2-64.exe.xml"
         self._root = Path("C:\\Program Files\\Guild Wars 2")
         self._exe = "Gw2-64.exe"
+        self._cache_path = cache_dir / "gfxsettings.json" if cache_dir is not None else None
 
     @property
     def bin_directory(self) -> Path:
@@ -43,22 +44,21 @@ class GW2Config(AbstractGameConfiguration):
         logger().info(msg=f"Reading game path from {self.path}.")
 
         if self.path.exists():
-            with open(self.path, encoding="utf-8") as _:
 
-                gw2_config_xml = BeautifulSoup(_, features="xml")
-                if gw2_config_xml is not None:
-                    gw2_app_token = gw2_config_xml.find("GSA_SDK").find("APPLICATION")
+            app_info = load_application_info(self.path, self._cache_path)
 
-                    self._root = mkpath(gw2_app_token.find("INSTALLPATH")['Value'])
-                    self._exe = gw2_app_token.find("EXECUTABLE")['Value']
+            if app_info.is_complete:
 
-                    if self._root.exists():
-                        logger().info(msg=f"GW2 location is {self._root}.")
-                        load_ok = True
-                    else:
-                        logger().info(msg=f"{self._root} doesn't exists!")
+                self._root = mkpath(app_info.install_path)
+                self._exe = app_info.executable
+
+                if self._root.exists():
+                    logger().info(msg=f"GW2 location is {self._root}.")
+                    load_ok = True
                 else:
-                    logger().error(msg=f"Error opening {self.path}")
+                    logger().info(msg=f"{self._root} doesn't exists!")
+            else:
+                logger().error(msg=f"Error opening {self.path}")
 
         else:
             logger().error(msg=f"{self.path} doesn't exists!")
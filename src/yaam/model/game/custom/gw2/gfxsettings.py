@@ -0,0 +1,79 @@
+'''
+Guild Wars 2 GFXSettings reader module
+'''
+from dataclasses import dataclass, field
+from xml.etree.ElementTree import ParseError, iterparse
+from yaam.utils.json.io import read_json, write_json
+from yaam.utils.logger import static_logger as logger
+from yaam.utils.path import Path
+
+
+@dataclass(frozen=True)
+class GFXApplicationInfo(object):
+    '''
+    Application data stored in the GFXSettings file
+    '''
+    install_path: str = field(default_factory=str)
+    executable: str = field(default_factory=str)
+
+    @property
+    def is_complete(self) -> bool:
+        '''
+        Return whether both install path and executable are known
+        '''
+        return len(self.install_path) > 0 and len(self.executable) > 0
+
+
+def parse_application_info(path: Path) -> GFXApplicationInfo:
+    '''
+    Stream-parse the GFXSettings file at the given path
+    and stop as soon as both INSTALLPATH and EXECUTABLE are found
+    '''
+    values = dict()
+    in_application = False
+
+    try:
+        with open(path, 'rb') as _:
+            for (event, element) in iterparse(_, events=('start', 'end')):
+                if element.tag == "APPLICATION":
+                    in_application = event == 'start'
+                    if not in_application:
+                        break
+                elif in_application and event == 'start' and element.tag in ("INSTALLPATH", "EXECUTABLE"):
+                    values[element.tag] = element.get('Value', str())
+                    if len(values) == 2:
+                        break
+    except (ParseError, IOError) as ex:
+        logger().error(msg=f"Error parsing {path}: {ex}")
+
+    return GFXApplicationInfo(values.get("INSTALLPATH", str()), values.get("EXECUTABLE", str()))
+
+
+def load_application_info(path: Path, cache_path: Path = None) -> GFXApplicationInfo:
+    '''
+    Return the application data stored in the GFXSettings file at the given path.
+
+    If a cache path is provided, the parsed data is cached there
+    and reused as long as the GFXSettings file modification time and size don't change.
+    '''
+    stat = path.stat()
+    signature = {'path': str(path), 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+    if cache_path is not None:
+        cache: dict = read_json(cache_path)
+        if cache.get('signature', None) == signature:
+            info = GFXApplicationInfo(cache.get('install_path', str()), cache.get('executable', str()))
+            if info.is_complete:
+                logger().debug(msg=f"Using cached {path.name} data.")
+                return info
+
+    info = parse_application_info(path)
+
+    if cache_path is not None and info.is_complete:
+        write_json({
+            'signature': signature,
+            'install_path': info.install_path,
+            'executable': info.executable
+        }, cache_path)
+
+    return info
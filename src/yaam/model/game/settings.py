@@ -14,7 +14,7 @@ from yaam.model.mutable.argument import Argument
 from yaam.model.mutable.binding import Binding
 from yaam.model.type.binding import BindingType
 from yaam.utils.hashing import Hasher
-from yaam.utils.json.io import consume_json_entries, read_json, write_json
+from yaam.utils.json.io import consume_json_entries, dump_json, is_content_unchanged, read_json, write_atomic
 from yaam.utils.json.repr import jsonrepr
 from yaam.utils.logger import static_logger as logger
 from yaam.utils.normalize import normalize_abs_path
@@ -106,11 +106,6 @@ class YaamGameSettings(AbstractYaamGameSettings[
         Save game settings to file
         '''
 
-        # first, back-up
-        shutil.copyfile(self._context.addons_path, f"{self._context.addons_path}.bak")
-        shutil.copyfile(self._context.settings_path, f"{self._context.settings_path}.bak")
-
-        # save new data
         json_addons_obj = {
             'addons': jsonrepr(self._bases.values())
         }
@@ -125,8 +120,20 @@ class YaamGameSettings(AbstractYaamGameSettings[
             )
         }
 
-        write_json(json_addons_obj, self._context.addons_path)
-        write_json(json_bindings_obj, self._context.settings_path)
+        for (json_obj, path) in [
+            (json_addons_obj, self._context.addons_path),
+            (json_bindings_obj, self._context.settings_path)
+        ]:
+            data = dump_json(json_obj)
+
+            # unchanged files are neither backed-up nor rewritten
+            if is_content_unchanged(data, path):
+                continue
+
+            if path.exists():
+                shutil.copyfile(path, f"{path}.bak")
+
+            write_atomic(data, path)
 
         return True
 
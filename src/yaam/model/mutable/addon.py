@@ -15,6 +15,7 @@ class IAddon(ABC, Generic[A, B]):
     '''
     Mutable Addon interface
     '''
+    __slots__ = ()
 
     @property
     @abstractmethod
@@ -61,6 +62,7 @@ class Addon(IAddon[AddonBase, Binding]):
     '''
     Mutable Addon incarnation class
     '''
+    __slots__ = ('_base', '_binding', '_naming')
 
     def __init__(self, base: AddonBase, binding: Binding, naming: Dict[str, str]):
         self._base = base
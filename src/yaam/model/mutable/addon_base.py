@@ -1,15 +1,22 @@
 '''
 Addon base module
 '''
+from copy import deepcopy
 from typing import List
 from yaam.utils.json.jsonkin import Jsonkin
+from yaam.utils.route import Route, classify
 from yaam.utils.uri import URI
+from yaam.utils.webasset import AssetRules
 
 
 class AddonBase(Jsonkin):
     '''
     Base Addon class
     '''
+    __slots__ = (
+        '_name', '_uri', '_route', '_description', '_contributors', '_dependencies',
+        '_chainloads', '_is_shader', '_is_installer', '_asset_rules'
+    )
 
     def __init__(
                 self,
@@ -20,11 +27,14 @@ class AddonBase(Jsonkin):
                 dependencies: List[str] = None,
                 chainloads: List[str] = None,
                 is_shader: bool = False,
-                is_installer: bool = False
+                is_installer: bool = False,
+                asset_rules: AssetRules = None
             ):
 
         self._name = name
-        self._uri = URI(uri) if isinstance(uri, str) else uri
+        # uri strings are parsed on first access
+        self._uri: URI or str = uri
+        self._route: Route = None
         self._description = description
         self._contributors: List[str] = contribs if contribs else list()
         self._dependencies: List[str] = dependencies if dependencies else list()
@@ -32,6 +42,7 @@ class AddonBase(Jsonkin):
 
         self._is_shader = is_shader
         self._is_installer = is_installer
+        self._asset_rules = asset_rules if asset_rules is not None else AssetRules()
 
     def __hash__(self) -> int:
         return hash(self._name)
@@ -44,6 +55,23 @@ class AddonBase(Jsonkin):
 
         return super().__eq__(o)
 
+    def __deepcopy__(self, memo: dict):
+        # names, flags, uri strings and routes are immutable and can be shared with the copy
+        clone = type(self).__new__(type(self))
+        memo[id(self)] = clone
+
+        for _ in AddonBase.__slots__:
+            setattr(clone, _, getattr(self, _))
+
+        if isinstance(self._uri, URI):
+            clone._uri = deepcopy(self._uri, memo)
+        clone._contributors = deepcopy(self._contributors, memo)
+        clone._dependencies = deepcopy(self._dependencies, memo)
+        clone._chainloads = deepcopy(self._chainloads, memo)
+        clone._asset_rules = deepcopy(self._asset_rules, memo)
+
+        return clone
+
     @property
     def name(self) -> str:
         '''
@@ -56,8 +84,19 @@ class AddonBase(Jsonkin):
         '''
         The uri of the addon
         '''
+        if isinstance(self._uri, str):
+            self._uri = URI(self._uri)
         return self._uri
 
+    @property
+    def route(self) -> Route:
+        '''
+        The classified route of the addon uri
+        '''
+        if self._route is None:
+            self._route = classify(self._uri)
+        return self._route
+
     @property
     def description(self) -> str:
         '''
@@ -100,6 +139,13 @@ class AddonBase(Jsonkin):
         '''
         return self._is_installer
 
+    @property
+    def asset_rules(self) -> AssetRules:
+        '''
+        The rules selecting the release asset to be downloaded
+        '''
+        return self._asset_rules
+
     @name.setter
     def name(self, new_name: str) -> None:
         '''
@@ -112,7 +158,8 @@ class AddonBase(Jsonkin):
         '''
         Set the addon update url
         '''
-        self._uri = URI(new_uri) if isinstance(new_uri, str) else new_uri
+        self._uri = new_uri
+        self._route = None
 
     @description.setter
     def description(self, new_description: str) -> None:
@@ -156,6 +203,13 @@ class AddonBase(Jsonkin):
         '''
         self._is_installer = is_installer
 
+    @asset_rules.setter
+    def asset_rules(self, asset_rules: AssetRules):
+        '''
+        Set the rules selecting the release asset to be downloaded
+        '''
+        self._asset_rules = asset_rules
+
     @staticmethod
     def from_json(json_obj: dict):
         '''
@@ -169,16 +223,17 @@ class AddonBase(Jsonkin):
             dependencies=json_obj.get('dependencies', []),
             chainloads=json_obj.get('chainloads', []),
             is_shader=json_obj.get('is_shader', False),
-            is_installer=json_obj.get('is_installer', False)
+            is_installer=json_obj.get('is_installer', False),
+            asset_rules=AssetRules.from_json(json_obj.get('assets', None))
         )
 
     def to_json(self) -> dict:
         '''
         Map the json rapresentation into an object of this class
         '''
-        return {
+        json_obj = {
             'name': self.name,
-            'uri': self.uri,
+            'uri': str(self._uri) if self._uri is not None else None,
             'description': self.description,
             'contribs': self.contributors,
             'dependencies': self.dependencies,
@@ -186,3 +241,8 @@ class AddonBase(Jsonkin):
             'is_shader': self.is_shader,
             'is_installer': self._is_installer
         }
+
+        if not self._asset_rules.is_empty:
+            json_obj['assets'] = self._asset_rules.to_json()
+
+        return json_obj
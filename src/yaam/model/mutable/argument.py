@@ -16,6 +16,7 @@ class Argument(Synthetizer[ArgumentSynthesis[T]], Jsonkin):
     '''
     Mutable Argument model class
     '''
+    __slots__ = ('value', 'enabled', '_argument')
 
     def __init__(self, arg: ArgumentInfo, value: T = None, enabled=False):
         self.value: T = value
@@ -1,6 +1,7 @@
 '''
 Binding model module
 '''
+from copy import deepcopy
 from pathlib import Path
 from typing import List
 from yaam.model.type.binding import BindingType
@@ -11,6 +12,7 @@ class Binding(Jsonkin):
     '''
     Mutable Addon binding model
     '''
+    __slots__ = ('_name', '_path', '_args', '_enabled', '_updateable', '_binding_type', '_is_headless', '_workspace')
 
     def __init__(
                 self,
@@ -28,10 +30,24 @@ class Binding(Jsonkin):
         self._enabled = enabled
         self._updateable = updateable
         self._binding_type = binding_type
+        # derived from the path, computed on first access
+        self._is_headless: bool = None
+        self._workspace: Path = None
 
     def __hash__(self) -> int:
         return hash((self.name, self.typing))
 
+    def __deepcopy__(self, memo: dict):
+        # names, paths and types are immutable and can be shared with the copy
+        clone = type(self).__new__(type(self))
+        memo[id(self)] = clone
+
+        for _ in Binding.__slots__:
+            setattr(clone, _, getattr(self, _))
+        clone._args = deepcopy(self._args, memo)
+
+        return clone
+
     @property
     def name(self) -> str:
         '''
@@ -51,17 +67,18 @@ class Binding(Jsonkin):
         '''
         Return if its a headless addon (path is a folder)
         '''
-        return len(self.path.suffix) == 0
+        if self._is_headless is None:
+            self._is_headless = len(self._path.suffix) == 0
+        return self._is_headless
 
     @property
     def workspace(self) -> Path:
         '''
         Return the addon workspace / parent folder
         '''
-        if self.is_headless:
-            return self.path
-        else:
-            return self.path.parent
+        if self._workspace is None:
+            self._workspace = self._path if self.is_headless else self._path.parent
+        return self._workspace
 
     @property
     def default_naming(self) -> str:
@@ -146,6 +163,8 @@ class Binding(Jsonkin):
         Set the Addon path
         '''
         self._path = new_path
+        self._is_headless = None
+        self._workspace = None
 
     @args.setter
     def args(self, new_args: List[str]):
@@ -1,8 +1,11 @@
 '''
 Addon metadata class module
 '''
+from copy import deepcopy
 from typing import Dict
 from yaam.model.type.binding import BindingType
+from yaam.utils.detetimeutils import timestamp_to_epoch
+from yaam.utils.hashing import Hasher
 from yaam.utils.json.jsonkin import Jsonkin
 
 
@@ -10,6 +13,7 @@ class AddonMetadata(Jsonkin):
     '''
     Addon Meta-data class
     '''
+    __slots__ = ('addon', 'etag', '_last_modified', '_timestamp', 'hash_signature', 'hash_algorithm', 'uri', 'asset', 'namings')
 
     def __init__(
                 self,
@@ -18,16 +22,66 @@ class AddonMetadata(Jsonkin):
                 etag: str = '',
                 last_modified: str = '',
                 hash_signature: str = '',
-                naming_map: Dict[BindingType, Dict[str, str]] = None
+                naming_map: Dict[BindingType, Dict[str, str]] = None,
+                timestamp: int = None,
+                asset: str = '',
+                hash_algorithm: Hasher = Hasher.SHA256
             ) -> None:
 
         self.addon = addon
         self.etag = etag
-        self.last_modified = last_modified
+        self._last_modified = last_modified
+        self._timestamp = timestamp
         self.hash_signature = hash_signature
+        # algorithm of the hash signature, as signatures of different algorithms can't be compared
+        self.hash_algorithm = hash_algorithm
         self.uri = uri
+        # name of the release asset last chosen for the addon
+        self.asset = asset
         self.namings: Dict[BindingType, Dict[str, str]] = naming_map if naming_map is not None else dict()
 
+    def __deepcopy__(self, memo: dict):
+        # every field but the naming map is immutable and can be shared with the copy
+        clone = type(self).__new__(type(self))
+        memo[id(self)] = clone
+
+        for _ in AddonMetadata.__slots__:
+            setattr(clone, _, getattr(self, _))
+        clone.namings = deepcopy(self.namings, memo)
+
+        return clone
+
+    @property
+    def last_modified(self) -> str:
+        '''
+        The last modified timestamp string of the addon
+        '''
+        return self._last_modified
+
+    @last_modified.setter
+    def last_modified(self, last_modified: str):
+        '''
+        Set the last modified timestamp string of the addon
+        '''
+        if last_modified != self._last_modified:
+            self._last_modified = last_modified
+            self._timestamp = None
+
+    @property
+    def timestamp(self) -> int:
+        '''
+        The normalized epoch (in seconds) of the last modified timestamp, if any
+        '''
+        if self._timestamp is None and len(self._last_modified) > 0:
+            self._timestamp = timestamp_to_epoch(self._last_modified)
+        return self._timestamp
+
+    def has_same_signature(self, other: 'AddonMetadata') -> bool:
+        '''
+        Return whether the hash signature matches the one of the given metadata
+        '''
+        return self.hash_algorithm == other.hash_algorithm and self.hash_signature == other.hash_signature
+
     @staticmethod
     def from_json(json_obj: dict):
         '''
@@ -43,7 +97,11 @@ class AddonMetadata(Jsonkin):
             etag=json_obj.get('etag', ''),
             last_modified=json_obj.get('last_modified', ''),
             hash_signature=json_obj.get('hash_signature', ''),
-            naming_map=namings
+            # signatures recorded without their algorithm are SHA256 ones
+            hash_algorithm=Hasher.from_string(json_obj.get('hash_algorithm', Hasher.SHA256.signature)),
+            naming_map=namings,
+            timestamp=json_obj.get('timestamp', None),
+            asset=json_obj.get('asset', '')
         )
 
     def to_json(self) -> dict:
@@ -59,6 +117,9 @@ class AddonMetadata(Jsonkin):
             'addon': self.addon,
             'etag': self.etag,
             'last_modified': self.last_modified,
+            'timestamp': self.timestamp,
             'hash_signature': self.hash_signature,
+            'hash_algorithm': self.hash_algorithm.signature,
+            'asset': self.asset,
             'namings': namings
         }
@@ -99,6 +99,94 @@ class Option(Enum):
         action="store"
     )
 
+    PROFILE = OptionEntry(
+        index=counter.count(),
+        aliases=set(["profile"]),
+        default=False,
+        descr="Profile the execution phases and write a Chrome trace to the temp directory",
+        action="store_true"
+    )
+
+    BACKGROUND_UPDATES = OptionEntry(
+        index=counter.count(),
+        aliases=set(["background-updates", "background_updates", "b"]),
+        default=False,
+        descr="Update the addons not loaded by the game (e.g. .exe companions) after the game has been launched",
+        action="store_true"
+    )
+
+    DAEMON = OptionEntry(
+        index=counter.count(),
+        aliases=set(["daemon"]),
+        default=False,
+        descr="Run YAAM in background, periodically checking and downloading addon updates for the launcher",
+        action="store_true"
+    )
+
+    DAEMON_INTERVAL = OptionEntry(
+        index=counter.count(),
+        aliases=set(["daemon-interval", "daemon_interval"]),
+        default=1800,
+        descr="Set the seconds between two daemon update checks",
+        action="store"
+    )
+
+    ALL_GAMES = OptionEntry(
+        index=counter.count(),
+        aliases=set(["all-games", "all_games"]),
+        default=False,
+        descr="Only update the addons of every configured game without running any",
+        action="store_true"
+    )
+
+    JOBS = OptionEntry(
+        index=counter.count(),
+        aliases=set(["jobs", "j"]),
+        default=4,
+        descr="Set the number of addons updated concurrently",
+        action="store"
+    )
+
+    INSTALLER_TIMEOUT = OptionEntry(
+        index=counter.count(),
+        aliases=set(["installer-timeout", "installer_timeout"]),
+        default=600,
+        descr="Set the seconds after which a hung addon installer is killed (0 = never)",
+        action="store"
+    )
+
+    SEGMENTS = OptionEntry(
+        index=counter.count(),
+        aliases=set(["segments"]),
+        default=4,
+        descr="Set the number of connections a large addon is downloaded with, if its host supports it (1 = single stream)",
+        action="store"
+    )
+
+    NON_INTERACTIVE = OptionEntry(
+        index=counter.count(),
+        aliases=set(["non-interactive", "non_interactive"]),
+        default=False,
+        descr="Never ask which release asset to download, skipping the addons without a matching selection rule",
+        action="store_true"
+    )
+
+    UNINSTALL = OptionEntry(
+        index=counter.count(),
+        aliases=set(["uninstall"]),
+        default=None,
+        descr="Only uninstall the given addon (repeatable), deleting the files written by its updates and disabling it",
+        action="append"
+    )
+
+    VERIFY = OptionEntry(
+        index=counter.count(),
+        aliases=set(["verify"]),
+        default=False,
+        descr="Only verify the files written by the updates of the enabled addons, reporting the modified and missing ones",
+        action="store_true"
+    )
+
     def __hash__(self) -> int:
         return hash(self.name)
 
@@ -176,7 +264,8 @@ class OptionGroup(Enum):
     '''
     EXECUTION_MODE = OptionGroupEntry(
         index=0,
-        options=[Option.RUN_STACK, Option.UPDATE_ADDONS, Option.EXPORT],
+        options=[Option.RUN_STACK, Option.UPDATE_ADDONS, Option.EXPORT, Option.DAEMON, Option.ALL_GAMES, Option.UNINSTALL,
+                 Option.VERIFY],
         mutually_exclusive=True
     )
 
@@ -184,7 +273,9 @@ class OptionGroup(Enum):
         index=1,
         options=[
             Option.DEBUG, Option.GAME, Option.FORCE_ACTION, Option.EDIT,
-            Option.GITHUB_USER, Option.GITHUB_API_TOKEN
+            Option.GITHUB_USER, Option.GITHUB_API_TOKEN, Option.PROFILE,
+            Option.BACKGROUND_UPDATES, Option.DAEMON_INTERVAL, Option.NON_INTERACTIVE, Option.JOBS,
+            Option.INSTALLER_TIMEOUT, Option.SEGMENTS
         ],
         mutually_exclusive=False
     )
@@ -11,6 +11,7 @@ class Synthetizer(ABC, Generic[V]):
     '''
     Synthetizer pattern interface
     '''
+    __slots__ = ()
 
     @abstractmethod
     def synthetize(self) -> V:
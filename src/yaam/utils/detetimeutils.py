@@ -2,7 +2,68 @@
 Date and time utilities
 '''
 
-from dateutil.parser import parse as parse_timestamp
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1024)
+def parse_timestamp(timestamp: str) -> datetime:
+    '''
+    Parse a timestamp string into a timezone-aware datetime.
+
+    RFC 7231 HTTP dates (last-modified) and ISO-8601 timestamps (GitHub API)
+    are parsed with their own format-specific parsers,
+    dateutil heuristic parser is used only as a fallback.
+    Returns None if the timestamp can't be parsed.
+    '''
+    value: datetime = None
+
+    if timestamp is None or len(timestamp) == 0:
+        return value
+
+    try:
+        if timestamp[0].isdigit():
+            # ISO-8601, e.g.: 2024-06-29T10:00:00Z
+            value = datetime.fromisoformat(timestamp.replace('Z', '+00:00', 1) if timestamp.endswith('Z') else timestamp)
+        else:
+            # RFC 7231, e.g.: Sat, 29 Jun 2024 10:00:00 GMT
+            value = parsedate_to_datetime(timestamp)
+    except (ValueError, TypeError, IndexError):
+        value = None
+
+    if value is None:
+        try:
+            from dateutil.parser import parse as parse_fuzzy_timestamp
+
+            value = parse_fuzzy_timestamp(timestamp)
+        except (ValueError, OverflowError):
+            value = None
+
+    if value is not None and value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+
+    return value
+
+
+@lru_cache(maxsize=1024)
+def timestamp_to_epoch(timestamp: str) -> int:
+    '''
+    Return the epoch (in seconds) of the given timestamp string.
+    Returns None if the timestamp is empty or can't be parsed.
+    '''
+    value = parse_timestamp(timestamp)
+    return int(value.timestamp()) if value is not None else None
+
+
+def compare_epoch(epoch1: int, epoch2: int) -> float:
+    '''
+    Compare two epochs, if any of them is missing returns +inf
+    '''
+    if epoch1 is None or epoch2 is None:
+        return float('inf')
+
+    return epoch1 - epoch2
 
 
 def compare_timestamp_str(timestamp1: str, timestamp2: str) -> float:
@@ -13,7 +74,4 @@ def compare_timestamp_str(timestamp1: str, timestamp2: str) -> float:
     if len(timestamp1) == 0 or len(timestamp2) == 0:
         return float('inf')
 
-    dt1 = parse_timestamp(timestamp1)
-    dt2 = parse_timestamp(timestamp2)
-
-    return dt1.timestamp() - dt2.timestamp()
+    return compare_epoch(timestamp_to_epoch(timestamp1), timestamp_to_epoch(timestamp2))
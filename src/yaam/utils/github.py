@@ -2,18 +2,21 @@
 Github API helper module
 '''
 
-import re
-from typing import List, Tuple, Union
+from typing import TYPE_CHECKING, List, Tuple, Union
 from datetime import datetime
-import requests
 # from requests.sessions import Session
 from yaam.utils.json.jsonkin import Jsonkin
 from yaam.utils.logger import static_logger as logger
+from yaam.utils.profiler import static_profiler as profiler
 
 from yaam.utils.exceptions import GitHubException
+from yaam.utils.route import Route, RouteType, classify
 from yaam.utils.uri import URI
 from yaam.utils.webasset import Asset, Release
 
+if TYPE_CHECKING:
+    import requests
+
 
 class GithubAsset(Asset):
     '''
@@ -27,7 +30,9 @@ class GithubAsset(Asset):
         '''
         return Asset(
             name=json_obj.get('name', str()),
-            url=URI(json_obj.get('browser_download_url', None))
+            url=URI(json_obj.get('browser_download_url', None)),
+            size=json_obj.get('size', None),
+            digest=json_obj.get('digest', None)
         )
 
 
@@ -63,6 +68,8 @@ class Github(object):
         # self.__root = URI("https://api.github.com")
 
         self.__header = header if header is not None else dict()
+        self.__session: 'requests.Session' = None
+        self.__adapters: List[Tuple[str, 'requests.adapters.BaseAdapter']] = list()
 
         self.__init_header(self.__user, self.__api_access_token)
 
@@ -94,50 +101,85 @@ class Github(object):
 
         return Github(user, token)
 
+    def __get_session(self) -> 'requests.Session':
+        '''
+        Return the API session, creating it if necessary.
+        Keeping a single session allows connections to be reused across requests.
+        '''
+        if self.__session is None:
+            import requests
+
+            self.__session = requests.Session()
+            for (prefix, adapter) in self.__adapters:
+                self.__session.mount(prefix, adapter)
+
+        return self.__session
+
+    def mount(self, prefix: str, adapter: 'requests.adapters.BaseAdapter'):
+        '''
+        Register a transport adapter for any url starting with the given prefix
+        '''
+        self.__adapters.append((prefix, adapter))
+        if self.__session is not None:
+            self.__session.mount(prefix, adapter)
+
+    def close(self):
+        '''
+        Close the API session
+        '''
+        if self.__session is not None:
+            self.__session.close()
+            self.__session = None
+
     @staticmethod
-    def assert_api_url(url: URI):
+    def assert_api_url(url: Union[Route, URI, str]):
         '''
         Assert whether the given url matches
         https://api.github.com/(.+)
         '''
-        api_github_regex = r"https:\/\/api\.github\.com\/(.+)"
-        return re.match(api_github_regex, str(url)) is not None
+        return classify(url).is_github_api
 
     @staticmethod
-    def assert_latest_release_url(url: URI):
+    def assert_latest_release_url(url: Union[Route, URI, str]):
         '''
         Assert whether the given url matches
         https://api.github.com/repos/(.+)/releases/latest
         '''
-        api_github_latest_release_regex = r"https:\/\/api\.github\.com\/repos\/(.+)\/releases\/latest"
-        return re.match(api_github_latest_release_regex, str(url)) is not None
+        return classify(url).is_latest_release
 
     @staticmethod
-    def assert_release_list_url(url: URI):
+    def assert_release_list_url(url: Union[Route, URI, str]):
         '''
         Assert whether the given url matches
         https://api.github.com/repos/(.+)/releases
         '''
-        api_github_release_list_regex = r"https:\/\/api\.github\.com\/repos\/(.+)\/releases"
-        return re.match(api_github_release_list_regex, str(url)) is not None
+        return classify(url).is_github_release
 
-    def get(self, url: URI, **kwargs) -> requests.Response:
+    def get(self, url: URI, **kwargs) -> 'requests.Response':
         '''
         HTTP GET <URL> <ARGS>
         '''
-
         args = self.__prepare_args(**kwargs)
 
-        return requests.get(url, **args)  # pylint: disable=W3101
+        response = self.__get_session().get(url, **args)
+
+        profiler().count("http.requests")
+        if not args.get('stream', False):
+            profiler().count("http.bytes", len(response.content))
+
+        return response
 
-    def head(self, url: URI, **kwargs) -> requests.Response:
+    def head(self, url: URI, **kwargs) -> 'requests.Response':
         '''
         HTTP GET <URL> <ARGS>
         '''
-
         args = self.__prepare_args(**kwargs)
 
-        return requests.head(url, **args)  # pylint: disable=W3101
+        response = self.__get_session().head(url, **args)
+
+        profiler().count("http.requests")
+
+        return response
 
     def get_api_rate_limits(self, **kwargs) -> Tuple[int, int, int]:
         '''
@@ -183,8 +225,7 @@ class Github(object):
                     raise GitHubException(
                         "Github API response not in JSON format")
             else:
-                raise GitHubException(f"Github API response returned with status code {
-                                      response.status_code}")
+                raise GitHubException(f"Github API response returned with status code {response.status_code}")
         else:
             raise GitHubException("Github API call limit reached")
 
@@ -231,6 +272,10 @@ class Github(object):
 
             raw_assets = self.__fetch_release_raw_assets(url, **kwargs)
 
+            # pinned releases urls answer a single release
+            if isinstance(raw_assets, dict) and classify(url).typing is RouteType.GITHUB_PINNED_RELEASE:
+                raw_assets = [raw_assets]
+
             if isinstance(raw_assets, list):
 
                 raw_assets = sorted(
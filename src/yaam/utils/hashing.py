@@ -4,6 +4,20 @@ Hashing utility functions
 import hashlib
 from enum import Enum
 from pathlib import Path
+from typing import BinaryIO, Iterable, Tuple
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# large reads keep the per-chunk interpreter overhead negligible against the digest itself
+CHUNK_SIZE = 1 << 20
 
 
 class Hasher(Enum):
@@ -15,7 +29,48 @@ class Hasher(Enum):
     SHA1 = 2,
     SHA256 = 3,
     SHA384 = 4,
-    SHA512 = 5
+    SHA512 = 5,
+    # local integrity only, never used to verify upstream content
+    BLAKE2B = 6,
+    BLAKE3 = 7,
+    XXH3 = 8
+
+    @property
+    def is_available(self) -> bool:
+        '''
+        Return whether the algorithm can be used (its optional module is installed, if any)
+        '''
+        if self == Hasher.BLAKE3:
+            return blake3 is not None
+        elif self == Hasher.XXH3:
+            return xxhash is not None
+
+        return self != Hasher.NONE
+
+    @property
+    def is_secure(self) -> bool:
+        '''
+        Return whether the algorithm is collision resistant, as to detect deliberate tampering
+        '''
+        return self in [Hasher.SHA256, Hasher.SHA384, Hasher.SHA512, Hasher.BLAKE2B, Hasher.BLAKE3]
+
+    @property
+    def signature(self) -> str:
+        '''
+        Return the name recorded next to the hashcodes made with the algorithm
+        '''
+        return self.name.lower()
+
+    @staticmethod
+    def fastest(secure: bool = False):
+        '''
+        Return the fastest available algorithm, optionally among the collision resistant ones
+        '''
+        # without the optional modules SHA256 is preferred to BLAKE2B,
+        # since most CPUs accelerate it in hardware (see bench/bench_hashing.py)
+        candidates = [Hasher.BLAKE3, Hasher.XXH3, Hasher.SHA256]
+
+        return next(_ for _ in candidates if _.is_available and (_.is_secure or not secure))
 
     def create(self):
         '''
@@ -33,6 +88,13 @@ class Hasher(Enum):
             strategy = hashlib.sha384()
         elif self == Hasher.SHA512:
             strategy = hashlib.sha512()
+        elif self == Hasher.BLAKE2B:
+            # 256 bits are plenty for change detection and keep the hashcodes as long as SHA256 ones
+            strategy = hashlib.blake2b(digest_size=32)
+        elif self == Hasher.BLAKE3 and blake3 is not None:
+            strategy = blake3.blake3()
+        elif self == Hasher.XXH3 and xxhash is not None:
+            strategy = xxhash.xxh3_128()
 
         return strategy
 
@@ -41,15 +103,20 @@ class Hasher(Enum):
         Return hashcode for the specified file with the specified algorithm
         @fname: Path -- path to the file for which computing the hash
         '''
-        fshan = self.create()
-
         if fname.is_file():
             with open(fname, "rb") as file_to_hash:
-                for chunk in iter(lambda: file_to_hash.read(4096), b""):
-                    fshan.update(chunk)
-        else:
-            return ''
+                return self.make_hash_from_stream(file_to_hash)
 
+        return ''
+
+    def make_hash_from_stream(self, stream: BinaryIO) -> str:
+        '''
+        Return hashcode for the remaining content of the specified binary stream
+        @stream: BinaryIO -- stream to be read in chunks
+        '''
+        fshan = self.create()
+        for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+            fshan.update(chunk)
         return fshan.hexdigest()
 
     def make_hash_from_bytes(self, data: bytes) -> str:
@@ -70,6 +137,35 @@ class Hasher(Enum):
         fshan.update(data.encode(encoding=encoding, errors=errors))
         return fshan.hexdigest()
 
+    def make_hash_from_tree(self, leaves: Iterable[Tuple[str, str]]) -> str:
+        '''
+        Return the Merkle root hashcode of a directory tree
+        @leaves: Iterable[Tuple[str, str]] -- (relative path, file hashcode) of each file in the tree
+        '''
+        # leaves and nodes are domain separated, as to not be mistaken for one another
+        level = [
+            self.__digest(b"\x00", path.encode("utf-8"), b"\x00", digest.encode("ascii"))
+            for (path, digest) in sorted((path.replace("\\", "/"), digest) for (path, digest) in leaves)
+        ]
+
+        if len(level) == 0:
+            return self.make_hash_from_bytes(b"")
+
+        while len(level) > 1:
+            # an odd node is promoted to the next level as-is
+            level = [
+                self.__digest(b"\x01", *level[i:i + 2]) if i + 1 < len(level) else level[i]
+                for i in range(0, len(level), 2)
+            ]
+
+        return level[0].hex()
+
+    def __digest(self, *chunks: bytes) -> bytes:
+        fshan = self.create()
+        for _ in chunks:
+            fshan.update(_)
+        return fshan.digest()
+
     @staticmethod
     def from_string(str_repr: str):
         '''
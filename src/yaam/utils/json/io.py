@@ -2,11 +2,217 @@
 JSON I/O utilities functions
 '''
 
+import codecs
 import json
-from typing import Dict
+import os
+import shutil
+import uuid
+from abc import ABC, abstractmethod
 from pathlib import Path
+from typing import Callable, Dict
 from yaam.utils.functional import identity, Consumer, Mapper, K
+from yaam.utils.json.jsonkin import Jsonkin
 from yaam.utils.json.repr import jsonrepr
+from yaam.utils.logger import static_logger as logger
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson only supports 2 spaces indentation, which is rescaled to the requested one
+ORJSON_INDENT = 2
+
+
+class JsonBackend(ABC):
+    '''
+    JSON (de)serialization backend
+
+    Every backend produces the same bytes for the same object:
+    utf-8 encoded, non-ascii characters unescaped, compact if no indentation is given.
+    '''
+
+    name: str = None
+
+    @abstractmethod
+    def dumps(self, obj, indent: int, default: Callable[[object], object]) -> bytes:
+        '''
+        Serialize the given object into utf-8 encoded json
+        '''
+        return None
+
+    @abstractmethod
+    def loads(self, data: bytes or str):
+        '''
+        Deserialize the given json
+        '''
+        return None
+
+
+class StdlibJsonBackend(JsonBackend):
+    '''
+    Python standard library json backend
+    '''
+
+    name = "json"
+
+    def dumps(self, obj, indent: int, default: Callable[[object], object]) -> bytes:
+        separators = (',', ': ') if indent is not None else (',', ':')
+        return json.dumps(obj, indent=indent, separators=separators, default=default, ensure_ascii=False).encode('utf-8')
+
+    def loads(self, data: bytes or str):
+        return json.loads(data)
+
+
+class OrjsonBackend(JsonBackend):
+    '''
+    orjson backend
+    '''
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        # dataclasses are handed to the default hook as they may be Jsonkin
+        self.__options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(self, obj, indent: int, default: Callable[[object], object]) -> bytes:
+        if indent is None:
+            return orjson.dumps(obj, default=default, option=self.__options)
+
+        data = orjson.dumps(obj, default=default, option=self.__options | orjson.OPT_INDENT_2)
+
+        if indent != ORJSON_INDENT:
+            # strings can't span lines, so the leading spaces of every line are indentation
+            lines = data.split(b"\n")
+            for (i, line) in enumerate(lines):
+                spaces = len(line) - len(line.lstrip(b" "))
+                if spaces > 0:
+                    lines[i] = b" " * (spaces // ORJSON_INDENT * indent) + line[spaces:]
+            data = b"\n".join(lines)
+
+        return data
+
+    def loads(self, data: bytes or str):
+        return orjson.loads(data)
+
+
+JSON_BACKENDS: Dict[str, Callable[[], JsonBackend]] = {
+    StdlibJsonBackend.name: StdlibJsonBackend
+}
+
+if orjson is not None:
+    JSON_BACKENDS[OrjsonBackend.name] = OrjsonBackend
+
+_BACKEND: JsonBackend = (OrjsonBackend if orjson is not None else StdlibJsonBackend)()
+
+
+def json_backend() -> JsonBackend:
+    '''
+    Return the json backend in use
+    '''
+    return _BACKEND
+
+
+def use_json_backend(name: str) -> JsonBackend:
+    '''
+    Use the given json backend from now on, if available, and return it
+    '''
+    global _BACKEND  # pylint: disable=W0603
+
+    if name not in JSON_BACKENDS:
+        raise ValueError(f"Unavailable json backend {name}, choose between {', '.join(JSON_BACKENDS)}")
+
+    _BACKEND = JSON_BACKENDS[name]()
+
+    return _BACKEND
+
+
+###############################################################
+
+_SERIALIZERS: Dict[type, Callable[[object], object]] = dict()
+
+
+def _serializer(obj_type: type) -> Callable[[object], object]:
+    '''
+    Return the (cached) serializer of the given type,
+    resolving the jsonrepr dispatch once per type
+    '''
+    serializer = _SERIALIZERS.get(obj_type, None)
+
+    if serializer is None:
+        if issubclass(obj_type, Jsonkin):
+            serializer = obj_type.to_json
+        elif issubclass(obj_type, Path):
+            serializer = str
+        else:
+            serializer = jsonrepr
+
+        _SERIALIZERS[obj_type] = serializer
+
+    return serializer
+
+
+def cerealize_fast(obj):
+    '''
+    Serializer equivalent to jsonrepr, dispatching on the object type
+    '''
+    return _serializer(type(obj))(obj)
+
+
+def dump_json(obj, indent=4, cerealize=jsonrepr) -> bytes:
+    '''
+    Serialize json obj into utf-8 encoded bytes
+    '''
+    return _BACKEND.dumps(obj, indent, cerealize_fast if cerealize is jsonrepr else cerealize)
+
+
+def load_json(data: bytes or str):
+    '''
+    Deserialize json obj from utf-8 encoded bytes or string
+    '''
+    if isinstance(data, bytes) and data.startswith(codecs.BOM_UTF8):
+        data = data[len(codecs.BOM_UTF8):]
+
+    return _BACKEND.loads(data)
+
+
+def write_atomic(data: bytes, path: Path or str, mode: int = None):
+    '''
+    Replace the file content with the given data, so that
+    an interrupted write never leaves a truncated file behind.
+
+    If a mode is given, the file is created with those permissions,
+    otherwise the ones of the replaced file are kept.
+    '''
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o666 if mode is None else mode)
+        with open(fd, 'wb') as _:
+            _.write(data)
+            _.flush()
+            os.fsync(_.fileno())
+
+        if mode is None and path.exists():
+            shutil.copymode(path, tmp_path)
+
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def is_content_unchanged(data: bytes, path: Path or str) -> bool:
+    '''
+    Return whether the file already contains exactly the given data
+    '''
+    path = Path(path)
+
+    try:
+        return path.stat().st_size == len(data) and path.read_bytes() == data
+    except OSError:
+        return False
 
 
 def read_json(path: Path or str, encoding='utf8', decerealize: Mapper[dict, K] = identity) -> K or dict:
@@ -14,27 +220,44 @@ def read_json(path: Path or str, encoding='utf8', decerealize: Mapper[dict, K] =
     Read raw json obj from file
     '''
     _obj = dict()
+    path = Path(path)
 
     if path.exists():
         try:
+            data = path.read_bytes()
+
+            if codecs.lookup(encoding).name != 'utf-8':
+                data = data.decode(encoding)
 
-            with open(path, 'r', encoding=encoding) as _:
-                _obj = decerealize(json.load(_))
-        except (IOError, json.decoder.JSONDecodeError):
+            _obj = decerealize(load_json(data))
+        except (IOError, UnicodeDecodeError, json.decoder.JSONDecodeError):
             _obj = dict()
 
     return _obj
 
 
-def write_json(obj, path: Path or str, encoding='utf8', indent=4, cerealize=jsonrepr):
+def write_json(obj, path: Path or str, encoding='utf8', indent=4, cerealize=jsonrepr, only_if_changed=False) -> bool:
     '''
-    Write json obj to file
+    Atomically write json obj to file and return whether the file has been written.
+
+    If only_if_changed is set, the file is not rewritten when its content wouldn't change.
     '''
     try:
-        with open(path, 'w', encoding=encoding) as _:
-            json.dump(obj, _, indent=indent, default=cerealize)
-    except (IOError, json.decoder.JSONDecodeError):
-        pass
+        data = dump_json(obj, indent, cerealize)
+
+        if codecs.lookup(encoding).name != 'utf-8':
+            data = data.decode('utf-8').encode(encoding)
+
+        if only_if_changed and is_content_unchanged(data, path):
+            return False
+
+        write_atomic(data, path)
+
+        return True
+    except (IOError, TypeError, ValueError) as ex:
+        logger().error(msg=f"Unable to write {path}: {ex}")
+
+    return False
 
 
 def consume_json_entries(json_obj: dict, consumers: Dict[str, Consumer]):
@@ -12,6 +12,8 @@ class Jsonkin(object):
     A mixin class that enable json serialization and deserialization
     for the objects of the inheriting classes
     """
+    __slots__ = ()
+
     def to_json(self) -> dict:
         """
         Return a (valid) json representation of the object as a dictionary
@@ -3,8 +3,8 @@ Print stuff to somewhere module
 '''
 
 from collections import defaultdict
-from typing import Sequence
-from tabulate import tabulate
+from enum import Enum
+from typing import Dict, Sequence
 from yaam.model.mutable.addon import IAddon
 from yaam.model.mutable.addon_base import AddonBase
 from yaam.model.mutable.binding import Binding
@@ -21,6 +21,44 @@ def print_addon_tableau(addons: Sequence[IAddon[AddonBase, Binding]], printer=pr
             data[key].append(value)
 
     if len(data):
+        from tabulate import tabulate
+
         printer("Loaded addons: ")
         table = tabulate(data, headers="keys", tablefmt='rst', colalign=("left",))
         printer(f"\n{table}\n")
+
+
+def print_update_report(results: Dict[str, Dict[str, Enum]], printer=print):
+    '''
+    Print the update results of each game as table to the specified printer stream
+    '''
+    data = defaultdict(list)
+    for (game, addons) in results.items():
+        for (addon, result) in sorted(addons.items()):
+            data['game'].append(game)
+            data['addon'].append(addon)
+            data['result'].append(result.name.lower().replace('_', ' '))
+
+    if len(data):
+        from tabulate import tabulate
+
+        printer("Update report: ")
+        table = tabulate(data, headers="keys", tablefmt='rst', colalign=("left",))
+        printer(f"\n{table}\n")
+
+
+def print_verify_report(reports: Sequence, printer=print):
+    '''
+    Print the integrity verification of each addon as table to the specified printer stream
+    '''
+    data = defaultdict(list)
+    for report in sorted(reports, key=lambda x: (-x.status.value, x.addon.base.name)):
+        for (key, value) in report.to_table().items():
+            data[key].append(value)
+
+    if len(data):
+        from tabulate import tabulate
+
+        printer("Verify report: ")
+        table = tabulate(data, headers="keys", tablefmt='rst', colalign=("left",))
+        printer(f"\n{table}\n")
@@ -3,7 +3,7 @@ Process execution utility module
 '''
 
 import time
-from subprocess import CompletedProcess, Popen, run as run_process
+from subprocess import CompletedProcess, Popen, TimeoutExpired, run as run_process
 from typing import Iterable
 from pathlib import Path
 from yaam.utils.logger import static_logger as logger
@@ -30,13 +30,14 @@ def arun(target: Path or str, workspace: Path or str, args: Iterable[str] = None
     return proc
 
 
-def run(target: Path or str, workspace: Path or str, args: Iterable[str] = None, slack: int = 3, **kwargs) -> int:
+def run(target: Path or str, workspace: Path or str, args: Iterable[str] = None, slack: int = 3, timeout: float = None, **kwargs) -> int:
     '''
     Run the target process in the specified workspac with the provided arguments.
 
     @target : Path -- process to run
     @workspace : Path -- workspace in which run the process
     @args : list -- list of command line parameters provided to the process
+    @timeout : float -- seconds after which the process is killed and TimeoutExpired is raised
     '''
     str_args = [str(_) for _ in args] if args is not None else []
     str_target = str(target)
@@ -46,20 +47,26 @@ def run(target: Path or str, workspace: Path or str, args: Iterable[str] = None,
 
     proc = Popen(executable=str_target, cwd=str_working_dir, args=str_args, **kwargs)
 
-    ret = proc.wait()
+    try:
+        ret = proc.wait(timeout=timeout)
+    except TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        raise
 
     time.sleep(slack)
 
     return ret
 
 
-def run_command(command: str, check=False, slack: int = 3, **kwargs) -> CompletedProcess[str]:
+def run_command(command: str, check=False, slack: int = 3, timeout: float = None, **kwargs) -> CompletedProcess[str]:
     '''
-    Run the given string command
+    Run the given string command.
+    If a timeout is given, the command is killed after it and TimeoutExpired is raised.
     '''
     logger().info("Executing %s", command)
 
-    ret = run_process(command, check=check, **kwargs)
+    ret = run_process(command, check=check, timeout=timeout, **kwargs)
 
     time.sleep(slack)
 
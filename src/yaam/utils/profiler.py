@@ -0,0 +1,201 @@
+'''
+Execution phases profiler module
+'''
+
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List
+from yaam.utils.json.io import write_json
+from yaam.utils.path import Path
+
+
+class Span(object):
+    '''
+    Profiled execution span
+    '''
+
+    def __init__(self, name: str, category: str = "phase", parent=None, **args) -> None:
+        self.name = name
+        self.category = category
+        self.parent: Span = parent
+        self.args = args
+        self.thread_id = threading.get_ident()
+        self.start = time.perf_counter()
+        self.end: float = None
+
+    @property
+    def depth(self) -> int:
+        '''
+        Return the nesting depth of the span
+        '''
+        return 0 if self.parent is None else self.parent.depth + 1
+
+    def close(self):
+        '''
+        Register span end
+        '''
+        self.end = time.perf_counter()
+
+    def delta(self) -> float:
+        '''
+        Return the span duration in seconds,
+        or the elapsed time if the span is still open
+        '''
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+
+class Profiler(object):
+    '''
+    Nested spans and counters profiler exportable as a Chrome trace
+    '''
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.__enabled = enabled
+        self.__origin = time.perf_counter()
+        self.__lock = threading.Lock()
+        self.__local = threading.local()
+        self.__spans: List[Span] = list()
+        self.__counters: Dict[str, int] = defaultdict(int)
+        self.__counter_events: List[dict] = list()
+
+    @property
+    def is_enabled(self) -> bool:
+        '''
+        Return whether the profiler is recording
+        '''
+        return self.__enabled
+
+    def enable(self):
+        '''
+        Start recording spans and counters
+        '''
+        self.__enabled = True
+
+    def disable(self):
+        '''
+        Stop recording spans and counters
+        '''
+        self.__enabled = False
+
+    def reset(self):
+        '''
+        Discard any recorded span and counter
+        '''
+        with self.__lock:
+            self.__origin = time.perf_counter()
+            self.__spans.clear()
+            self.__counters.clear()
+            self.__counter_events.clear()
+
+    def __stack(self) -> List[Span]:
+        if not hasattr(self.__local, 'stack'):
+            self.__local.stack = list()
+        return self.__local.stack
+
+    @contextmanager
+    def span(self, name: str, category: str = "phase", **args) -> Iterator[Span]:
+        '''
+        Profile the enclosed code as a span nested in the current one (if any).
+        Spans are always measured but only recorded if the profiler is enabled.
+        '''
+        stack = self.__stack()
+        span = Span(name, category, stack[-1] if len(stack) > 0 else None, **args)
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            span.close()
+            stack.pop()
+            if self.__enabled:
+                with self.__lock:
+                    self.__spans.append(span)
+
+    def count(self, name: str, value: int = 1):
+        '''
+        Increment the given counter
+        '''
+        if not self.__enabled or value == 0:
+            return
+
+        with self.__lock:
+            self.__counters[name] += value
+            self.__counter_events.append({
+                'name': name,
+                'ph': 'C',
+                'ts': self.__to_us(time.perf_counter()),
+                'pid': os.getpid(),
+                'args': {'value': self.__counters[name]}
+            })
+
+    @property
+    def counters(self) -> Dict[str, int]:
+        '''
+        Return the current counters totals
+        '''
+        return dict(self.__counters)
+
+    @property
+    def spans(self) -> List[Span]:
+        '''
+        Return the closed spans
+        '''
+        return list(self.__spans)
+
+    def __to_us(self, perf_time: float) -> float:
+        return round((perf_time - self.__origin) * 1e6, 3)
+
+    def to_chrome_trace(self) -> dict:
+        '''
+        Return the recorded data in Chrome trace event format (chrome://tracing, Perfetto)
+        '''
+        pid = os.getpid()
+
+        events = [
+            {
+                'name': _.name,
+                'cat': _.category,
+                'ph': 'X',
+                'ts': self.__to_us(_.start),
+                'dur': round(_.delta() * 1e6, 3),
+                'pid': pid,
+                'tid': _.thread_id,
+                'args': dict((k, str(v)) for (k, v) in _.args.items())
+            }
+            for _ in sorted(self.__spans, key=lambda x: x.start)
+        ]
+
+        return {
+            'traceEvents': events + self.__counter_events,
+            'displayTimeUnit': 'ms',
+            'otherData': {'counters': self.counters}
+        }
+
+    def dump(self, path: Path):
+        '''
+        Write the recorded data as a Chrome trace file
+        '''
+        write_json(self.to_chrome_trace(), path, indent=None)
+
+    def report(self, printer: Callable[[str], None] = print, max_depth: int = 1):
+        '''
+        Print the recorded spans (up to the given depth) and the counters totals
+        '''
+        for _ in sorted(self.__spans, key=lambda x: x.start):
+            if _.depth <= max_depth:
+                printer(f"{'  ' * _.depth}{_.name}: {_.delta():.3f}s")
+
+        for (name, value) in sorted(self.__counters.items()):
+            printer(f"{name}: {value}")
+
+
+_PROFILER = Profiler()
+
+
+def static_profiler() -> Profiler:
+    '''
+    Simple static profiler
+    '''
+    return _PROFILER
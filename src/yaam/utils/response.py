@@ -5,12 +5,15 @@ import io
 from pathlib import Path
 import zipfile
 import re
+from typing import TYPE_CHECKING, BinaryIO
 from urllib.parse import unquote_plus, urlparse
-from requests import Response
 from yaam.model.mutable.addon import Addon
 
+if TYPE_CHECKING:
+    from requests import Response
 
-def is_zip_content(response: Response) -> bool:
+
+def is_zip_content(response: 'Response') -> bool:
     '''
     Check if the response is referring to a compressed archive (.zip)
     '''
@@ -21,7 +24,7 @@ def is_zip_content(response: Response) -> bool:
     )
 
 
-def is_json_content(response: Response) -> bool:
+def is_json_content(response: 'Response') -> bool:
     '''
     Check if the response is referring to a JSON object file (.json)
     '''
@@ -32,7 +35,7 @@ def is_json_content(response: Response) -> bool:
     )
 
 
-def get_filename(response: Response) -> str:
+def get_filename(response: 'Response') -> str:
     '''
     Return the name of the file from the respose, if exists
     '''
@@ -56,7 +59,7 @@ def get_filename(response: Response) -> str:
     return name
 
 
-def find_filename(response: Response, target: str) -> bool:
+def find_filename(response: 'Response', target: str) -> bool:
     '''
     Return true if the response contains the target filename
     '''
@@ -79,7 +82,7 @@ def find_filename(response: Response, target: str) -> bool:
     return found
 
 
-def unpack_content(response: Response, addon: Addon) -> bytes:
+def unpack_content(response: 'Response', addon: Addon) -> bytes:
     '''
     Unpack response datastream
     '''
@@ -104,6 +107,41 @@ def unpack_content(response: Response, addon: Addon) -> bytes:
     return data
 
 
+def from_bytes(content: bytes, url: str, headers: dict = None, status_code: int = 200) -> 'Response':
+    '''
+    Build a response from previously downloaded content
+    '''
+    from requests import Response
+    from requests.structures import CaseInsensitiveDict
+
+    response = Response()
+    response._content = content  # pylint: disable=W0212
+    response.url = url
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers if headers is not None else dict())
+
+    return response
+
+
+def from_file(file: BinaryIO, url: str, headers: dict = None, status_code: int = 200) -> 'Response':
+    '''
+    Build a response streaming its content from an already downloaded file,
+    which is read only when (and if) the content is accessed
+    '''
+    from requests import Response
+    from requests.structures import CaseInsensitiveDict
+
+    file.seek(0)
+
+    response = Response()
+    response.raw = file
+    response.url = url
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers if headers is not None else dict())
+
+    return response
+
+
 def repack_to_zip(content: bytes) -> zipfile.ZipFile:
     '''
     unpack content bytes to a zip
@@ -0,0 +1,124 @@
+'''
+Addon URI routing module
+'''
+
+import re
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import lru_cache
+from typing import Union
+from yaam.utils.uri import URI
+
+GITHUB_API_ROOT = "https://api.github.com"
+
+GITHUB_API_REGEX = re.compile(r"https:\/\/api\.github\.com\/(.+)")
+
+GITHUB_RELEASES_REGEX = re.compile(
+    r"https:\/\/api\.github\.com\/repos\/(?P<owner>[^\/]+)\/(?P<repo>[^\/]+)\/releases(?P<latest>\/latest)?\/?(?P<tail>[^?#]*)(?P<query>\?[^#]*)?"
+)
+
+# tail of the urls of a single (pinned) release: /releases/tags/<tag> or /releases/<id>
+GITHUB_PINNED_RELEASE_REGEX = re.compile(r"(tags\/[^\/]+|\d+)\/?")
+
+
+class RouteType(Enum):
+    '''
+    Kind of remote resource an addon URI points to
+    '''
+    DATASTREAM = 0
+    GITHUB_API = 1
+    GITHUB_RELEASE_LIST = 2
+    GITHUB_LATEST_RELEASE = 3
+    GITHUB_PINNED_RELEASE = 4
+
+
+@dataclass(frozen=True)
+class Route(object):
+    '''
+    Immutable descriptor of a classified addon URI
+    '''
+    url: str = field(default_factory=str)
+    typing: RouteType = field(default=RouteType.DATASTREAM)
+    owner: str = field(default_factory=str)
+    repo: str = field(default_factory=str)
+    query: str = field(default_factory=str)
+
+    def __str__(self) -> str:
+        return self.url
+
+    @property
+    def is_github_api(self) -> bool:
+        '''
+        Return whether the route targets the GitHub REST API
+        '''
+        return self.typing is not RouteType.DATASTREAM
+
+    @property
+    def is_github_release(self) -> bool:
+        '''
+        Return whether the route targets a GitHub release list, latest or pinned release
+        '''
+        return self.typing in (RouteType.GITHUB_RELEASE_LIST, RouteType.GITHUB_LATEST_RELEASE, RouteType.GITHUB_PINNED_RELEASE)
+
+    @property
+    def is_latest_release(self) -> bool:
+        '''
+        Return whether the route targets a GitHub latest release
+        '''
+        return self.typing is RouteType.GITHUB_LATEST_RELEASE
+
+    @property
+    def release_list_url(self) -> str:
+        '''
+        Return the GitHub release list url of the route repository, if any.
+        Pinned releases are only looked up by their own url.
+        '''
+        if not self.is_github_release:
+            return None
+
+        if self.typing is RouteType.GITHUB_PINNED_RELEASE:
+            return self.url
+
+        return f"{GITHUB_API_ROOT}/repos/{self.owner}/{self.repo}/releases{self.query}"
+
+    @property
+    def uri(self) -> URI:
+        '''
+        Return the URI object of the route
+        '''
+        return URI(self.url)
+
+
+@lru_cache(maxsize=1024)
+def _classify_str(url: str) -> Route:
+    '''
+    Classify an url string into a route descriptor
+    '''
+    route = Route(url)
+
+    match = GITHUB_RELEASES_REGEX.match(url)
+
+    typing = None
+    if match is None:
+        pass
+    elif len(match.group('tail')) == 0:
+        typing = RouteType.GITHUB_LATEST_RELEASE if match.group('latest') else RouteType.GITHUB_RELEASE_LIST
+    elif not match.group('latest') and GITHUB_PINNED_RELEASE_REGEX.fullmatch(match.group('tail')) is not None:
+        typing = RouteType.GITHUB_PINNED_RELEASE
+
+    if typing is not None:
+        route = Route(url, typing, match.group('owner'), match.group('repo'), match.group('query') or str())
+    elif GITHUB_API_REGEX.match(url) is not None:
+        route = Route(url, RouteType.GITHUB_API)
+
+    return route
+
+
+def classify(url: Union[Route, URI, str]) -> Route:
+    '''
+    Return the (cached) route descriptor of the given url
+    '''
+    if isinstance(url, Route):
+        return url
+
+    return _classify_str(str(url) if url is not None else str())
@@ -4,11 +4,14 @@ URL validator module
 Taken from pipy validators modules and made Nuitka-compliant
 '''
 import re
+from functools import lru_cache
 
 ip_middle_octet = r"(?:\.(?:1?\d{1,2}|2[0-4]\d|25[0-5]))"
 ip_last_octet = r"(?:\.(?:0|[1-9]\d?|1\d\d|2[0-4]\d|25[0-5]))"
 
-regex = re.compile(  # noqa: W605
+# NOTE: compiling this pattern is expensive (~100ms) due to the unicode ranges,
+# therefore it's compiled on first use instead of at import time
+regex = (  # noqa: W605
     r"^"
     # protocol identifier
     r"(?:(?:https?|ftp)://)"
@@ -89,11 +92,16 @@ regex = re.compile(  # noqa: W605
     r"(?:\?\S*)?"
     # fragment
     r"(?:#\S*)?"
-    r"$",
-    re.UNICODE | re.IGNORECASE
+    r"$"
 )
 
-pattern = re.compile(regex)
+
+@lru_cache(maxsize=None)
+def pattern() -> re.Pattern:
+    '''
+    Return the compiled url pattern
+    '''
+    return re.compile(regex, re.UNICODE | re.IGNORECASE)
 
 
 def url(value, public=False):
@@ -127,7 +135,7 @@ def url(value, public=False):
     :param value: URL address string to validate
     :param public: (default=False) Set True to only allow a public IP address
     """
-    result = pattern.match(value)
+    result = pattern().match(value)
     if not public:
         return result
 
@@ -2,6 +2,9 @@
 Web Assets modules
 '''
 
+import re
+import threading
+from fnmatch import fnmatch
 from typing import List
 from yaam.utils.counter import ForwardCounter
 from yaam.utils.exceptions import AssetException
@@ -14,9 +17,12 @@ class Asset(Jsonkin):
     Web resource downloadable asset
     '''
 
-    def __init__(self, name: str, url: URI) -> None:
+    def __init__(self, name: str, url: URI, size: int = None, digest: str = None) -> None:
         self.name = name
         self.download_url = url
+        # content length and digest (e.g.: sha256:<hex>) advertised by the host, if any
+        self.size = size
+        self.digest = digest
 
     def to_json(self) -> dict:
         return vars(self)
@@ -39,29 +45,172 @@ class Release(Jsonkin):
         return vars(self)
 
 
-def assets_followup(assets: List[Asset]) -> URI:
-    download_uri = None
+# known architecture tags of asset names
+ARCHITECTURES = {
+    'x64': ['x64', 'amd64', 'x86_64', 'win64'],
+    'x86': ['x86', 'i386', 'i686', 'win32'],
+    'arm64': ['arm64', 'aarch64']
+}
 
-    if len(assets) == 1:
-        download_uri = assets[0].download_url
-    elif len(assets) > 1:
+# prompts from concurrent updates must not interleave
+_PROMPT_LOCK = threading.Lock()
+
+
+def _tokens(name: str) -> List[str]:
+    return [_ for _ in re.split(r"[^a-z0-9_]+", name.lower()) if len(_) > 0]
+
+
+def _architecture(name: str) -> str:
+    tokens = _tokens(name)
+    return next((arch for (arch, tags) in ARCHITECTURES.items() if any(_ in tokens for _ in tags)), None)
+
+
+def versionless(name: str) -> str:
+    '''
+    Return the asset name without its version numbers
+    (e.g.: addon-v1.2.3-x64.zip -> addon-v#.#.#-x64.zip)
+    '''
+    tags = set(_ for arch in ARCHITECTURES.values() for _ in arch)
+    return "".join(
+        _ if _ in tags else re.sub(r"\d+", "#", _)
+        for _ in re.split(r"([^a-z0-9_]+)", name.lower())
+    )
+
+
+class AssetRules(Jsonkin):
+    '''
+    Declarative asset selection rules
+
+    - include: glob patterns of the eligible asset names
+    - regex: regular expression the eligible asset names must match
+    - arch: preferred architecture (x64, x86, arm64)
+    - exclude: glob patterns of the ineligible asset names
+    '''
+
+    def __init__(self, include: List[str] = None, regex: str = None, arch: str = None, exclude: List[str] = None) -> None:
+        self.include: List[str] = include if include else list()
+        self.regex = regex if regex else None
+        self.arch = arch.lower() if arch else None
+        self.exclude: List[str] = exclude if exclude else list()
+
+    @property
+    def is_empty(self) -> bool:
+        '''
+        Return whether no rule has been declared
+        '''
+        return len(self.include) == 0 and self.regex is None and self.arch is None and len(self.exclude) == 0
+
+    def is_eligible(self, asset: Asset) -> bool:
+        '''
+        Return whether the asset satisfies the include, regex and exclude rules
+        '''
+        name = asset.name.lower()
+
+        if any(fnmatch(name, _.lower()) for _ in self.exclude):
+            return False
+
+        if len(self.include) > 0 and not any(fnmatch(name, _.lower()) for _ in self.include):
+            return False
+
+        return self.regex is None or re.search(self.regex, asset.name, re.IGNORECASE) is not None
+
+    def select(self, assets: List[Asset]) -> List[Asset]:
+        '''
+        Return the eligible assets, narrowed down to the preferred architecture if possible
+        '''
+        eligible = [_ for _ in assets if self.is_eligible(_)]
+
+        if self.arch is not None and len(eligible) > 1:
+            preferred = [_ for _ in eligible if _architecture(_.name) == self.arch]
+            if len(preferred) == 0:
+                # assets of an unknown architecture might still be fine
+                preferred = [_ for _ in eligible if _architecture(_.name) is None]
+            if len(preferred) > 0:
+                eligible = preferred
+
+        return eligible
+
+    @staticmethod
+    def from_json(json_obj: dict):
+        '''
+        Create object representation of this class from dict representation
+        '''
+        json_obj = json_obj if json_obj else dict()
+
+        return AssetRules(
+            include=json_obj.get('include', []),
+            regex=json_obj.get('regex', None),
+            arch=json_obj.get('arch', None),
+            exclude=json_obj.get('exclude', [])
+        )
+
+    def to_json(self) -> dict:
+        '''
+        Map the json rapresentation into an object of this class
+        '''
+        json_obj = dict()
+
+        if len(self.include) > 0:
+            json_obj['include'] = self.include
+        if self.regex is not None:
+            json_obj['regex'] = self.regex
+        if self.arch is not None:
+            json_obj['arch'] = self.arch
+        if len(self.exclude) > 0:
+            json_obj['exclude'] = self.exclude
+
+        return json_obj
+
+
+def assets_followup(assets: List[Asset], rules: AssetRules = None, remembered: str = None, interactive: bool = True,
+                    addon: str = None) -> Asset:
+    '''
+    Return the asset to be downloaded among the given ones.
+
+    The candidates are narrowed down by the selection rules first, then by
+    the previously chosen asset, if any, regardless of its version.
+    The user is asked to choose only if still ambiguous.
+    '''
+    if len(assets) == 0:
+        raise AssetException("URL pointing to invalid or empty latest release!")
+
+    try:
+        candidates = rules.select(assets) if rules is not None else list(assets)
+    except re.error as ex:
+        owner = f" of {addon}" if addon else ""
+        raise AssetException(f"Invalid asset selection regex {rules.regex!r}{owner}: {ex}") from ex
+
+    if len(candidates) == 0:
+        raise AssetException("No asset satisfies the selection rules!")
+
+    if len(candidates) > 1 and remembered:
+        remembered = versionless(remembered)
+        candidates = [_ for _ in candidates if versionless(_.name) == remembered] or candidates
+
+    if len(candidates) == 1:
+        return candidates[0]
+
+    if not interactive:
+        raise AssetException(f"Found {len(candidates)} eligible resources. Add selection rules in order to choose one.")
+
+    with _PROMPT_LOCK:
         # Since download are too much etherogeneous
         # I can only let the user choose the desired resource
         # to be downloaded
-        print(f"Found {len(assets)} resources:\n")
+        print(f"Found {len(candidates)} resources:\n")
 
         i = ForwardCounter()
-        for _ in assets:
+        for _ in candidates:
             print(f"{i.next()}. {_.name}")
 
         print()
 
-        choice = input(f"Which one should be downloaded? Choose between [1, ..., {i}, n = skip]: ")
-        if choice.isnumeric() and int(choice) > 0 and int(choice) < (i + 1):
-            download_uri = assets[int(choice) - 1].download_url
-        else:
-            raise AssetException("Skipped resource download by user...")
-    else:
-        raise AssetException("URL pointing to invalid or empty latest release!")
+        try:
+            choice = input(f"Which one should be downloaded? Choose between [1, ..., {i}, n = skip]: ")
+        except EOFError:
+            choice = ""
+
+    if choice.isnumeric() and int(choice) > 0 and int(choice) < (i + 1):
+        return candidates[int(choice) - 1]
 
-    return download_uri
+    raise AssetException("Skipped resource download by user...")
@@ -0,0 +1,115 @@
+'''
+Workspace filesystem snapshot module
+'''
+
+import os
+from pathlib import Path
+from typing import Dict, Tuple
+
+# (is_file, is_dir)
+EntryType = Tuple[bool, bool]
+
+
+class WorkspaceSnapshot(object):
+    '''
+    In-memory snapshot of the directories touched during a run.
+
+    Each distinct directory is scanned once with os.scandir and
+    existence or type queries are then answered from memory.
+    Renames performed through the snapshot keep it up to date.
+    '''
+
+    def __init__(self) -> None:
+        self.__directories: Dict[str, Dict[str, EntryType]] = dict()
+
+    @staticmethod
+    def __key(path: Path) -> str:
+        return os.path.normcase(os.path.abspath(str(path)))
+
+    def __scan(self, directory: Path) -> Dict[str, EntryType]:
+        '''
+        Return the entries of the given directory, scanning it if never seen before
+        '''
+        key = self.__key(directory)
+
+        entries = self.__directories.get(key, None)
+        if entries is None:
+            entries = dict()
+            try:
+                with os.scandir(key) as iterator:
+                    for entry in iterator:
+                        try:
+                            entries[os.path.normcase(entry.name)] = (entry.is_file(), entry.is_dir())
+                        except OSError:
+                            continue
+            except OSError:
+                # missing or unreadable directories are empty
+                pass
+
+            self.__directories[key] = entries
+
+        return entries
+
+    def __entry(self, path: Path) -> EntryType:
+        path = Path(path)
+        return self.__scan(path.parent).get(os.path.normcase(path.name), (False, False))
+
+    def exists(self, path: Path) -> bool:
+        '''
+        Return whether the given path exists
+        '''
+        (is_file, is_dir) = self.__entry(path)
+        return is_file or is_dir
+
+    def is_file(self, path: Path) -> bool:
+        '''
+        Return whether the given path is an existing file
+        '''
+        return self.__entry(path)[0]
+
+    def is_dir(self, path: Path) -> bool:
+        '''
+        Return whether the given path is an existing directory
+        '''
+        return self.__entry(path)[1]
+
+    def rename(self, src: Path, dst: Path):
+        '''
+        Rename src to dst on disk and in the snapshot
+        '''
+        os.rename(str(src), str(dst))
+        self.moved(src, dst)
+
+    def moved(self, src: Path, dst: Path):
+        '''
+        Record in the snapshot that src has been moved to dst
+        '''
+        (src, dst) = (Path(src), Path(dst))
+
+        entry = self.__scan(src.parent).pop(os.path.normcase(src.name), None)
+        if entry is not None:
+            self.__scan(dst.parent)[os.path.normcase(dst.name)] = entry
+        else:
+            # the parent has been scanned after the move, its type is unknown
+            self.invalidate(dst.parent)
+
+        # if a directory has been moved, any snapshot of its content is stale
+        self.invalidate(src, recursive=True)
+
+    def invalidate(self, directory: Path, recursive: bool = False):
+        '''
+        Drop the snapshot of the given directory (and its subdirectories if recursive)
+        '''
+        key = self.__key(directory)
+        self.__directories.pop(key, None)
+
+        if recursive:
+            prefix = key.rstrip(os.sep) + os.sep
+            for _ in [_ for _ in self.__directories if _.startswith(prefix)]:
+                self.__directories.pop(_)
+
+    def clear(self):
+        '''
+        Drop the whole snapshot
+        '''
+        self.__directories.clear()
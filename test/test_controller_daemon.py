@@ -0,0 +1,192 @@
+'''
+Update daemon test module
+'''
+
+import json
+import os
+import socket
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+from requests import Response
+from yaam.controller.daemon import DaemonClient, UpdateDaemon, download_path_of
+from yaam.controller.update.results import UpdateResult
+from yaam.model.appcontext import GameContext
+from yaam.model.mutable.addon import Addon
+from yaam.model.mutable.addon_base import AddonBase
+from yaam.model.mutable.binding import Binding
+from yaam.model.mutable.metadata import AddonMetadata
+from yaam.model.type.binding import BindingType
+from yaam.utils.hashing import Hasher
+from yaam.utils.webasset import Asset, Release
+
+
+def make_context(root: Path) -> GameContext:
+    '''
+    Return a game context rooted in the given directory
+    '''
+    return GameContext(
+        game_root=root, yaam_game_dir=root, args_path=root / "arguments.json",
+        addons_path=root / "addons.json", settings_path=root / "settings.json",
+        naming_map_path=root / "naming_map.json", cache_dir=root / "cache", metadata_dir=root / "metadata"
+    )
+
+
+def make_addon(root: Path, name: str, uri: str) -> Addon:
+    '''
+    Return an enabled addon
+    '''
+    return Addon(
+        AddonBase(name, uri=uri),
+        Binding(name, root / "addons" / f"{name}.dll", enabled=True, updateable=True, binding_type=BindingType.AGNOSTIC),
+        dict()
+    )
+
+
+class RemoteStub(object):
+    '''
+    Http request manager stand-in advertising the remote contents
+    '''
+
+    def __init__(self, length: int, assets: list) -> None:
+        self.length = length
+        self.assets = assets
+
+    def head(self, url, **kwargs):  # pylint: disable=W0613
+        '''
+        HTTP HEAD
+        '''
+        response = Response()
+        response.status_code = 200
+        response.url = str(url)
+        response.headers['content-length'] = str(self.length)
+        return response
+
+    def get_downloadable_assets(self, url, **kwargs):  # pylint: disable=W0613
+        '''
+        Return the latest release
+        '''
+        return [Release("v1", "v1", "", False, False, self.assets)]
+
+
+class TestUpdateDaemon(unittest.TestCase):
+    '''
+    UpdateDaemon test class
+    '''
+
+    def setUp(self):
+        self.__tmp_dir = tempfile.TemporaryDirectory()
+        self.context = make_context(Path(self.__tmp_dir.name))
+        self.context.cache_dir.mkdir(parents=True)
+
+    def tearDown(self):
+        self.__tmp_dir.cleanup()
+
+    def test_client_without_daemon(self):
+        '''
+        Test 1
+        '''
+        client = DaemonClient(self.context.cache_dir, timeout=0.1)
+
+        self.assertIsNone(client.request("ping"))
+        self.assertEqual(client.fetch_updates([], None), dict())
+
+    def test_client_server_round_trip(self):
+        '''
+        Test 2
+        '''
+        daemon = UpdateDaemon(None, self.context, list, interval=60)
+        daemon.start()
+
+        try:
+            self.assertTrue(daemon.state_path.exists())
+
+            client = DaemonClient(self.context.cache_dir)
+
+            self.assertTrue(client.request("ping")['ok'])
+            self.assertFalse(client.request("unknown")['ok'])
+            # no update check has been completed yet
+            self.assertFalse(client.request("updates")['ok'])
+            self.assertEqual(client.fetch_updates([], None), dict())
+
+            self.assertEqual(daemon.poll([]), 0)
+            answer = client.request("updates")
+            self.assertTrue(answer['ok'])
+            self.assertEqual(answer['addons'], dict())
+        finally:
+            daemon.close()
+
+        self.assertFalse(daemon.state_path.exists())
+        self.assertIsNone(DaemonClient(self.context.cache_dir).request("ping"))
+
+    def test_requests_should_carry_the_token(self):
+        '''
+        Test 3
+        '''
+        daemon = UpdateDaemon(None, self.context, list, interval=60)
+        daemon.start()
+
+        try:
+            state = json.loads(daemon.state_path.read_text(encoding='utf-8'))
+            if os.name == 'posix':
+                self.assertEqual(daemon.state_path.stat().st_mode & 0o777, 0o600)
+
+            with socket.create_connection((state['host'], state['port']), timeout=1.0) as conn:
+                conn.sendall(b'{"command": "stop"}\n{"command": "stop", "token": "guess"}\n')
+                with conn.makefile('rb') as stream:
+                    answers = [json.loads(stream.readline()) for _ in range(2)]
+
+            self.assertEqual(answers, [{'ok': False, 'error': "Unauthorized"}] * 2)
+            self.assertTrue(DaemonClient(self.context.cache_dir).request("ping")['ok'])
+        finally:
+            daemon.close()
+
+    def test_downloads_should_match_the_remote(self):
+        '''
+        Test 4
+        '''
+        root = Path(self.__tmp_dir.name)
+        stream = make_addon(root, "Stream", "https://example.com/stream.dll")
+        release = make_addon(root, "Release", "https://api.github.com/repos/owner/release/releases/latest")
+        tampered = make_addon(root, "Tampered", "https://api.github.com/repos/owner/tampered/releases/latest")
+
+        content = b"update"
+        remote = RemoteStub(len(content), [
+            Asset("release.zip", "https://example.com/release.zip", len(content), f"sha256:{Hasher.SHA256.make_hash_from_bytes(content)}"),
+            Asset("tampered.zip", "https://example.com/tampered.zip", len(content), f"sha256:{Hasher.SHA256.make_hash_from_bytes(b'genuine')}"),
+        ])
+
+        daemon = UpdateDaemon(None, self.context, list, interval=60)
+        daemon.downloads_dir.mkdir(parents=True)
+
+        updates = dict()
+        for (addon, asset) in [(stream, ""), (release, "release.zip"), (tampered, "tampered.zip")]:
+            download_path_of(self.context.cache_dir, addon).write_bytes(content)
+            updates[addon.base.name] = {
+                'status': int(UpdateResult.TO_UPDATE),
+                'metadata': AddonMetadata(addon.base.name, asset=asset).to_json(),
+                # paths and hashes sent over the socket are ignored
+                'download': {'headers': {}, 'path': str(root / "elsewhere"), 'hash': "ignored"}
+            }
+
+        daemon.start()
+
+        try:
+            with mock.patch.object(daemon, "handle", lambda _: {'ok': True, 'polled_at': 0, 'interval': 1e12, 'addons': updates}):
+                client = DaemonClient(self.context.cache_dir)
+                prefetched = client.fetch_updates([stream, release, tampered], remote)
+
+                self.assertEqual(sorted(prefetched), ["Release", "Stream"])
+                self.assertEqual(prefetched["Release"][1].http_response.content, content)
+                self.assertEqual(prefetched["Release"][1].http_response.url, "https://example.com/release.zip")
+
+                # the remote content changed since the daemon downloaded it
+                remote.length += 1
+                self.assertEqual(client.fetch_updates([stream], remote), dict())
+        finally:
+            daemon.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
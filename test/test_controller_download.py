@@ -0,0 +1,162 @@
+'''
+Segmented downloads test module
+'''
+
+import os
+import re
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List
+from yaam.controller.download import SegmentedDownloader, split_segments
+from yaam.controller.http import HttpRequestManager
+from yaam.model.appconfig import AppConfig
+from yaam.utils.hashing import Hasher
+
+PAYLOAD = os.urandom(5 * 1024 + 17)
+
+
+class RangeRequestHandler(BaseHTTPRequestHandler):
+    '''
+    Serve the payload, honouring byte ranges if the server accepts them
+    '''
+
+    def log_message(self, format, *args):  # pylint: disable=W0622
+        pass
+
+    def __send_headers(self, status: int, length: int, content_range: str = None):
+        self.send_response(status)
+        self.send_header("Content-Length", str(length))
+        self.send_header("Content-Disposition", "attachment; filename=addon.zip")
+        self.send_header("ETag", "\"payload\"")
+        if self.server.accept_ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        if content_range is not None:
+            self.send_header("Content-Range", content_range)
+        self.end_headers()
+
+    def do_HEAD(self):  # pylint: disable=C0103
+        '''
+        HTTP HEAD
+        '''
+        self.server.requests.append(("HEAD", None))
+        self.__send_headers(200, len(PAYLOAD))
+
+    def do_GET(self):  # pylint: disable=C0103
+        '''
+        HTTP GET
+        '''
+        match = re.fullmatch(r"bytes=(\d+)-(\d+)", self.headers.get("Range", ""))
+        self.server.requests.append(("GET", self.headers.get("Range", None)))
+
+        if match is not None and self.server.accept_ranges and self.headers.get("If-Range", None) == "\"payload\"":
+            (start, end) = (int(match.group(1)), int(match.group(2)))
+            self.__send_headers(206, end - start + 1, f"bytes {start}-{end}/{len(PAYLOAD)}")
+            self.wfile.write(PAYLOAD[start:end + 1])
+        else:
+            self.__send_headers(200, len(PAYLOAD))
+            self.wfile.write(PAYLOAD)
+
+
+class TestSegmentedDownloader(unittest.TestCase):
+    '''
+    SegmentedDownloader test class
+    '''
+
+    def setUp(self):
+        self.__tmp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.__tmp_dir.name)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), RangeRequestHandler)
+        self.server.accept_ranges = True
+        self.server.requests: List[tuple] = list()
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/addon.zip"
+        self.http = HttpRequestManager(AppConfig())
+        self.downloader = SegmentedDownloader(self.http, segments=4, min_segment_size=1024, download_dir=self.root)
+
+    def tearDown(self):
+        self.http.close_sessions()
+        self.server.shutdown()
+        self.server.server_close()
+        self.__tmp_dir.cleanup()
+
+    def test_ranges_should_be_downloaded_in_parallel(self):
+        '''
+        Test 1
+        '''
+        digest = f"sha256:{Hasher.SHA256.make_hash_from_bytes(PAYLOAD)}"
+
+        response = self.downloader.get(self.url, len(PAYLOAD), digest, timeout=10)
+
+        self.assertEqual(response.content, PAYLOAD)
+        self.assertEqual(response.headers['content-disposition'], "attachment; filename=addon.zip")
+        self.assertEqual(
+            sorted(_[1] for _ in self.server.requests if _[0] == "GET"),
+            sorted(f"bytes={start}-{end}" for (start, end) in split_segments(len(PAYLOAD), 4))
+        )
+        self.assertEqual(list(self.root.iterdir()), [])
+
+    def test_servers_without_ranges_should_be_downloaded_as_a_stream(self):
+        '''
+        Test 2
+        '''
+        self.server.accept_ranges = False
+
+        response = self.downloader.get(self.url, len(PAYLOAD), timeout=10)
+
+        self.assertEqual(response.content, PAYLOAD)
+        self.assertEqual(self.server.requests, [("HEAD", None), ("GET", None)])
+
+    def test_downloads_should_be_verified(self):
+        '''
+        Test 3
+        '''
+        self.assertIsNone(self.downloader.get(self.url, len(PAYLOAD) + 1, timeout=10))
+        self.assertIsNone(self.downloader.get(self.url, None, f"sha256:{Hasher.SHA256.make_hash_from_bytes(b'other')}", timeout=10))
+        self.assertEqual(list(self.root.iterdir()), [])
+
+    def test_small_resources_should_not_be_probed(self):
+        '''
+        Test 4
+        '''
+        downloader = SegmentedDownloader(self.http, segments=4, min_segment_size=len(PAYLOAD), download_dir=self.root)
+
+        response = downloader.get(self.url, len(PAYLOAD), timeout=10)
+
+        self.assertEqual(response.content, PAYLOAD)
+        self.assertEqual(self.server.requests, [("GET", None)])
+
+        # the length of unknown sizes is probed
+        self.server.requests.clear()
+        self.assertEqual(downloader.get(self.url, None, timeout=10).content, PAYLOAD)
+        self.assertEqual(self.server.requests, [("HEAD", None), ("GET", None)])
+
+    def test_segments_should_cover_the_content(self):
+        '''
+        Test 5
+        '''
+        self.assertEqual(split_segments(10, 3), [(0, 3), (4, 7), (8, 9)])
+        self.assertEqual(split_segments(2, 4), [(0, 0), (1, 1)])
+        self.assertEqual(split_segments(5, 1), [(0, 4)])
+
+    def test_segmented_downloads_should_be_streamed_from_disk(self):
+        '''
+        Test 6
+        '''
+        response = self.downloader.get(self.url, len(PAYLOAD), timeout=10, stream=True)
+
+        # the content is read from the downloaded file only on demand
+        self.assertEqual(response.raw.read(), PAYLOAD)
+
+        response.close()
+        self.assertTrue(response.raw.closed)
+        self.assertEqual(list(self.root.iterdir()), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
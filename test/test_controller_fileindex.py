@@ -0,0 +1,158 @@
+'''
+Installed files index test module
+'''
+
+import os
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from yaam.controller.fileindex import InstalledFileIndex
+from yaam.controller.metastore import MetadataStore
+from yaam.model.mutable.addon import Addon
+from yaam.model.mutable.addon_base import AddonBase
+from yaam.model.mutable.binding import Binding
+from yaam.model.type.binding import BindingType
+from yaam.utils.hashing import Hasher
+
+
+def make_addon(name: str, path: Path) -> Addon:
+    '''
+    Return an enabled addon
+    '''
+    return Addon(AddonBase(name), Binding(name, path, enabled=True, updateable=True, binding_type=BindingType.AGNOSTIC), dict())
+
+
+class TestInstalledFileIndex(unittest.TestCase):
+    '''
+    InstalledFileIndex test class
+    '''
+
+    def setUp(self):
+        self.__tmp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.__tmp_dir.name)
+        self.store = MetadataStore(self.root / "metadata.db")
+        self.index = InstalledFileIndex(self.store)
+
+    def tearDown(self):
+        self.store.close()
+        self.__tmp_dir.cleanup()
+
+    def write(self, relative: str, content: str = "data") -> Path:
+        '''
+        Write a game file
+        '''
+        path = self.root / "game" / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
+        return path
+
+    def test_conflicts_should_be_detected(self):
+        '''
+        Test 1
+        '''
+        arcdps = make_addon("ArcDPS", self.root / "game" / "bin64" / "d3d11.dll")
+        reshade = make_addon("ReShade", self.root / "game" / "bin64" / "dxgi.dll")
+
+        self.assertEqual(self.index.record(arcdps, [self.write("bin64/d3d11.dll"), self.write("bin64/shared.ini")]), dict())
+
+        conflicts = self.index.record(reshade, [self.write("bin64/dxgi.dll"), self.write("bin64/shared.ini")])
+
+        self.assertEqual(conflicts, {self.root / "game" / "bin64" / "shared.ini": ["ArcDPS"]})
+        self.assertEqual(self.index.owners([self.root / "game" / "bin64" / "shared.ini"]).popitem()[1], ["ArcDPS", "ReShade"])
+        self.assertEqual([_.path.name for _ in self.index.files(arcdps)], ["d3d11.dll", "shared.ini"])
+
+    def test_files_dropped_by_an_update_should_be_removed(self):
+        '''
+        Test 2
+        '''
+        addon = make_addon("Overlay", self.root / "game" / "addons" / "overlay")
+
+        self.index.record(addon, [self.write("addons/overlay/overlay.dll"), self.write("addons/overlay/old.dll")])
+        modified = self.write("addons/overlay/old.ini")
+        self.index.record(addon, [self.write("addons/overlay/overlay.dll"), self.write("addons/overlay/old.dll"), modified])
+
+        modified.write_text("user edit", encoding='utf-8')
+        self.index.record(addon, [self.write("addons/overlay/overlay.dll", "v2")])
+
+        self.assertFalse((self.root / "game" / "addons" / "overlay" / "old.dll").exists())
+        self.assertTrue(modified.exists())
+        self.assertEqual([_.path.name for _ in self.index.files(addon)], ["overlay.dll"])
+
+    def test_uninstall_should_keep_modified_and_shared_files(self):
+        '''
+        Test 3
+        '''
+        overlay = make_addon("Overlay", self.root / "game" / "addons" / "overlay")
+        plugin = make_addon("Plugin", self.root / "game" / "addons" / "plugin.dll")
+
+        dll = self.write("addons/overlay/bin/overlay.dll")
+        config = self.write("addons/overlay/overlay.ini")
+        shared = self.write("addons/shared.dll")
+        self.index.record(overlay, [dll, config, shared])
+        self.index.record(plugin, [self.write("addons/plugin.dll"), shared])
+
+        config.write_text("user edit", encoding='utf-8')
+
+        (removed, kept) = self.index.uninstall(overlay)
+        self.assertEqual(removed, [dll])
+        self.assertEqual(sorted(kept), sorted([config, shared]))
+        self.assertFalse(dll.parent.exists())
+
+        (removed, kept) = self.index.uninstall(overlay, force=True)
+        self.assertEqual(removed, [config])
+        self.assertEqual(kept, [shared])
+        self.assertFalse((self.root / "game" / "addons" / "overlay").exists())
+        self.assertTrue(shared.exists())
+
+    def test_renames_should_be_followed(self):
+        '''
+        Test 4
+        '''
+        addon = make_addon("Overlay", self.root / "game" / "addons" / "overlay")
+        self.index.record(addon, [self.write("addons/overlay/overlay.dll")])
+
+        src = self.root / "game" / "addons" / "overlay"
+        dst = self.root / "game" / "addons" / "overlay_0"
+        os.rename(src, dst)
+        self.index.move(src, dst)
+
+        files = self.index.files(addon)
+        self.assertEqual([_.path for _ in files], [dst / "overlay.dll"])
+        self.assertTrue(files[0].is_untouched())
+
+    def test_digests_should_be_checked_with_their_algorithm(self):
+        '''
+        Test 5
+        '''
+        legacy_path = self.root / "legacy.db"
+        with sqlite3.connect(str(legacy_path)) as connection:
+            connection.execute(
+                "CREATE TABLE files (owner TEXT NOT NULL, key TEXT NOT NULL, path TEXT NOT NULL, "
+                "size INTEGER, mtime_ns INTEGER, digest TEXT, PRIMARY KEY (owner, key))"
+            )
+            connection.execute("INSERT INTO files VALUES ('agnostic:ArcDPS', 'k', 'p', 0, 0, 'd')")
+        connection.close()
+
+        legacy = MetadataStore(legacy_path)
+        self.assertEqual(legacy.get_files("agnostic:ArcDPS"), [('k', 'p', 0, 0, 'd', 'sha256')])
+        legacy.close()
+
+        addon = make_addon("Overlay", self.root / "game" / "addons" / "overlay")
+        dll = self.write("addons/overlay/overlay.dll")
+        InstalledFileIndex(self.store, Hasher.BLAKE2B).record(addon, [dll])
+
+        [file] = self.index.files(addon)
+        self.assertEqual(file.algorithm, Hasher.BLAKE2B)
+        self.assertEqual(file.digest, Hasher.BLAKE2B.make_hash_from_file(dll))
+
+        stat = dll.stat()
+        os.utime(dll, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertTrue(file.is_unchanged())
+
+        dll.write_text("tampered", encoding='utf-8')
+        self.assertFalse(file.is_unchanged())
+
+
+if __name__ == '__main__':
+    unittest.main()
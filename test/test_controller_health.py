@@ -0,0 +1,137 @@
+'''
+Remote hosts health tracking test module
+'''
+
+import tempfile
+import time
+import unittest
+from datetime import timedelta
+from pathlib import Path
+from typing import List
+from requests import ConnectionError as RequestsConnectionError, Response
+from requests.adapters import BaseAdapter
+from yaam.controller.health import HostHealthTracker
+from yaam.controller.http import HttpRequestManager
+from yaam.model.appconfig import AppConfig
+from yaam.utils.json.io import read_json, write_json
+
+
+class ScriptedAdapter(BaseAdapter):
+    '''
+    Transport adapter answering with the given status codes in order (None raising a connection error),
+    recording the timeouts of every request
+    '''
+
+    def __init__(self, statuses: List[int], elapsed: float = 0.2) -> None:
+        super().__init__()
+        self.statuses = list(statuses)
+        self.elapsed = elapsed
+        self.timeouts = list()
+
+    def send(self, request, **kwargs):  # pylint: disable=W0221
+        self.timeouts.append(kwargs.get('timeout', None))
+
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        if status is None:
+            raise RequestsConnectionError(f"{request.url} is unreachable")
+
+        response = Response()
+        response.status_code = status
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(seconds=self.elapsed)
+        response._content = b"payload"  # pylint: disable=W0212
+        return response
+
+    def close(self):
+        pass
+
+
+class TestHostHealth(unittest.TestCase):
+    '''
+    HostHealthTracker test class
+    '''
+
+    def setUp(self):
+        self.__tmp_dir = tempfile.TemporaryDirectory()
+        self.state_path = Path(self.__tmp_dir.name) / "hosts.json"
+
+    def tearDown(self):
+        self.__tmp_dir.cleanup()
+
+    def test_unavailable_upstreams_should_be_retried(self):
+        '''
+        Test 1
+        '''
+        adapter = ScriptedAdapter([503, None, 200])
+
+        with HttpRequestManager(AppConfig(), health=HostHealthTracker(backoff=0)) as http:
+            http.mount("https://example.com/", adapter)
+
+            self.assertEqual(http.get("https://example.com/addon.zip").status_code, 200)
+            self.assertEqual(len(adapter.timeouts), 3)
+
+            # not found is an answer, not a failure
+            adapter.statuses = [404]
+            self.assertEqual(http.get("https://example.com/missing.zip").status_code, 404)
+            self.assertEqual(len(adapter.timeouts), 4)
+
+    def test_failing_hosts_should_be_skipped(self):
+        '''
+        Test 2
+        '''
+        dead = ScriptedAdapter([None])
+        alive = ScriptedAdapter([200])
+
+        with HttpRequestManager(AppConfig(), health=HostHealthTracker(self.state_path, backoff=0)) as http:
+            http.mount("https://dead.example.com/", dead)
+            http.mount("https://example.com/", alive)
+
+            self.assertIsNone(http.get("https://dead.example.com/a.zip"))
+            self.assertIsNone(http.head("https://dead.example.com/b.zip"))
+            self.assertEqual(len(dead.timeouts), 3)
+
+            self.assertEqual(http.get("https://example.com/a.zip").status_code, 200)
+
+        # skipped by the next runs as well, until the cooldown expires
+        self.assertTrue(HostHealthTracker(self.state_path).is_open("dead.example.com"))
+        self.assertFalse(HostHealthTracker(self.state_path).is_open("example.com"))
+
+        state = read_json(self.state_path)
+        state['hosts']['dead.example.com']['open_until'] = time.time() - 1
+        write_json(state, self.state_path)
+
+        tracker = HostHealthTracker(self.state_path)
+        self.assertFalse(tracker.is_open("dead.example.com"))
+        self.assertTrue(tracker.failure("dead.example.com"))
+
+    def test_timeouts_should_adapt_to_the_host_latency(self):
+        '''
+        Test 3
+        '''
+        tracker = HostHealthTracker(min_timeout=1.0, max_timeout=120.0, connect_timeout=5.0)
+
+        self.assertEqual(tracker.timeout("example.com"), (5.0, 120.0))
+        self.assertEqual(tracker.timeout("example.com", 30), (5.0, 30.0))
+
+        for _ in range(20):
+            tracker.success("example.com", 0.5)
+            tracker.success("slow.example.com", 10.0)
+
+        (_, timeout) = tracker.timeout("example.com")
+        self.assertEqual(timeout, 1.0)
+
+        (_, timeout) = tracker.timeout("slow.example.com")
+        self.assertGreaterEqual(timeout, 10.0)
+        self.assertLess(timeout, 20.0)
+
+        adapter = ScriptedAdapter([200], elapsed=0.5)
+        with HttpRequestManager(AppConfig(), health=tracker) as http:
+            http.mount("https://example.com/", adapter)
+            http.get("https://example.com/addon.zip", timeout=120)
+
+        self.assertEqual(adapter.timeouts, [(1.0, 1.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+'''
+Http request manager test module
+'''
+
+import unittest
+from requests import Response
+from requests.adapters import BaseAdapter
+from yaam.controller.http import HttpRequestManager
+from yaam.model.appconfig import AppConfig
+
+
+class CountingAdapter(BaseAdapter):
+    '''
+    Transport adapter answering every request locally and counting them
+    '''
+
+    def __init__(self, status_code: int = 200) -> None:
+        super().__init__()
+        self.status_code = status_code
+        self.sent = 0
+
+    def send(self, request, **kwargs):  # pylint: disable=W0221
+        self.sent += 1
+
+        response = Response()
+        response.status_code = self.status_code
+        response.url = request.url
+        response.request = request
+        response._content = b"payload"  # pylint: disable=W0212
+        return response
+
+    def close(self):
+        pass
+
+
+class TestHttpRequestManager(unittest.TestCase):
+    '''
+    HttpRequestManager test class
+    '''
+
+    def test_memoized_requests(self):
+        '''
+        Test 1
+        '''
+        adapter = CountingAdapter()
+
+        with HttpRequestManager(AppConfig(), memoize=True) as http:
+            http.mount("https://example.com/", adapter)
+            http.mount("https://api.github.com/", adapter)
+
+            first = http.head("https://example.com/addon.zip", timeout=10)
+            second = http.head("https://example.com/addon.zip", timeout=10)
+            self.assertIs(first, second)
+            self.assertEqual(adapter.sent, 1)
+
+            # different arguments and methods are different requests
+            http.head("https://example.com/addon.zip", timeout=20)
+            http.get("https://api.github.com/repos/owner/repo/releases/latest", timeout=10)
+            http.get("https://api.github.com/repos/owner/repo/releases/latest", timeout=10)
+            http.get("https://api.github.com/repos/owner/repo/releases/latest", stream=True)
+            self.assertEqual(adapter.sent, 4)
+
+            # downloaded contents are not kept
+            http.get("https://example.com/addon.zip", timeout=10)
+            http.get("https://example.com/addon.zip", timeout=10)
+            self.assertEqual(adapter.sent, 6)
+
+    def test_failed_requests_are_not_memoized(self):
+        '''
+        Test 2
+        '''
+        adapter = CountingAdapter(status_code=404)
+
+        with HttpRequestManager(AppConfig(), memoize=True) as http:
+            http.mount("https://example.com/", adapter)
+
+            http.get("https://example.com/addon.zip")
+            http.get("https://example.com/addon.zip")
+            self.assertEqual(adapter.sent, 2)
+
+    def test_no_memoization_by_default(self):
+        '''
+        Test 3
+        '''
+        adapter = CountingAdapter()
+
+        with HttpRequestManager(AppConfig()) as http:
+            http.mount("https://example.com/", adapter)
+
+            http.get("https://example.com/addon.zip")
+            http.get("https://example.com/addon.zip")
+            self.assertEqual(adapter.sent, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
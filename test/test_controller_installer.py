@@ -0,0 +1,65 @@
+'''
+Installer executor test module
+'''
+
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from yaam.controller.update.installer import InstallerExecutor
+from yaam.controller.update.results import UpdateResult
+from yaam.model.mutable.addon import Addon
+from yaam.model.mutable.addon_base import AddonBase
+from yaam.model.mutable.binding import Binding
+
+
+@unittest.skipIf(os.name == 'nt', "installers are stood in by shell scripts")
+class TestInstallerExecutor(unittest.TestCase):
+    '''
+    InstallerExecutor test class
+    '''
+
+    def setUp(self):
+        self.__tmp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.__tmp_dir.name)
+        self.addon = Addon(AddonBase("Installer"), Binding("Installer", self.root / "addon.exe"), dict())
+
+    def tearDown(self):
+        self.__tmp_dir.cleanup()
+
+    def make_installer(self, script: str) -> Path:
+        '''
+        Return an executable installer running the given shell script
+        '''
+        path = self.root / "installer.sh"
+        path.write_text(f"#!/bin/sh\n{script}\n", encoding='utf-8')
+        path.chmod(0o755)
+        return path
+
+    def test_exit_codes(self):
+        '''
+        Test 1
+        '''
+        executor = InstallerExecutor(timeout=10)
+
+        self.assertIs(executor.install(self.make_installer("exit 0"), self.root, self.addon), UpdateResult.NONE)
+        self.assertIs(executor.install(self.make_installer("exit 3"), self.root, self.addon), UpdateResult.INSTALLER_FAILED)
+        self.assertIs(executor.install(self.root / "missing.exe", self.root, self.addon), UpdateResult.INSTALLER_FAILED)
+
+    def test_hung_installer_should_be_killed(self):
+        '''
+        Test 2
+        '''
+        executor = InstallerExecutor(timeout=0.5)
+
+        start = time.monotonic()
+        result = executor.install(self.make_installer("exec sleep 30"), self.root, self.addon)
+
+        self.assertIs(result, UpdateResult.INSTALLER_TIMEOUT)
+        self.assertTrue(result.is_failure)
+        self.assertLess(time.monotonic() - start, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+'''
+Metadata store test module
+'''
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from yaam.controller.metadata import MetadataCollector
+from yaam.controller.metastore import MetadataStore
+from yaam.model.appcontext import GameContext
+from yaam.model.mutable.addon import Addon
+from yaam.model.mutable.addon_base import AddonBase
+from yaam.model.mutable.binding import Binding
+from yaam.utils.hashing import Hasher
+
+
+class TestMetadataStore(unittest.TestCase):
+    '''
+    MetadataStore test class
+    '''
+
+    def setUp(self):
+        self.__tmp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.__tmp_dir.name)
+        self.store = MetadataStore(self.root / "metadata" / "metadata.db")
+
+    def tearDown(self):
+        self.store.close()
+        self.__tmp_dir.cleanup()
+
+    def test_batched_reads_and_writes(self):
+        '''
+        Test 1
+        '''
+        self.store.put_many((f"addon_{i}", {'addon': f"addon_{i}", 'etag': str(i)}) for i in range(1200))
+        self.store.put("addon_0", {'addon': "addon_0", 'etag': "updated"})
+
+        stored = self.store.get_many(f"addon_{i}" for i in range(0, 1300, 100))
+
+        self.assertEqual(len(stored), 12)
+        self.assertEqual(stored["addon_0"]['etag'], "updated")
+        self.assertEqual(stored["addon_1100"]['etag'], "1100")
+        self.assertIsNone(self.store.get("addon_1200"))
+
+    def test_migrations_run_once(self):
+        '''
+        Test 2
+        '''
+        runs = []
+
+        self.assertTrue(self.store.migrate("test", lambda: runs.append(1)))
+        self.assertFalse(self.store.migrate("test", lambda: runs.append(1)))
+
+        self.store.close()
+        self.assertFalse(MetadataStore(self.store.path).migrate("test", lambda: runs.append(1)))
+        self.assertEqual(len(runs), 1)
+
+    def test_json_files_migration(self):
+        '''
+        Test 3
+        '''
+        context = GameContext(
+            game_root=self.root, yaam_game_dir=self.root, args_path=self.root / "arguments.json",
+            addons_path=self.root / "addons.json", settings_path=self.root / "settings.json",
+            naming_map_path=self.root / "naming_map.json", cache_dir=self.root / "cache", metadata_dir=self.root / "metadata"
+        )
+        addon = Addon(AddonBase("Arc DPS"), Binding("Arc DPS", self.root / "bin64" / "d3d11.dll"), dict())
+
+        # metadata file written by previous versions
+        bucket = context.metadata_dir / Hasher.SHA256.make_hash_from_string(str(addon.binding.path))
+        bucket.mkdir(parents=True)
+        (bucket / "metadata_arc_dps.json").write_text(json.dumps({'addon': "Arc DPS", 'hash_signature': "abc", 'etag': "v1"}))
+
+        collector = MetadataCollector(None, context, store=self.store)
+        collector.load_local_metadata([addon])
+
+        local = collector.get_local_metadata(addon)
+        self.assertEqual(local.etag, "v1")
+
+        local.etag = "v2"
+        collector.save_local_metadata()
+
+        # the store is the only source from now on
+        (bucket / "metadata_arc_dps.json").unlink()
+        collector.load_local_metadata([addon])
+        self.assertEqual(collector.get_local_metadata(addon).etag, "v2")
+
+
+if __name__ == '__main__':
+    unittest.main()
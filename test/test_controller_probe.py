@@ -0,0 +1,177 @@
+'''
+Remote probe test module
+'''
+
+import io
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from requests import Response
+from requests.adapters import BaseAdapter
+from yaam.controller.health import HostHealthTracker
+from yaam.controller.http import HttpRequestManager
+from yaam.controller.probe import FAILURES_TTL, MAX_FAILURES, ProbeStrategy, RemoteProbe
+from yaam.model.appconfig import AppConfig
+from yaam.model.mutable.metadata import AddonMetadata
+from yaam.utils.route import classify
+
+LAST_MODIFIED = "Wed, 21 Oct 2015 07:28:00 GMT"
+
+
+class OriginAdapter(BaseAdapter):
+    '''
+    Transport adapter standing in for an origin with slow HEAD requests
+    '''
+
+    def __init__(self, head_latency: float = 0.05, supports_ranges: bool = True, errors: int = 0) -> None:
+        super().__init__()
+        self.head_latency = head_latency
+        self.supports_ranges = supports_ranges
+        self.errors = errors
+        self.methods = []
+
+    def send(self, request, **kwargs):  # pylint: disable=W0221
+        response = Response()
+        response.url = request.url
+        response.request = request
+        response.status_code = 200
+        response.headers['last-modified'] = LAST_MODIFIED
+        response.raw = io.BytesIO(b"")
+
+        if self.errors > 0:
+            self.errors -= 1
+            response.status_code = 503
+            self.methods.append("ERROR")
+        elif request.method == "HEAD":
+            time.sleep(self.head_latency)
+            self.methods.append("HEAD")
+        elif request.headers.get('if-modified-since', None) == LAST_MODIFIED:
+            response.status_code = 304
+            del response.headers['last-modified']
+            self.methods.append("CONDITIONAL")
+        elif 'range' in request.headers and self.supports_ranges:
+            response.status_code = 206
+            self.methods.append("RANGE")
+        else:
+            self.methods.append("GET")
+
+        return response
+
+    def close(self):
+        pass
+
+
+class TestRemoteProbe(unittest.TestCase):
+    '''
+    RemoteProbe test class
+    '''
+
+    def setUp(self):
+        self.__tmp_dir = tempfile.TemporaryDirectory()
+        self.stats_path = Path(self.__tmp_dir.name) / "probes.json"
+        self.route = classify("https://example.com/d3d11.dll")
+
+    def tearDown(self):
+        self.__tmp_dir.cleanup()
+
+    def test_cheapest_strategy_should_be_learned(self):
+        '''
+        Test 1
+        '''
+        adapter = OriginAdapter()
+
+        with HttpRequestManager(AppConfig()) as http:
+            http.mount("https://example.com/", adapter)
+
+            probe = RemoteProbe(http, self.stats_path)
+            for _ in range(4):
+                self.assertEqual(probe.probe(self.route)['last-modified'], LAST_MODIFIED)
+            probe.save()
+
+            # the learned preference persists across runs
+            self.assertEqual(RemoteProbe(http, self.stats_path).strategies("example.com")[0], ProbeStrategy.RANGE)
+
+    def test_unsupported_ranges_should_fall_back(self):
+        '''
+        Test 2
+        '''
+        adapter = OriginAdapter(head_latency=0, supports_ranges=False)
+
+        with HttpRequestManager(AppConfig()) as http:
+            http.mount("https://example.com/", adapter)
+
+            probe = RemoteProbe(http, self.stats_path)
+            for _ in range(4):
+                self.assertEqual(probe.probe(self.route)['last-modified'], LAST_MODIFIED)
+
+            self.assertNotIn(ProbeStrategy.RANGE, probe.strategies("example.com"))
+            self.assertEqual(adapter.methods[-1], "HEAD")
+
+    def test_conditional_probe_should_keep_validators(self):
+        '''
+        Test 3
+        '''
+        adapter = OriginAdapter()
+        local = AddonMetadata(addon="ArcDPS", last_modified=LAST_MODIFIED)
+
+        with HttpRequestManager(AppConfig()) as http:
+            http.mount("https://example.com/", adapter)
+
+            probe = RemoteProbe(http)
+            strategies = probe.strategies("example.com", local)
+            self.assertIn(ProbeStrategy.CONDITIONAL, strategies)
+            self.assertNotIn(ProbeStrategy.CONDITIONAL, probe.strategies("example.com"))
+
+            # explore until the conditional request is sent
+            for _ in range(len(strategies) * 2):
+                headers = probe.probe(self.route, local)
+                self.assertEqual(headers['last-modified'], LAST_MODIFIED)
+
+            self.assertIn("CONDITIONAL", adapter.methods)
+
+    def test_transient_errors_should_not_discard_strategies(self):
+        '''
+        Test 4
+        '''
+        adapter = OriginAdapter(head_latency=0, errors=MAX_FAILURES * 2)
+        health = HostHealthTracker(failure_threshold=MAX_FAILURES * 3, retries=0)
+
+        with HttpRequestManager(AppConfig(), health=health) as http:
+            http.mount("https://example.com/", adapter)
+
+            probe = RemoteProbe(http, self.stats_path)
+            for _ in range(MAX_FAILURES):
+                self.assertIsNone(probe.probe(self.route))
+
+            self.assertEqual(adapter.methods, ["ERROR"] * MAX_FAILURES * 2)
+            self.assertEqual(probe.strategies("example.com"), [ProbeStrategy.HEAD, ProbeStrategy.RANGE])
+            self.assertEqual(probe.probe(self.route)['last-modified'], LAST_MODIFIED)
+
+    def test_rejected_strategies_should_be_retried_after_a_while(self):
+        '''
+        Test 5
+        '''
+        adapter = OriginAdapter(head_latency=0, supports_ranges=False)
+
+        with HttpRequestManager(AppConfig()) as http:
+            http.mount("https://example.com/", adapter)
+
+            probe = RemoteProbe(http, self.stats_path)
+            for _ in range(4):
+                probe.probe(self.route)
+            probe.save()
+
+            self.assertNotIn(ProbeStrategy.RANGE, RemoteProbe(http, self.stats_path).strategies("example.com"))
+
+            # the host rejected ranges long ago
+            stats = json.loads(self.stats_path.read_text(encoding='utf-8'))
+            stats['example.com'][ProbeStrategy.RANGE.value]['updated'] -= FAILURES_TTL + 1
+            self.stats_path.write_text(json.dumps(stats), encoding='utf-8')
+
+            self.assertIn(ProbeStrategy.RANGE, RemoteProbe(http, self.stats_path).strategies("example.com"))
+
+
+if __name__ == '__main__':
+    unittest.main()
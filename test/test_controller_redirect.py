@@ -0,0 +1,130 @@
+'''
+Redirect targets cache test module
+'''
+
+import base64
+import json
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from requests import Response
+from requests.adapters import BaseAdapter
+from yaam.controller.http import HttpRequestManager
+from yaam.controller.redirect import PERMANENT_TTL, RedirectCache, redirect_expiry, signed_url_expiry
+from yaam.model.appconfig import AppConfig
+
+SOURCE = "https://github.com/owner/addon/releases/download/v1.0.0/addon.zip"
+TARGET = "https://objects.githubusercontent.com/release/addon.zip?sp=r&se={}&sig=abc"
+
+
+def make_target(expiry: datetime) -> str:
+    '''
+    Return a signed target url expiring at the given time
+    '''
+    return TARGET.format(expiry.strftime("%Y-%m-%dT%H:%M:%SZ"))
+
+
+class RouteAdapter(BaseAdapter):
+    '''
+    Transport adapter answering (status, location) per url, recording the requests
+    '''
+
+    def __init__(self, routes: dict) -> None:
+        super().__init__()
+        self.routes = routes
+        self.sent = list()
+
+    def send(self, request, **kwargs):  # pylint: disable=W0221
+        self.sent.append((request.method, request.url))
+
+        (status, location) = self.routes.get(request.url, (404, None))
+
+        response = Response()
+        response.status_code = status
+        response.url = request.url
+        response.request = request
+        if location is not None:
+            response.headers['location'] = location
+        response._content = b"payload" if status == 200 and request.method == "GET" else b""  # pylint: disable=W0212
+        return response
+
+    def close(self):
+        pass
+
+
+class TestRedirectCache(unittest.TestCase):
+    '''
+    RedirectCache test class
+    '''
+
+    def test_expiry_should_be_read_from_the_signature(self):
+        '''
+        Test 1
+        '''
+        now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        epoch = now.timestamp()
+
+        self.assertEqual(signed_url_expiry(make_target(now)), epoch)
+        self.assertEqual(signed_url_expiry("https://s3.example.com/a.zip?X-Amz-Date=20240101T000000Z&X-Amz-Expires=300"), epoch + 300)
+        self.assertEqual(signed_url_expiry(f"https://cdn.example.com/a.zip?Expires={int(epoch)}&Signature=abc"), epoch)
+
+        claims = base64.urlsafe_b64encode(json.dumps({'exp': int(epoch)}).encode()).decode().rstrip("=")
+        self.assertEqual(signed_url_expiry(f"https://release-assets.example.com/a.zip?jwt=header.{claims}.sig"), epoch)
+
+        self.assertIsNone(signed_url_expiry("https://example.com/a.zip?version=1"))
+
+        self.assertEqual(redirect_expiry(301, "https://example.com/b.zip", {}, now=epoch), epoch + PERMANENT_TTL)
+        self.assertIsNone(redirect_expiry(302, "https://example.com/b.zip", {}, now=epoch))
+        self.assertEqual(redirect_expiry(302, "https://example.com/b.zip", {'cache-control': "max-age=60"}, now=epoch), epoch + 60)
+        self.assertIsNone(redirect_expiry(302, "https://example.com/b.zip", {'cache-control': "no-store, max-age=60"}, now=epoch))
+
+    def test_valid_targets_should_be_requested_directly(self):
+        '''
+        Test 2
+        '''
+        target = make_target(datetime.now(timezone.utc) + timedelta(minutes=5))
+        adapter = RouteAdapter({SOURCE: (302, target), target: (200, None)})
+
+        with HttpRequestManager(AppConfig()) as http:
+            http.mount("https://", adapter)
+
+            self.assertEqual(http.get(SOURCE).content, b"payload")
+            self.assertEqual(http.head(SOURCE, allow_redirects=True).url, target)
+            self.assertEqual(http.get(SOURCE, stream=True).url, target)
+
+            # redirects are not followed unless allowed, as requests does
+            self.assertEqual(http.head(SOURCE).status_code, 302)
+
+        self.assertEqual(adapter.sent, [
+            ("GET", SOURCE), ("GET", target), ("HEAD", target), ("GET", target), ("HEAD", SOURCE)
+        ])
+
+    def test_expired_and_stale_targets_should_not_be_used(self):
+        '''
+        Test 3
+        '''
+        expiring = make_target(datetime.now(timezone.utc) + timedelta(seconds=10))
+        cache = RedirectCache()
+
+        self.assertFalse(cache.record(SOURCE, 302, expiring, {}))
+        self.assertEqual(cache.resolve(SOURCE), SOURCE)
+
+        target = make_target(datetime.now(timezone.utc) + timedelta(minutes=5))
+        renewed = make_target(datetime.now(timezone.utc) + timedelta(minutes=10))
+        self.assertTrue(cache.record(SOURCE, 302, target, {}))
+
+        # revoked before its expiry
+        adapter = RouteAdapter({SOURCE: (302, renewed), target: (403, None), renewed: (200, None)})
+
+        with HttpRequestManager(AppConfig(), redirects=cache) as http:
+            http.mount("https://", adapter)
+
+            self.assertEqual(http.get(SOURCE).content, b"payload")
+
+        self.assertEqual(adapter.sent, [("GET", target), ("GET", SOURCE), ("GET", renewed)])
+        self.assertEqual(cache.resolve(SOURCE), renewed)
+        self.assertLess(time.time(), signed_url_expiry(renewed))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,260 @@
+'''
+Rename plan test module
+'''
+
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+from yaam.controller.manage import AddonManager
+from yaam.controller.rename import RenamePlan
+from yaam.model.mutable.addon import Addon
+from yaam.model.mutable.addon_base import AddonBase
+from yaam.model.mutable.binding import Binding
+from yaam.model.mutable.metadata import AddonMetadata
+from yaam.model.type.binding import BindingType
+from yaam.utils.workspace import WorkspaceSnapshot
+
+
+class RecordingMetadata(object):
+    '''
+    Metadata collector stand-in recording the saved metadata
+    '''
+
+    def __init__(self, journal: Path, metadata: dict) -> None:
+        self.journal = journal
+        self.metadata = metadata
+        self.saved = []
+        self.moved = []
+        self.installed_files = self
+
+    def get_local_metadata(self, addon: Addon) -> AddonMetadata:
+        '''
+        Return the addon metadata
+        '''
+        return self.metadata[addon.base.name]
+
+    def move(self, src: Path, dst: Path):
+        '''
+        Record the moved installed file
+        '''
+        self.moved.append((src.name, dst.name, self.journal.exists()))
+
+    def save_metadata_batch(self, metadata):
+        '''
+        Record the saved metadata, and whether the journal was still there
+        '''
+        self.saved.extend((_.addon, self.journal.exists()) for _ in metadata)
+
+
+def make_renamed_addon(root: Path, name: str, prev_rule: str, new_rule: str) -> tuple:
+    '''
+    Return an addon whose naming changed from prev_rule to new_rule, with its metadata
+    '''
+    addon = Addon(
+        AddonBase(name),
+        Binding(name, root / new_rule, enabled=True, updateable=True, binding_type=BindingType.AGNOSTIC),
+        {'main': new_rule}
+    )
+    metadata = AddonMetadata(name, uri=name, naming_map={BindingType.AGNOSTIC: {'main': prev_rule}})
+    return (addon, metadata)
+
+
+class TestRenamePlan(unittest.TestCase):
+    '''
+    RenamePlan test class
+    '''
+
+    def setUp(self):
+        self.__tmp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.__tmp_dir.name)
+        self.journal = self.root / "cache" / "renames.journal"
+        for _ in ["a.dll", "b.dll", "b.dll_0"]:
+            (self.root / _).write_bytes(_.encode())
+
+    def tearDown(self):
+        self.__tmp_dir.cleanup()
+
+    def test_plan_should_deduplicate_and_reject_conflicts(self):
+        '''
+        Test 1
+        '''
+        plan = RenamePlan(WorkspaceSnapshot())
+
+        self.assertTrue(plan.add(self.root / "a.dll", self.root / "a.dll_0"))
+        self.assertFalse(plan.add(self.root / "a.dll", self.root / "a.dll_0"))
+        # target already exists
+        self.assertFalse(plan.add(self.root / "b.dll", self.root / "b.dll_0"))
+        # target already planned
+        self.assertFalse(plan.add(self.root / "b.dll", self.root / "a.dll_0"))
+        # chained renames are planned against the future state
+        self.assertTrue(plan.add(self.root / "b.dll", self.root / "a.dll"))
+
+        self.assertEqual(len(plan.operations), 2)
+        self.assertEqual(len(plan.conflicts), 2)
+        # nothing happened on disk yet
+        self.assertTrue((self.root / "a.dll").exists())
+
+    def test_applied_plan_should_be_committed(self):
+        '''
+        Test 2
+        '''
+        plan = RenamePlan(WorkspaceSnapshot())
+        plan.add(self.root / "a.dll", self.root / "a.dll_0")
+        plan.add(self.root / "b.dll", self.root / "a.dll")
+
+        self.assertEqual(plan.apply(self.journal), 2)
+        self.assertTrue(self.journal.exists())
+
+        RenamePlan.commit(self.journal)
+
+        self.assertFalse(self.journal.exists())
+        self.assertEqual((self.root / "a.dll_0").read_bytes(), b"a.dll")
+        self.assertEqual((self.root / "a.dll").read_bytes(), b"b.dll")
+        self.assertEqual(RenamePlan.recover(self.journal), 0)
+
+    def test_interrupted_plan_should_be_rolled_back(self):
+        '''
+        Test 3
+        '''
+        plan = RenamePlan(WorkspaceSnapshot())
+        plan.add(self.root / "a.dll", self.root / "a.dll_0")
+        plan.add(self.root / "b.dll", self.root / "a.dll")
+        plan.apply(self.journal)
+
+        # the run is interrupted before committing
+        self.assertEqual(RenamePlan.recover(self.journal), 2)
+
+        self.assertFalse(self.journal.exists())
+        self.assertEqual((self.root / "a.dll").read_bytes(), b"a.dll")
+        self.assertEqual((self.root / "b.dll").read_bytes(), b"b.dll")
+        self.assertFalse((self.root / "a.dll_0").exists())
+
+    def test_renames_interrupted_before_being_confirmed_should_be_checked(self):
+        '''
+        Test 4
+        '''
+        plan = RenamePlan(WorkspaceSnapshot())
+        plan.add(self.root / "a.dll", self.root / "a.dll_0")
+        plan.add(self.root / "b.dll", self.root / "a.dll")
+        plan.apply(self.journal)
+
+        # the run is interrupted right after the last rename
+        lines = self.journal.read_text(encoding='utf-8').splitlines(keepends=True)
+        self.assertEqual(lines[-2:], ['{"applying": 1}\n', '{"applied": 1}\n'])
+        self.journal.write_text("".join(lines[:-1]), encoding='utf-8')
+
+        self.assertEqual(RenamePlan.recover(self.journal), 2)
+        self.assertEqual((self.root / "a.dll").read_bytes(), b"a.dll")
+        self.assertEqual((self.root / "b.dll").read_bytes(), b"b.dll")
+
+        # the run is interrupted right before the last rename
+        plan = RenamePlan(WorkspaceSnapshot())
+        plan.add(self.root / "a.dll", self.root / "a.dll_0")
+        plan.add(self.root / "b.dll", self.root / "a.dll")
+        plan.apply(self.journal)
+        (self.root / "a.dll").rename(self.root / "b.dll")
+        self.journal.write_text("".join(lines[:-1]), encoding='utf-8')
+
+        self.assertEqual(RenamePlan.recover(self.journal), 1)
+        self.assertEqual((self.root / "a.dll").read_bytes(), b"a.dll")
+        self.assertEqual((self.root / "b.dll").read_bytes(), b"b.dll")
+
+    def test_case_changes_should_be_rolled_back(self):
+        '''
+        Test 5
+        '''
+        plan = RenamePlan(WorkspaceSnapshot())
+        plan.add(self.root / "a.dll", self.root / "A.dll")
+        plan.apply(self.journal)
+
+        # as on a case-insensitive file system, where both names exist
+        with mock.patch("os.path.normcase", str.lower):
+            self.assertEqual(RenamePlan.recover(self.journal), 1)
+
+        self.assertEqual(sorted(_.name for _ in self.root.iterdir()), ["a.dll", "b.dll", "b.dll_0", "cache"])
+
+
+class TestAddonManagerRenames(unittest.TestCase):
+    '''
+    AddonManager renames test class
+    '''
+
+    def setUp(self):
+        self.__tmp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.__tmp_dir.name)
+        self.journal = self.root / "cache" / "renames.journal"
+
+    def tearDown(self):
+        self.__tmp_dir.cleanup()
+
+    def make_manager(self, *addons: tuple) -> tuple:
+        '''
+        Return the manager of the given (addon, metadata) pairs, with its metadata collector
+        '''
+        collector = RecordingMetadata(self.journal, dict((a.base.name, m) for (a, m) in addons))
+        return (AddonManager(collector, None, BindingType.D3D11, journal_path=self.journal), collector)
+
+    def test_namings_should_follow_the_applied_renames(self):
+        '''
+        Test 1
+        '''
+        (renamed, renamed_meta) = make_renamed_addon(self.root, "Renamed", "old.dll", "new.dll")
+        (missing, missing_meta) = make_renamed_addon(self.root, "Missing", "gone.dll", "other.dll")
+        (self.root / "old.dll").write_bytes(b"dll")
+
+        (manager, collector) = self.make_manager((renamed, renamed_meta), (missing, missing_meta))
+
+        self.assertEqual(manager.resolve_renames([renamed, missing]), 1)
+        self.assertEqual(manager.apply_renames(), 1)
+
+        self.assertTrue((self.root / "new.dll").exists())
+        self.assertEqual(renamed_meta.namings[BindingType.AGNOSTIC], {'main': "new.dll"})
+        # nothing to rename, nothing to record
+        self.assertEqual(missing_meta.namings[BindingType.AGNOSTIC], {'main': "gone.dll"})
+        # the journal is committed before the renames are recorded
+        self.assertEqual(collector.moved, [("old.dll", "new.dll", False)])
+        self.assertEqual(collector.saved, [("Renamed", False)])
+
+    def test_rolled_back_renames_should_restore_the_namings(self):
+        '''
+        Test 2
+        '''
+        (first, first_meta) = make_renamed_addon(self.root, "First", "a.dll", "a2.dll")
+        (second, second_meta) = make_renamed_addon(self.root, "Second", "b.dll", "b2.dll")
+        for _ in ["a.dll", "b.dll"]:
+            (self.root / _).write_bytes(b"dll")
+
+        (manager, collector) = self.make_manager((first, first_meta), (second, second_meta))
+
+        self.assertEqual(manager.resolve_renames([first, second]), 2)
+
+        # removed between planning and applying
+        (self.root / "b.dll").unlink()
+
+        self.assertEqual(manager.apply_renames(), 0)
+
+        self.assertTrue((self.root / "a.dll").exists())
+        self.assertEqual(first_meta.namings[BindingType.AGNOSTIC], {'main': "a.dll"})
+        self.assertEqual(second_meta.namings[BindingType.AGNOSTIC], {'main': "b.dll"})
+        self.assertEqual(collector.moved, [])
+        self.assertEqual(collector.saved, [])
+
+    def test_files_already_renamed_should_update_the_namings(self):
+        '''
+        Test 3
+        '''
+        (addon, metadata) = make_renamed_addon(self.root, "Renamed", "old.dll", "new.dll")
+        (self.root / "new.dll").write_bytes(b"dll")
+
+        (manager, collector) = self.make_manager((addon, metadata))
+
+        self.assertEqual(manager.resolve_renames([addon]), 1)
+        self.assertEqual(manager.apply_renames(), 0)
+
+        self.assertEqual(metadata.namings[BindingType.AGNOSTIC], {'main': "new.dll"})
+        self.assertEqual(collector.saved, [("Renamed", False)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,217 @@
+'''
+Update scheduler test module
+'''
+
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from yaam.controller.update.results import UpdateResult
+from yaam.controller.update.scheduler import UpdateScheduler, dependency_graph, find_cycles, is_locked
+from yaam.model.mutable.addon import Addon
+from yaam.model.mutable.addon_base import AddonBase
+from yaam.model.mutable.binding import Binding
+from yaam.model.type.binding import BindingType
+
+
+class RecordingManager(object):
+    '''
+    Addon manager stand-in recording the updated addons
+    '''
+
+    def __init__(self, failing=None, fetch_delay: float = 0.0) -> None:
+        self.updated = []
+        self.failing = failing if failing else []
+        self.fetch_delay = fetch_delay
+        self.fetching = 0
+        self.peak_fetching = 0
+        self.__lock = threading.Lock()
+
+    def fetch_addon_update(self, addon: Addon, force_updates: bool = False):
+        '''
+        Record the concurrent fetches
+        '''
+        with self.__lock:
+            self.fetching += 1
+            self.peak_fetching = max(self.peak_fetching, self.fetching)
+
+        time.sleep(self.fetch_delay)
+
+        with self.__lock:
+            self.fetching -= 1
+
+    def update_addon(self, addon: Addon, force_updates: bool = False) -> UpdateResult:
+        '''
+        Record the update request
+        '''
+        self.updated.append(addon.base.name)
+        return UpdateResult.UPDATE_FAILED if addon.base.name in self.failing else UpdateResult.UPDATED
+
+
+def make_addon(name: str, path: str, binding_type: BindingType, dependencies=None) -> Addon:
+    '''
+    Return an enabled addon
+    '''
+    return Addon(
+        AddonBase(name, dependencies=dependencies),
+        Binding(name, Path(path), enabled=True, updateable=True, binding_type=binding_type),
+        dict()
+    )
+
+
+class TestUpdateScheduler(unittest.TestCase):
+    '''
+    UpdateScheduler test class
+    '''
+
+    def test_partition(self):
+        '''
+        Test 1
+        '''
+        addons = [
+            make_addon("Loader", "addons/loader.dll", BindingType.AGNOSTIC, ["Overlay"]),
+            make_addon("Shader", "bin64/d3d11.dll", BindingType.D3D11),
+            make_addon("Legacy", "bin64/d3d9.dll", BindingType.D3D9),
+            make_addon("Companion", "companion/companion.exe", BindingType.EXE),
+            make_addon("Overlay", "overlay/overlay.exe", BindingType.EXE),
+        ]
+
+        scheduler = UpdateScheduler(RecordingManager(), BindingType.D3D11)
+        (blocking, deferred) = scheduler.partition(addons)
+
+        self.assertEqual([_.base.name for _ in blocking], ["Loader", "Shader", "Overlay"])
+        self.assertEqual([_.base.name for _ in deferred], ["Legacy", "Companion"])
+
+    def test_run_should_update_every_deferred_addon(self):
+        '''
+        Test 2
+        '''
+        manager = RecordingManager()
+        addons = [make_addon(f"Companion {i}", f"companion_{i}/companion.exe", BindingType.EXE) for i in range(8)]
+
+        results = dict(UpdateScheduler(manager, BindingType.D3D11, workers=3).run(addons))
+
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(_ is UpdateResult.UPDATED for _ in results.values()))
+        self.assertEqual(sorted(manager.updated), sorted(_.base.name for _ in addons))
+
+    def test_missing_or_writable_files_are_not_locked(self):
+        '''
+        Test 3
+        '''
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "companion.exe"
+            self.assertFalse(is_locked(path))
+            path.write_bytes(b"exe")
+            self.assertFalse(is_locked(path))
+
+    def test_dependents_should_follow_their_dependencies(self):
+        '''
+        Test 4
+        '''
+        manager = RecordingManager()
+        addons = [
+            make_addon("BoonsTable", "addons/boonstable.dll", BindingType.AGNOSTIC, ["ArcDPS"]),
+            make_addon("Healing", "addons/healing.dll", BindingType.AGNOSTIC, ["ArcDPS", "BoonsTable"]),
+            make_addon("ArcDPS", "bin64/d3d11.dll", BindingType.D3D11),
+            make_addon("Shader", "shader/d3d9.dll", BindingType.D3D9),
+        ]
+
+        results = dict(UpdateScheduler(manager, BindingType.D3D11, workers=4).run(addons))
+
+        self.assertEqual(len(results), 4)
+        self.assertLess(manager.updated.index("ArcDPS"), manager.updated.index("BoonsTable"))
+        self.assertLess(manager.updated.index("BoonsTable"), manager.updated.index("Healing"))
+
+    def test_failed_dependencies_should_cancel_dependents(self):
+        '''
+        Test 5
+        '''
+        manager = RecordingManager(failing=["ArcDPS"])
+        addons = [
+            make_addon("ArcDPS", "bin64/d3d11.dll", BindingType.D3D11),
+            make_addon("BoonsTable", "addons/boonstable.dll", BindingType.AGNOSTIC, ["ArcDPS"]),
+            make_addon("Healing", "addons/healing.dll", BindingType.AGNOSTIC, ["BoonsTable"]),
+            make_addon("Shader", "shader/d3d9.dll", BindingType.D3D9),
+        ]
+
+        results = dict((a.base.name, r) for (a, r) in UpdateScheduler(manager, BindingType.D3D11).run(addons))
+
+        self.assertIs(results["ArcDPS"], UpdateResult.UPDATE_FAILED)
+        self.assertIs(results["BoonsTable"], UpdateResult.DEPENDENCY_FAILED)
+        self.assertIs(results["Healing"], UpdateResult.DEPENDENCY_FAILED)
+        self.assertIs(results["Shader"], UpdateResult.UPDATED)
+        self.assertEqual(sorted(manager.updated), ["ArcDPS", "Shader"])
+
+    def test_cycles_should_be_reported_and_broken(self):
+        '''
+        Test 6
+        '''
+        addons = [
+            make_addon("A", "a/a.dll", BindingType.AGNOSTIC, ["B"]),
+            make_addon("B", "b/b.dll", BindingType.AGNOSTIC, ["A", "Missing"]),
+            make_addon("C", "c/c.dll", BindingType.AGNOSTIC, ["A"]),
+        ]
+
+        graph = dependency_graph(addons)
+        self.assertEqual(graph["B"], ["A"])
+        self.assertEqual(find_cycles(graph), [["A", "B"]])
+
+        manager = RecordingManager()
+        results = dict(UpdateScheduler(manager, BindingType.D3D11).run(addons))
+
+        # the cycle is broken at A, after which B and C are updated concurrently
+        self.assertEqual(len(results), 3)
+        self.assertEqual(manager.updated[0], "A")
+
+    def test_same_workspace_fetches_should_overlap(self):
+        '''
+        Test 7
+        '''
+        manager = RecordingManager(fetch_delay=0.1)
+        addons = [make_addon(f"Plugin {i}", f"addons/plugin_{i}.dll", BindingType.AGNOSTIC) for i in range(8)]
+
+        results = dict(UpdateScheduler(manager, BindingType.D3D11, workers=4).run(addons))
+
+        self.assertEqual(len(results), 8)
+        self.assertGreater(manager.peak_fetching, 1)
+
+    def test_partition_should_follow_dependency_chains(self):
+        '''
+        Test 8
+        '''
+        addons = [
+            make_addon("D", "d/d.exe", BindingType.EXE),
+            make_addon("C", "c/c.exe", BindingType.EXE, ["D"]),
+            make_addon("B", "b/b.exe", BindingType.EXE, ["C"]),
+            make_addon("A", "addons/a.dll", BindingType.AGNOSTIC, ["B"]),
+            make_addon("E", "e/e.exe", BindingType.EXE, ["D"]),
+        ]
+
+        (blocking, deferred) = UpdateScheduler(RecordingManager(), BindingType.D3D11).partition(addons)
+
+        self.assertEqual([_.base.name for _ in blocking], ["A", "D", "C", "B"])
+        self.assertEqual([_.base.name for _ in deferred], ["E"])
+
+    def test_dependents_of_previous_failures_should_be_cancelled(self):
+        '''
+        Test 9
+        '''
+        manager = RecordingManager()
+        addons = [
+            make_addon("Companion", "companion/companion.exe", BindingType.EXE, ["ArcDPS"]),
+            make_addon("Helper", "helper/helper.exe", BindingType.EXE, ["Companion"]),
+            make_addon("Overlay", "overlay/overlay.exe", BindingType.EXE),
+        ]
+
+        results = dict((a.base.name, r) for (a, r) in UpdateScheduler(manager, BindingType.D3D11).run(addons, ["ArcDPS"]))
+
+        self.assertIs(results["Companion"], UpdateResult.DEPENDENCY_FAILED)
+        self.assertIs(results["Helper"], UpdateResult.DEPENDENCY_FAILED)
+        self.assertIs(results["Overlay"], UpdateResult.UPDATED)
+        self.assertEqual(manager.updated, ["Overlay"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+'''
+Installed addons integrity verification test module
+'''
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from yaam.controller.fileindex import InstalledFileIndex
+from yaam.controller.metastore import MetadataStore
+from yaam.controller.verify import IntegrityVerifier, VerifyStatus
+from yaam.model.mutable.addon import Addon
+from yaam.model.mutable.addon_base import AddonBase
+from yaam.model.mutable.binding import Binding
+from yaam.model.type.binding import BindingType
+from yaam.utils.hashing import Hasher
+
+
+def make_addon(name: str, path: Path, enabled: bool = True) -> Addon:
+    '''
+    Return an addon
+    '''
+    return Addon(AddonBase(name), Binding(name, path, enabled=enabled, updateable=True, binding_type=BindingType.AGNOSTIC), dict())
+
+
+class TestIntegrityVerifier(unittest.TestCase):
+    '''
+    IntegrityVerifier test class
+    '''
+
+    def setUp(self):
+        self.__tmp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.__tmp_dir.name)
+        self.store = MetadataStore(self.root / "metadata.db")
+        self.index = InstalledFileIndex(self.store)
+        self.verifier = IntegrityVerifier(self.index, workers=2)
+
+    def tearDown(self):
+        self.store.close()
+        self.__tmp_dir.cleanup()
+
+    def write(self, relative: str, content: str = "data") -> Path:
+        '''
+        Write a game file
+        '''
+        path = self.root / "game" / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
+        return path
+
+    def test_untouched_files_should_not_be_hashed(self):
+        '''
+        Test 1
+        '''
+        addon = make_addon("ArcDPS", self.root / "game" / "bin64" / "d3d11.dll")
+        dll = self.write("bin64/d3d11.dll")
+        self.index.record(addon, [dll])
+
+        # same content, different modification time
+        stat = dll.stat()
+        os.utime(dll, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        [report] = self.verifier.verify([addon, make_addon("Disabled", self.root / "game" / "disabled.dll", False)])
+
+        self.assertEqual(report.status, VerifyStatus.OK)
+        self.assertTrue(report.is_intact)
+        self.assertEqual([_.hashed for _ in report.files], [True])
+
+        self.index.record(addon, [dll])
+        [report] = self.verifier.verify([addon])
+
+        self.assertEqual(report.status, VerifyStatus.OK)
+        self.assertEqual([_.hashed for _ in report.files], [False])
+
+    def test_modified_and_missing_files_should_be_reported(self):
+        '''
+        Test 2
+        '''
+        overlay = make_addon("Overlay", self.root / "game" / "addons" / "overlay")
+        config = self.write("addons/overlay/overlay.ini")
+        dll = self.write("addons/overlay/bin/overlay.dll")
+        self.index.record(overlay, [config, dll])
+
+        config.write_text("user edit", encoding='utf-8')
+        dll.unlink()
+
+        [report] = self.verifier.verify([overlay])
+        statuses = dict((_.file.path.name, _.status) for _ in report.files)
+
+        self.assertEqual(statuses, {'overlay.ini': VerifyStatus.MODIFIED, 'overlay.dll': VerifyStatus.MISSING})
+        self.assertEqual(report.status, VerifyStatus.MISSING)
+        self.assertFalse(report.is_intact)
+        self.assertNotEqual(report.tree_hash, report.recorded_tree_hash)
+
+        [report] = self.verifier.verify([make_addon("Untracked", self.root / "game" / "untracked.dll")])
+        self.assertEqual(report.status, VerifyStatus.UNTRACKED)
+        self.assertTrue(report.is_intact)
+
+    def test_tree_hash_should_not_depend_on_order_or_location(self):
+        '''
+        Test 3
+        '''
+        leaves = [("bin/overlay.dll", Hasher.SHA256.make_hash_from_bytes(b"dll")), ("overlay.ini", Hasher.SHA256.make_hash_from_bytes(b"ini"))]
+        root = Hasher.SHA256.make_hash_from_tree(leaves)
+
+        self.assertEqual(root, Hasher.SHA256.make_hash_from_tree(reversed(leaves)))
+        self.assertEqual(root, Hasher.SHA256.make_hash_from_tree([("bin\\overlay.dll", leaves[0][1]), leaves[1]]))
+        self.assertNotEqual(root, Hasher.SHA256.make_hash_from_tree([("bin/renamed.dll", leaves[0][1]), leaves[1]]))
+        self.assertNotEqual(root, Hasher.SHA256.make_hash_from_tree(leaves[:1]))
+
+        overlay = make_addon("Overlay", self.root / "game" / "addons" / "overlay")
+        self.index.record(overlay, [self.write("addons/overlay/bin/overlay.dll", "dll"), self.write("addons/overlay/overlay.ini", "ini")])
+
+        [report] = self.verifier.verify([overlay])
+
+        self.assertEqual(report.tree_hash, root)
+        self.assertEqual(report.recorded_tree_hash, root)
+
+    def test_tampered_installs_should_fail_the_verification(self):
+        '''
+        Test 4
+        '''
+        arcdps = make_addon("ArcDPS", self.root / "game" / "bin64" / "d3d11.dll")
+        overlay = make_addon("Overlay", self.root / "game" / "addons" / "overlay.dll")
+        self.index.record(arcdps, [self.write("bin64/d3d11.dll")])
+        self.index.record(overlay, [self.write("addons/overlay.dll")])
+
+        self.assertTrue(all(_.is_intact for _ in self.verifier.verify([arcdps, overlay])))
+
+        self.write("bin64/d3d11.dll", "tampered")
+        reports = self.verifier.verify([arcdps, overlay])
+
+        self.assertEqual([_.status for _ in reports], [VerifyStatus.MODIFIED, VerifyStatus.OK])
+        self.assertFalse(all(_.is_intact for _ in reports))
+
+    def test_tree_hash_should_cover_the_whole_workspace(self):
+        '''
+        Test 5
+        '''
+        overlay = make_addon("Overlay", self.root / "game" / "addons" / "overlay")
+        self.index.record(overlay, [self.write("addons/overlay/bin/overlay.dll", "dll"), self.write("addons/overlay/overlay.ini", "ini")])
+
+        [report] = self.verifier.verify([overlay])
+        self.assertEqual(report.tree_hash, report.recorded_tree_hash)
+
+        # dropped in the workspace, outside of any update
+        self.write("addons/overlay/bin/injected.dll", "injected")
+
+        [report] = self.verifier.verify([overlay])
+
+        self.assertNotEqual(report.tree_hash, report.recorded_tree_hash)
+        self.assertEqual(report.tree_hash, Hasher.SHA256.make_hash_from_tree([
+            ("bin/injected.dll", Hasher.SHA256.make_hash_from_bytes(b"injected")),
+            ("bin/overlay.dll", Hasher.SHA256.make_hash_from_bytes(b"dll")),
+            ("overlay.ini", Hasher.SHA256.make_hash_from_bytes(b"ini"))
+        ]))
+        # the indexed files are still trusted
+        self.assertEqual([_.hashed for _ in report.files], [False, False])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+'''
+Addon model test module
+'''
+
+import copy
+import unittest
+from pathlib import Path
+from yaam.model.mutable.addon import Addon
+from yaam.model.mutable.addon_base import AddonBase
+from yaam.model.mutable.binding import Binding
+from yaam.model.mutable.metadata import AddonMetadata
+from yaam.model.type.binding import BindingType
+from yaam.utils.hashing import Hasher
+from yaam.utils.uri import URI
+
+
+class TestAddonModel(unittest.TestCase):
+    '''
+    Addon model test class
+    '''
+
+    def test_binding_derived_paths_follow_the_path(self):
+        '''
+        Test 1
+        '''
+        binding = Binding("ArcDPS", Path("bin64/d3d11.dll"))
+
+        self.assertFalse(binding.is_headless)
+        self.assertEqual(binding.workspace, Path("bin64"))
+
+        binding.path = Path("addons/arcdps")
+
+        self.assertTrue(binding.is_headless)
+        self.assertEqual(binding.workspace, Path("addons/arcdps"))
+        self.assertEqual(binding.default_naming, '')
+
+    def test_deepcopy_should_not_share_mutable_state(self):
+        '''
+        Test 2
+        '''
+        addon = Addon(
+            AddonBase("ArcDPS", "https://www.deltaconnected.com/arcdps/x64/d3d11.dll", dependencies=["Loader"]),
+            Binding("ArcDPS", Path("bin64/d3d11.dll"), ["-dx11"], binding_type=BindingType.D3D11),
+            dict()
+        )
+        metadata = AddonMetadata("ArcDPS", naming_map={BindingType.D3D11: {"d3d11.dll": "arcdps.dll"}})
+
+        (addon_copy, metadata_copy) = copy.deepcopy((addon, metadata))
+
+        addon_copy.base.dependencies.append("Overlay")
+        addon_copy.binding.args.append("-dx12")
+        addon_copy.binding.path = Path("bin64/dxgi.dll")
+        metadata_copy.namings[BindingType.D3D11]["d3d11.dll"] = "arc.dll"
+
+        self.assertEqual(addon.base.dependencies, ["Loader"])
+        self.assertEqual(addon.binding.args, ["-dx11"])
+        self.assertEqual(addon.binding.default_naming, "d3d11.dll")
+        self.assertEqual(metadata.namings[BindingType.D3D11]["d3d11.dll"], "arcdps.dll")
+
+    def test_uri_should_be_parsed_lazily(self):
+        '''
+        Test 3
+        '''
+        json_obj = {'name': "ArcDPS", 'uri': "https://www.deltaconnected.com/arcdps/x64/d3d11.dll"}
+
+        base = AddonBase.from_json(json_obj)
+
+        self.assertEqual(base.to_json()['uri'], json_obj['uri'])
+        self.assertIsInstance(base.uri, URI)
+        self.assertEqual(base.uri.host, "www.deltaconnected.com")
+        self.assertEqual(base.to_json()['uri'], json_obj['uri'])
+        self.assertIsNone(AddonBase.from_json({'name': "Local"}).to_json()['uri'])
+
+    def test_signatures_should_keep_their_algorithm(self):
+        '''
+        Test 4
+        '''
+        legacy = AddonMetadata.from_json({'addon': "ArcDPS", 'hash_signature': Hasher.SHA256.make_hash_from_bytes(b"dll")})
+        self.assertEqual(legacy.hash_algorithm, Hasher.SHA256)
+
+        blake = AddonMetadata(addon="ArcDPS", hash_signature=Hasher.BLAKE2B.make_hash_from_bytes(b"dll"), hash_algorithm=Hasher.BLAKE2B)
+        self.assertEqual(AddonMetadata.from_json(blake.to_json()).hash_algorithm, Hasher.BLAKE2B)
+        self.assertFalse(blake.has_same_signature(legacy))
+
+        legacy.hash_signature = Hasher.BLAKE2B.make_hash_from_bytes(b"dll")
+        self.assertFalse(blake.has_same_signature(legacy))
+
+        legacy.hash_algorithm = Hasher.BLAKE2B
+        self.assertTrue(blake.has_same_signature(legacy))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+'''
+GW2 GFXSettings reader unit test module
+'''
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from yaam.model.game.custom.gw2 import gfxsettings
+
+GFX_SETTINGS_XML = '''<?xml version="1.0" encoding="UTF-8"?>
+<GSA_SDK>
+<VERSION>2</VERSION>
+<APPLICATION>
+<LANGUAGE Value="English"/>
+<INSTALLPATH Value="C:\\Program Files\\Guild Wars 2\\"/>
+<EXECUTABLE Value="Gw2-64.exe"/>
+<EXECCMD Value=""/>
+</APPLICATION>
+<GAMESETTINGS>
+<OPTION Name="dummy" Type="Bool" Registered="True" Value="false"/>
+</GAMESETTINGS>
+</GSA_SDK>
+'''
+
+
+class TestGFXSettingsModule(unittest.TestCase):
+    '''
+    GW2 GFXSettings reader unit test
+    '''
+
+    def setUp(self):
+        self.__tmp_dir = tempfile.TemporaryDirectory()
+        self.tmp_dir = Path(self.__tmp_dir.name)
+        self.xml_path = self.tmp_dir / "GFXSettings.Gw2-64.exe.xml"
+        self.xml_path.write_text(GFX_SETTINGS_XML, encoding="utf-8")
+
+    def tearDown(self):
+        self.__tmp_dir.cleanup()
+
+    def test_application_info_should_be_parsed(self):
+        '''
+        Test 1
+        '''
+        info = gfxsettings.parse_application_info(self.xml_path)
+
+        self.assertEqual(info.install_path, "C:\\Program Files\\Guild Wars 2\\")
+        self.assertEqual(info.executable, "Gw2-64.exe")
+        self.assertTrue(info.is_complete)
+
+    def test_malformed_file_should_return_incomplete_info(self):
+        '''
+        Test 2
+        '''
+        self.xml_path.write_text("<GSA_SDK><APPLICATION>", encoding="utf-8")
+
+        info = gfxsettings.parse_application_info(self.xml_path)
+
+        self.assertFalse(info.is_complete)
+
+    def test_cached_info_should_be_reused_until_file_changes(self):
+        '''
+        Test 3
+        '''
+        cache_path = self.tmp_dir / "gfxsettings.json"
+
+        info = gfxsettings.load_application_info(self.xml_path, cache_path)
+        self.assertTrue(cache_path.exists())
+
+        # cache hit: same size and modification time, the cached data is returned
+        stat = self.xml_path.stat()
+        self.xml_path.write_text(GFX_SETTINGS_XML.replace("Gw2-64.exe", "Gw2-XX.exe"), encoding="utf-8")
+        os.utime(self.xml_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(gfxsettings.load_application_info(self.xml_path, cache_path), info)
+
+        # cache miss: the file has been modified
+        os.utime(self.xml_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertEqual(gfxsettings.load_application_info(self.xml_path, cache_path).executable, "Gw2-XX.exe")
+
+
+if __name__ == '__main__':
+    unittest.main()
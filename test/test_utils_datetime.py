@@ -0,0 +1,52 @@
+'''
+Date and time utilities unit test module
+'''
+import unittest
+from yaam.utils import detetimeutils
+
+
+class TestDatetimeModule(unittest.TestCase):
+    '''
+    Date and time utilities unit test
+    '''
+
+    def test_http_date_should_be_parsed_to_epoch(self):
+        '''
+        Test 1
+        '''
+        epoch = detetimeutils.timestamp_to_epoch("Sat, 29 Jun 2024 10:00:00 GMT")
+
+        self.assertEqual(epoch, 1719655200)
+
+    def test_iso_date_should_be_parsed_to_epoch(self):
+        '''
+        Test 2
+        '''
+        epoch = detetimeutils.timestamp_to_epoch("2024-06-29T10:00:00Z")
+
+        self.assertEqual(epoch, 1719655200)
+
+    def test_different_formats_should_compare_equal(self):
+        '''
+        Test 3
+        '''
+        diff = detetimeutils.compare_timestamp_str("2024-06-29T10:00:00Z", "Sat, 29 Jun 2024 10:00:00 GMT")
+
+        self.assertEqual(diff, 0)
+
+    def test_missing_timestamps_should_compare_infinite(self):
+        '''
+        Test 4
+        '''
+        self.assertEqual(detetimeutils.compare_timestamp_str("", "2024-06-29T10:00:00Z"), float('inf'))
+        self.assertEqual(detetimeutils.compare_epoch(None, 1719655200), float('inf'))
+
+    def test_invalid_timestamp_should_be_none(self):
+        '''
+        Test 5
+        '''
+        self.assertIsNone(detetimeutils.timestamp_to_epoch("not a date"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+'''
+JSON I/O utilities test module
+'''
+
+import codecs
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from yaam.model.appcontext import GameContext
+from yaam.model.game.generic.settings import GenericYaamGameSettings
+from yaam.model.immutable.argument import ArgumentInfo
+from yaam.model.mutable.addon_base import AddonBase
+from yaam.model.mutable.binding import Binding
+from yaam.model.type.argument import ArgumentType
+from yaam.model.type.binding import BindingType
+from yaam.utils.json.io import JSON_BACKENDS, dump_json, json_backend, read_json, use_json_backend, write_atomic, write_json
+
+
+class TestJsonIO(unittest.TestCase):
+    '''
+    JSON I/O test class
+    '''
+
+    def setUp(self):
+        self.__tmp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.__tmp_dir.name)
+        self.backend = json_backend().name
+
+    def tearDown(self):
+        use_json_backend(self.backend)
+        self.__tmp_dir.cleanup()
+
+    def test_backends_should_produce_the_same_bytes(self):
+        '''
+        Test 1
+        '''
+        obj = {
+            'addons': [AddonBase("ArcDPS", "https://www.deltaconnected.com/arcdps/x64/d3d11.dll", "Überlay")],
+            'bindings': {'d3d11': [Binding("ArcDPS", Path("bin64/d3d11.dll"), ["-dx11"], True, True)]},
+            'arguments': [ArgumentInfo("dx11", [], ArgumentType.BOOLEAN, "Use DirectX 11", False, True)],
+            'empty': {'list': [], 'dict': {}},
+            'numbers': [1, 2.5, -3, True, None]
+        }
+
+        dumps = dict()
+        for name in JSON_BACKENDS:
+            use_json_backend(name)
+            dumps[name] = (dump_json(obj), dump_json(obj, indent=None))
+
+        for (indented, compact) in dumps.values():
+            self.assertEqual((indented, compact), dumps["json"])
+            self.assertIn("    \"addons\": [".encode('utf-8'), indented)
+            self.assertIn("Überlay".encode('utf-8'), compact)
+
+    def test_writes_should_be_atomic(self):
+        '''
+        Test 2
+        '''
+        path = self.root / "settings.json"
+        write_json({'version': 1}, path)
+        os.chmod(path, 0o640)
+
+        with self.assertRaises(TypeError):
+            write_atomic("not bytes", path)
+
+        self.assertEqual(read_json(path), {'version': 1})
+        self.assertTrue(write_json({'version': 2}, path, only_if_changed=True))
+        self.assertFalse(write_json({'version': 2}, path, only_if_changed=True))
+
+        self.assertEqual(read_json(path), {'version': 2})
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o640)
+        self.assertEqual([_.name for _ in self.root.iterdir()], ["settings.json"])
+
+    def test_byte_order_mark_should_be_skipped(self):
+        '''
+        Test 3
+        '''
+        path = self.root / "addons.json"
+        path.write_bytes(codecs.BOM_UTF8 + b'{"addons": []}')
+
+        for name in JSON_BACKENDS:
+            use_json_backend(name)
+            self.assertEqual(read_json(path), {'addons': []})
+
+    def test_unchanged_settings_should_not_be_rewritten(self):
+        '''
+        Test 4
+        '''
+        context = GameContext(
+            game_root=self.root, yaam_game_dir=self.root, args_path=self.root / "arguments.json",
+            addons_path=self.root / "addons.json", settings_path=self.root / "settings.json",
+            naming_map_path=self.root / "naming_map.json", cache_dir=self.root / "cache", metadata_dir=self.root / "metadata"
+        )
+        write_json({'arguments': [{'name': "dx11", 'values': []}]}, context.args_path)
+        write_json({'addons': [{'name': "ArcDPS", 'uri': "https://www.deltaconnected.com/arcdps/x64/d3d11.dll"}]}, context.addons_path)
+        write_json({
+            'arguments': [{'name': "dx11"}],
+            'bindings': {'d3d11': [{'name': "ArcDPS", 'path': "bin64/d3d11.dll", 'enabled': True, 'update': True}]}
+        }, context.settings_path)
+
+        settings = GenericYaamGameSettings(context, BindingType.D3D11)
+        settings.load()
+        settings.save()
+
+        # normalized on first save
+        mtimes = dict((_, _.stat().st_mtime_ns) for _ in [context.addons_path, context.settings_path])
+
+        settings.save()
+
+        self.assertEqual(mtimes, dict((_, _.stat().st_mtime_ns) for _ in mtimes))
+        self.assertEqual(read_json(context.addons_path)['addons'][0]['uri'], "https://www.deltaconnected.com/arcdps/x64/d3d11.dll")
+
+        settings.bases["ArcDPS"].description = "Combat metrics"
+        settings.save()
+
+        self.assertEqual(read_json(context.addons_path)['addons'][0]['description'], "Combat metrics")
+        self.assertTrue(Path(f"{context.addons_path}.bak").exists())
+        self.assertEqual(read_json(Path(f"{context.addons_path}.bak"))['addons'][0]['description'], "")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+'''
+Profiler unit test module
+'''
+import unittest
+from yaam.utils.profiler import Profiler
+
+
+class TestProfiler(unittest.TestCase):
+    '''
+    Profiler unit test
+    '''
+
+    def test_disabled_profiler_should_not_record(self):
+        '''
+        Test 1
+        '''
+        profiler = Profiler()
+
+        with profiler.span("phase") as span:
+            profiler.count("bytes", 10)
+
+        self.assertGreaterEqual(span.delta(), 0)
+        self.assertEqual(len(profiler.spans), 0)
+        self.assertEqual(profiler.counters, {})
+
+    def test_spans_should_be_nested(self):
+        '''
+        Test 2
+        '''
+        profiler = Profiler(enabled=True)
+
+        with profiler.span("phase"):
+            with profiler.span("phase.addon", addon="foo") as child:
+                pass
+
+        self.assertEqual(len(profiler.spans), 2)
+        self.assertEqual(child.parent.name, "phase")
+        self.assertEqual(child.depth, 1)
+
+    def test_chrome_trace_should_contain_spans_and_counters(self):
+        '''
+        Test 3
+        '''
+        profiler = Profiler(enabled=True)
+
+        with profiler.span("phase", addon="foo"):
+            profiler.count("http.bytes", 10)
+            profiler.count("http.bytes", 5)
+
+        trace = profiler.to_chrome_trace()
+        complete_events = [_ for _ in trace['traceEvents'] if _['ph'] == 'X']
+        counter_events = [_ for _ in trace['traceEvents'] if _['ph'] == 'C']
+
+        self.assertEqual(complete_events[0]['name'], "phase")
+        self.assertEqual(complete_events[0]['args'], {'addon': 'foo'})
+        self.assertEqual(counter_events[-1]['args']['value'], 15)
+        self.assertEqual(trace['otherData']['counters'], {'http.bytes': 15})
+
+
+if __name__ == '__main__':
+    unittest.main()
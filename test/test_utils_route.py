@@ -0,0 +1,83 @@
+'''
+URI route classification unit test module
+'''
+import unittest
+from yaam.utils.route import RouteType, classify
+from yaam.utils.uri import URI
+
+
+class TestRouteModule(unittest.TestCase):
+    '''
+    URI route classification unit test
+    '''
+
+    def test_latest_release_url_should_be_classified_with_owner_and_repo(self):
+        '''
+        Test 1
+        '''
+        route = classify("https://api.github.com/repos/owner/repo/releases/latest")
+
+        self.assertEqual(route.typing, RouteType.GITHUB_LATEST_RELEASE)
+        self.assertEqual(route.owner, "owner")
+        self.assertEqual(route.repo, "repo")
+        self.assertTrue(route.is_github_release)
+        self.assertEqual(route.release_list_url, "https://api.github.com/repos/owner/repo/releases")
+
+    def test_release_list_url_should_be_classified(self):
+        '''
+        Test 2
+        '''
+        route = classify(URI("https://api.github.com/repos/owner/repo/releases"))
+
+        self.assertEqual(route.typing, RouteType.GITHUB_RELEASE_LIST)
+        self.assertFalse(route.is_latest_release)
+        self.assertTrue(route.is_github_release)
+
+    def test_other_api_url_should_not_be_a_release(self):
+        '''
+        Test 3
+        '''
+        route = classify("https://api.github.com/rate_limit")
+
+        self.assertEqual(route.typing, RouteType.GITHUB_API)
+        self.assertFalse(route.is_github_release)
+        self.assertIsNone(route.release_list_url)
+
+    def test_plain_url_should_be_a_datastream(self):
+        '''
+        Test 4
+        '''
+        route = classify("https://www.deltaconnected.com/arcdps/x64/d3d11.dll")
+
+        self.assertEqual(route.typing, RouteType.DATASTREAM)
+        self.assertFalse(route.is_github_api)
+
+    def test_classification_should_be_cached(self):
+        '''
+        Test 5
+        '''
+        url = "https://api.github.com/repos/owner/repo/releases/latest"
+
+        self.assertIs(classify(url), classify(url))
+        self.assertIs(classify(classify(url)), classify(url))
+
+    def test_pinned_release_url_should_keep_its_url(self):
+        '''
+        Test 6
+        '''
+        for url in ["https://api.github.com/repos/owner/repo/releases/tags/v1.2", "https://api.github.com/repos/owner/repo/releases/123"]:
+            route = classify(url)
+
+            self.assertEqual(route.typing, RouteType.GITHUB_PINNED_RELEASE)
+            self.assertTrue(route.is_github_release)
+            self.assertFalse(route.is_latest_release)
+            self.assertEqual(route.release_list_url, url)
+
+        route = classify("https://api.github.com/repos/owner/repo/releases/assets/456")
+
+        self.assertEqual(route.typing, RouteType.GITHUB_API)
+        self.assertIsNone(route.release_list_url)
+
+
+if __name__ == '__main__':
+    unittest.main()
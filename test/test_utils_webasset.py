@@ -0,0 +1,75 @@
+'''
+Web asset selection test module
+'''
+
+import unittest
+from unittest import mock
+from yaam.model.mutable.addon_base import AddonBase
+from yaam.utils.exceptions import AssetException
+from yaam.utils.webasset import Asset, AssetRules, assets_followup, versionless
+
+ASSETS = [
+    Asset(_, f"https://example.com/{_}")
+    for _ in ["tool-v1.2.0-x64.zip", "tool-v1.2.0-x86.zip", "tool-v1.2.0-arm64.zip", "tool-v1.2.0-src.zip", "tool.sig"]
+]
+
+
+class TestAssetSelection(unittest.TestCase):
+    '''
+    Asset selection test class
+    '''
+
+    def test_rules(self):
+        '''
+        Test 1
+        '''
+        rules = AssetRules(include=["*.zip"], exclude=["*-src*"])
+        self.assertEqual(len(rules.select(ASSETS)), 3)
+
+        rules.arch = "x64"
+        self.assertEqual([_.name for _ in rules.select(ASSETS)], ["tool-v1.2.0-x64.zip"])
+
+        rules = AssetRules(regex=r"-x86\.zip$")
+        self.assertEqual(assets_followup(ASSETS, rules, interactive=False).name, "tool-v1.2.0-x86.zip")
+
+        with self.assertRaisesRegex(AssetException, "of tool"):
+            assets_followup(ASSETS, AssetRules(regex=r"x86(\.zip"), interactive=False, addon="tool")
+
+    def test_rules_json(self):
+        '''
+        Test 2
+        '''
+        base = AddonBase.from_json({'name': "tool", 'assets': {'arch': "X64", 'exclude': ["*.sig"]}})
+
+        self.assertEqual(base.asset_rules.arch, "x64")
+        self.assertEqual(base.to_json()['assets'], {'arch': "x64", 'exclude': ["*.sig"]})
+        self.assertNotIn('assets', AddonBase("tool").to_json())
+
+    def test_remembered_choice(self):
+        '''
+        Test 3
+        '''
+        self.assertEqual(versionless("tool-v1.2.0-x64.zip"), versionless("Tool-v1.10.3-x64.zip"))
+        self.assertNotEqual(versionless("tool-v1.2.0-x64.zip"), versionless("tool-v1.2.0-x86.zip"))
+
+        asset = assets_followup(ASSETS, AssetRules(), "tool-v1.1.0-x86.zip", interactive=False)
+        self.assertEqual(asset.name, "tool-v1.2.0-x86.zip")
+
+    def test_prompt_only_when_ambiguous(self):
+        '''
+        Test 4
+        '''
+        with self.assertRaises(AssetException):
+            assets_followup(ASSETS, AssetRules(include=["*.zip"]), interactive=False)
+
+        with mock.patch("builtins.input", return_value="2") as prompt, mock.patch("builtins.print"):
+            asset = assets_followup(ASSETS, AssetRules(include=["*.zip"]))
+            self.assertEqual(asset.name, "tool-v1.2.0-x86.zip")
+            self.assertEqual(prompt.call_count, 1)
+
+            assets_followup(ASSETS, AssetRules(arch="arm64"))
+            self.assertEqual(prompt.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
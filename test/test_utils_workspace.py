@@ -0,0 +1,69 @@
+'''
+Workspace snapshot test module
+'''
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from yaam.utils.workspace import WorkspaceSnapshot
+
+
+class TestWorkspaceSnapshot(unittest.TestCase):
+    '''
+    WorkspaceSnapshot test class
+    '''
+
+    def setUp(self):
+        self.__tmp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.__tmp_dir.name)
+        (self.root / "addon.dll").write_bytes(b"dll")
+        (self.root / "addons").mkdir()
+
+    def tearDown(self):
+        self.__tmp_dir.cleanup()
+
+    def test_queries_should_scan_each_directory_once(self):
+        '''
+        Test 1
+        '''
+        snapshot = WorkspaceSnapshot()
+
+        with mock.patch("yaam.utils.workspace.os.scandir", wraps=os.scandir) as scandir:
+            self.assertTrue(snapshot.is_file(self.root / "addon.dll"))
+            self.assertTrue(snapshot.is_dir(self.root / "addons"))
+            self.assertFalse(snapshot.exists(self.root / "addon.dll_0"))
+            self.assertFalse(snapshot.exists(self.root / "missing" / "addon.dll"))
+
+        self.assertEqual(scandir.call_count, 2)
+
+    def test_rename_should_update_snapshot(self):
+        '''
+        Test 2
+        '''
+        snapshot = WorkspaceSnapshot()
+
+        snapshot.rename(self.root / "addon.dll", self.root / "addon.dll_0")
+
+        self.assertFalse(snapshot.exists(self.root / "addon.dll"))
+        self.assertTrue(snapshot.is_file(self.root / "addon.dll_0"))
+        self.assertTrue((self.root / "addon.dll_0").is_file())
+
+    def test_moved_directory_should_invalidate_its_content(self):
+        '''
+        Test 3
+        '''
+        (self.root / "addons" / "nested.dll").write_bytes(b"dll")
+
+        snapshot = WorkspaceSnapshot()
+        self.assertTrue(snapshot.is_file(self.root / "addons" / "nested.dll"))
+
+        snapshot.rename(self.root / "addons", self.root / "addons_0")
+
+        self.assertFalse(snapshot.exists(self.root / "addons" / "nested.dll"))
+        self.assertTrue(snapshot.is_file(self.root / "addons_0" / "nested.dll"))
+
+
+if __name__ == '__main__':
+    unittest.main()